@@ -0,0 +1 @@
+"""Performance benchmarks for NeuroDungeon; run with ``python -m benchmarks``."""
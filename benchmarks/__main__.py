@@ -0,0 +1,58 @@
+"""Command line entry point: ``python -m benchmarks [--baseline FILE]``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from . import bench_import, bench_models, bench_orchestrator, bench_report, bench_sandbox
+from .harness import SCALES, Suite, compare, load, measure, metadata, save
+
+SUITES: Dict[str, Suite] = {
+    "orchestrator": bench_orchestrator.cases,
+    "sandbox": bench_sandbox.cases,
+    "report": bench_report.cases,
+    "models": bench_models.cases,
+    "import": bench_import.cases,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run NeuroDungeon benchmarks")
+    parser.add_argument("--scale", choices=SCALES, default="default", help="'full' adds 1M-line reports")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="may be repeated; default all")
+    parser.add_argument("-k", dest="keyword", default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, e.g. 0.2 for 20%%")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="nd_bench_") as tmp:
+        for suite in args.suite or list(SUITES):
+            workdir = Path(tmp) / suite
+            workdir.mkdir()
+            for name, (setup, number) in SUITES[suite](args.scale, workdir):
+                if args.keyword and args.keyword not in name:
+                    continue
+                results[name] = measure(setup, number, args.repeat)
+                print(f"{name:<64} {results[name]['median_s'] * 1e3:>12.3f} ms", flush=True)
+    save(args.output, metadata(args.scale), results)
+    print(f"results written to {args.output}")
+
+    if args.baseline is None:
+        return 0
+    lines, regressions = compare(load(args.baseline), results, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
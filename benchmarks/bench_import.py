@@ -0,0 +1,31 @@
+"""Cold start: importing the package and a short stub run, each in a fresh interpreter."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Tuple
+
+from .harness import Case
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _python(*args: str) -> Callable[[], Callable[[], Any]]:
+    cmd: List[str] = [sys.executable, *args]
+
+    def setup() -> Callable[[], Any]:
+        return lambda: subprocess.run(cmd, cwd=ROOT, check=True, capture_output=True)
+
+    return setup
+
+
+def cases(scale: str, workdir: Path) -> Iterator[Tuple[str, Case]]:
+    number = 3 if scale == "quick" else 10
+    yield "import.python", (_python("-c", "pass"), number)
+    yield "import.neurodungeon", (_python("-c", "import neurodungeon"), number)
+    yield "import.neurodungeon.run", (_python("-c", "import neurodungeon.run"), number)
+    argv = ["--goal", "g", "--enemies", "2", "--persist-dir", str(workdir)]
+    stub_run = f"from neurodungeon.run import cli; cli({argv!r})"
+    yield "import.cli_stub_run", (_python("-c", stub_run), number)
@@ -0,0 +1,35 @@
+"""Pydantic validation and serialisation cost of the core models."""
+
+from __future__ import annotations
+
+import itertools
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from neurodungeon.models import FloorArtifact, Hint, RunConfig
+
+from .harness import Case
+
+ARTIFACT: Dict[str, Any] = {"floor": 3, "revision": 1, "content": "x" * 1024, "ext": ".py"}
+
+
+def cases(scale: str, workdir: Path) -> Iterator[Tuple[str, Case]]:
+    number = 1_000 if scale == "quick" else 10_000
+    artifact = FloorArtifact(**ARTIFACT)
+    artifact_json = artifact.model_dump_json()
+    ids = itertools.count()
+
+    def const(fn: Callable[[], Any]) -> Callable[[], Callable[[], Any]]:
+        return lambda: fn
+
+    yield "models.Hint()", (const(lambda: Hint(text="improve")), number)
+    yield "models.FloorArtifact()", (const(lambda: FloorArtifact(**ARTIFACT)), number)
+    yield "models.FloorArtifact.model_validate_json", (
+        const(lambda: FloorArtifact.model_validate_json(artifact_json)),
+        number,
+    )
+    yield "models.FloorArtifact.model_dump_json", (const(artifact.model_dump_json), number)
+    yield "models.RunConfig()", (
+        const(lambda: RunConfig(run_id=f"cfg_{next(ids)}", persist_dir=workdir / "configs")),
+        number // 10,
+    )
@@ -0,0 +1,62 @@
+"""``Orchestrator.run`` throughput with stub agents."""
+
+from __future__ import annotations
+
+import itertools
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence, Tuple
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.models import FloorArtifact, Hint, RunConfig, Vote
+from neurodungeon.orchestrator import Orchestrator
+
+from .harness import Case
+
+# (floors, enemies per floor)
+GRID = {
+    "quick": [(5, 1), (5, 8)],
+    "default": [(5, 1), (5, 8), (25, 1), (25, 8)],
+    "full": [(5, 1), (5, 8), (25, 1), (25, 8), (100, 8), (100, 32)],
+}
+LATENCY_S = 0.005
+
+
+class SlowEnemy(StubEnemy):
+    """:class:`StubEnemy` that sleeps first, standing in for an API round-trip."""
+
+    def __init__(self, delay_s: float) -> None:
+        self.delay_s = delay_s
+
+    def evaluate(self, artifact: FloorArtifact) -> Tuple[Vote, Sequence[Hint]]:
+        time.sleep(self.delay_s)
+        return super().evaluate(artifact)
+
+
+def _run(workdir: Path, floors: int, enemies: int, delay_s: float = 0.0, parallel: int = 1) -> Case:
+    ids = itertools.count()
+
+    def setup() -> Callable[[], Any]:
+        def run() -> None:
+            cfg = RunConfig(
+                run_id=f"orch_{floors}x{enemies}_{parallel}_{next(ids)}",
+                persist_dir=workdir,
+                # every floor passes so the whole dungeon is walked
+                rejection_thresh=enemies + 1,
+                llm_call_limit=10**9,
+                max_parallel_enemies=parallel,
+            )
+            agents = [[SlowEnemy(delay_s) if delay_s else StubEnemy() for _ in range(enemies)] for _ in range(floors)]
+            Orchestrator(StubPlayer(), agents, StubBoss()).run("bench", cfg)
+
+        return run
+
+    return setup, 3 if delay_s else 10
+
+
+def cases(scale: str, workdir: Path) -> Iterator[Tuple[str, Case]]:
+    for floors, enemies in GRID[scale]:
+        yield f"orchestrator.run[floors={floors},enemies={enemies}]", _run(workdir, floors, enemies)
+    for parallel in (1, 8):
+        name = f"orchestrator.run[floors=5,enemies=8,latency={LATENCY_S * 1000:g}ms,parallel={parallel}]"
+        yield name, _run(workdir, 5, 8, LATENCY_S, parallel)
@@ -0,0 +1,47 @@
+"""``render_report`` over synthetic logs."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Tuple
+
+from neurodungeon.models import FloorArtifact
+from neurodungeon.report import render_report
+
+from .harness import Case
+
+SIZES = {"quick": [1_000], "default": [1_000, 10_000, 100_000], "full": [1_000, 10_000, 100_000, 1_000_000]}
+ENEMIES = 8
+
+
+def write_log(path: Path, lines: int) -> List[FloorArtifact]:
+    """Write ``lines`` records shaped like a real run: votes, a usage record per floor."""
+    artifacts = []
+    with path.open("w") as f:
+        written = 0
+        floor = 0
+        while written < lines:
+            for idx in range(min(ENEMIES, lines - written)):
+                vote = "REJECT" if (floor + idx) % 3 == 0 else "ACCEPT"
+                rec = {"floor": floor, "enemy_idx": idx, "vote": vote, "hints": ["improve"], "timestamp": 0.0}
+                f.write(json.dumps(rec) + "\n")
+                written += 1
+            if written < lines:
+                usage = {"calls": {"player": 1, "enemy": ENEMIES}, "seconds": {"player": 0.1, "enemy": 0.8}}
+                f.write(json.dumps({"floor": floor, "usage": usage, "timestamp": 0.0}) + "\n")
+                written += 1
+            artifacts.append(FloorArtifact(floor=floor, revision=0, content="", ext=".py"))
+            floor += 1
+    return artifacts
+
+
+def cases(scale: str, workdir: Path) -> Iterator[Tuple[str, Case]]:
+    for lines in SIZES[scale]:
+        log_path = workdir / f"log_{lines}.jsonl"
+        artifacts = write_log(log_path, lines)
+
+        def setup(log_path: Path = log_path, artifacts: List[FloorArtifact] = artifacts) -> Callable[[], Any]:
+            return lambda: render_report("bench", artifacts, log_path, 0, 3)
+
+        yield f"render_report[lines={lines}]", (setup, 1 if lines >= 100_000 else 5)
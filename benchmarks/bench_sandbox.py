@@ -0,0 +1,57 @@
+"""``Sandbox.run`` cold versus warm, driven by ``tests/fake_docker.py``."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Tuple
+
+from neurodungeon.sandbox import NativeSandbox, PooledSandbox, Sandbox
+
+from .harness import Case
+
+FAKE_DOCKER = Path(__file__).resolve().parent.parent / "tests" / "fake_docker.py"
+CODE = "def add(a, b):\n    return a + b\n"
+TESTS = "from code import add\n\ndef test_add():\n    assert add(1, 2) == 3\n"
+
+
+def _docker_shim(workdir: Path) -> str:
+    """Install the fake ``docker`` binary; ``FAKE_DOCKER_START_DELAY`` is honoured."""
+    os.environ["FAKE_DOCKER_STATE"] = str(workdir / "docker_state")
+    shim = workdir / "docker"
+    shim.write_text(f'#!/bin/sh\nexec {sys.executable} {FAKE_DOCKER} "$@"\n')
+    shim.chmod(0o755)
+    return str(shim)
+
+
+def cases(scale: str, workdir: Path) -> Iterator[Tuple[str, Case]]:
+    docker = _docker_shim(workdir)
+    number = 2 if scale == "quick" else 5
+
+    def cold() -> Callable[[], Any]:
+        sandbox = Sandbox(cpu=1, memory_mb=256, timeout_s=60, docker=docker)
+        return lambda: sandbox.run(CODE, TESTS)
+
+    pools: List[PooledSandbox] = []
+
+    def close_pools() -> None:
+        while pools:
+            pools.pop().close()
+
+    def warm() -> Callable[[], Any]:
+        close_pools()  # the previous repeat's pool
+        pool = PooledSandbox(cpu=1, memory_mb=256, timeout_s=60, size=1, docker=docker)
+        pools.append(pool)
+        return lambda: pool.run(CODE, TESTS)
+
+    def native() -> Callable[[], Any]:
+        sandbox = NativeSandbox(cpu=1, memory_mb=1024, timeout_s=60)
+        return lambda: sandbox.run(CODE, TESTS)
+
+    try:
+        yield "sandbox.run[cold]", (cold, number)
+        yield "sandbox.run[warm]", (warm, number)
+        yield "sandbox.run[native]", (native, number)
+    finally:
+        close_pools()
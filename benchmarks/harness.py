@@ -0,0 +1,99 @@
+"""Timing, result files and baseline comparison for the benchmark suite."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import neurodungeon
+
+# name -> (setup returning the callable to time, number of calls per repeat)
+Case = Tuple[Callable[[], Callable[[], Any]], int]
+Suite = Callable[[str, Path], Iterator[Tuple[str, Case]]]
+
+SCALES = ("quick", "default", "full")
+
+
+def measure(setup: Callable[[], Callable[[], Any]], number: int, repeat: int) -> Dict[str, float]:
+    """Time ``number`` calls of the callable returned by ``setup``, ``repeat`` times.
+
+    ``setup`` runs before every repeat so stateful cases start fresh.
+    Durations are per call.
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        fn = setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def metadata(scale: str) -> Dict[str, Any]:
+    return {
+        "neurodungeon": neurodungeon.__version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "scale": scale,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def save(path: Path, meta: Dict[str, Any], results: Dict[str, Dict[str, float]]) -> None:
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
+
+
+def load(path: Path) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = json.loads(path.read_text())["results"]
+    return results
+
+
+def compare(
+    baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]], threshold: float
+) -> Tuple[List[str], List[str]]:
+    """Return ``(table_lines, regressions)``.
+
+    A case regresses when its median is more than ``threshold`` (a
+    fraction, e.g. ``0.2``) slower than the baseline median. Cases missing
+    from either side are listed but never fail the comparison.
+    """
+    lines = [f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'ratio':>7}"]
+    regressions: List[str] = []
+    for name in sorted(set(baseline) | set(current)):
+        base = baseline.get(name)
+        cur = current.get(name)
+        if base is None or cur is None:
+            status = "new" if base is None else "missing"
+            lines.append(f"{name:<48} {_fmt(base):>12} {_fmt(cur):>12} {status:>7}")
+            continue
+        ratio = cur["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(f"{name:<48} {_fmt(base):>12} {_fmt(cur):>12} {ratio:>6.2f}x{flag}")
+    return lines, regressions
+
+
+def _fmt(result: Optional[Dict[str, float]]) -> str:
+    if result is None:
+        return "-"
+    seconds = result["median_s"]
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    return f"{seconds * 1e6:.1f}us"
@@ -1,39 +1,82 @@
-"""NeuroDungeon package entry point."""
+"""NeuroDungeon package entry point.
+
+Public names are imported from their submodules on first access, so
+``import neurodungeon`` and CLI startup do not pay for openai or jinja2.
+"""
+
+import importlib
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Dict, List
 
 __version__ = "0.3.0.dev0"
 
-from .models import Vote, Hint, FloorArtifact, RunConfig
-from . import dataclasses as dataclasses
-from .migrate import v02_to_v03
-from .agents import Player, Enemy, Boss
-from .sandbox import Sandbox, RuntimeEnemy
-from .config import load_config
-from .report import render_report
-from .orchestrator import Orchestrator
-from .run import cli
-
-__all__ = [
-    "Vote",
-    "Hint",
-    "FloorArtifact",
-    "RunConfig",
-    "Player",
-    "Enemy",
-    "Boss",
-    "Sandbox",
-    "RuntimeEnemy",
-    "load_config",
-    "render_report",
-    "Orchestrator",
-    "cli",
-    "dataclasses",
-    "v02_to_v03",
-]
-
-try:
-    from .agents_llm import PlayerLLM, LintEnemyLLM
-except ModuleNotFoundError:
-    # openai dependency is optional; avoid import error when extras are missing
-    pass
-else:
-    __all__ += ["PlayerLLM", "LintEnemyLLM"]
+# public name -> submodule defining it
+_EXPORTS: Dict[str, str] = {
+    "Vote": "models",
+    "Hint": "models",
+    "FloorArtifact": "models",
+    "RunConfig": "models",
+    "ArtifactHandle": "artifacts",
+    "ArtifactHistory": "artifacts",
+    "Player": "agents",
+    "Enemy": "agents",
+    "Boss": "agents",
+    "AsyncPlayer": "agents",
+    "AsyncEnemy": "agents",
+    "AsyncBoss": "agents",
+    "BatchingEnemy": "agents",
+    "Sandbox": "sandbox",
+    "SandboxBackend": "sandbox",
+    "PooledSandbox": "sandbox",
+    "NativeSandbox": "sandbox",
+    "RuntimeEnemy": "sandbox",
+    "EvalCache": "cache",
+    "Transport": "workqueue",
+    "SQLiteTransport": "workqueue",
+    "RemoteEnemy": "workqueue",
+    "Worker": "workqueue",
+    "load_config": "config",
+    "render_report": "report",
+    "Orchestrator": "orchestrator",
+    "AsyncOrchestrator": "orchestrator",
+    "cli": "run",
+    "v02_to_v03": "migrate",
+}
+_LLM_EXPORTS = ["PlayerLLM", "LintEnemyLLM", "AsyncPlayerLLM", "AsyncLintEnemyLLM", "ChatClient", "AsyncChatClient"]
+
+__all__ = [*_EXPORTS, "dataclasses"]
+
+# openai dependency is optional; only advertise the LLM agents when it is installed
+if find_spec("openai") is not None:
+    _EXPORTS.update(dict.fromkeys(_LLM_EXPORTS, "agents_llm"))
+    __all__ += _LLM_EXPORTS
+
+
+def __getattr__(name: str) -> Any:
+    if name == "dataclasses":
+        return importlib.import_module(".dataclasses", __name__)
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
+
+
+if TYPE_CHECKING:
+    from . import dataclasses as dataclasses
+    from .agents import AsyncBoss, AsyncEnemy, AsyncPlayer, BatchingEnemy, Boss, Enemy, Player
+    from .agents_llm import AsyncChatClient, AsyncLintEnemyLLM, AsyncPlayerLLM, ChatClient, LintEnemyLLM, PlayerLLM
+    from .artifacts import ArtifactHandle, ArtifactHistory
+    from .cache import EvalCache
+    from .config import load_config
+    from .migrate import v02_to_v03
+    from .models import FloorArtifact, Hint, RunConfig, Vote
+    from .orchestrator import AsyncOrchestrator, Orchestrator
+    from .report import render_report
+    from .run import cli
+    from .sandbox import NativeSandbox, PooledSandbox, RuntimeEnemy, Sandbox, SandboxBackend
+    from .workqueue import RemoteEnemy, SQLiteTransport, Transport, Worker
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import threading
+import time
 from collections import defaultdict
-from typing import Dict, List, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .models import Hint, Vote, FloorArtifact
 
@@ -17,6 +20,13 @@ class Player(abc.ABC):
         """Return artifact for given floor based on hints."""
         raise NotImplementedError
 
+    def retract(self, artifact: FloorArtifact) -> None:
+        """Discard a speculative artifact returned by :meth:`act`.
+
+        Called when the orchestrator throws away a prefetched artifact, so
+        stateful players can roll back (e.g. revision counters).
+        """
+
 
 class Enemy(abc.ABC):
     """Abstract enemy critic."""
@@ -26,16 +36,204 @@ class Enemy(abc.ABC):
         """Evaluate artifact and provide hints."""
         raise NotImplementedError
 
+    def evaluate_many(self, artifacts: Sequence[FloorArtifact]) -> List[Tuple[Vote, Sequence[Hint]]]:
+        """Evaluate several artifacts, returning verdicts in order.
+
+        The default loops over :meth:`evaluate`; critics with a fixed
+        per-call cost override it to grade the whole batch at once.
+        """
+        return [self.evaluate(artifact) for artifact in artifacts]
+
 
 class Boss(abc.ABC):
     """Final holistic critic."""
 
     @abc.abstractmethod
     def judge(self, artifacts: Sequence[FloorArtifact]) -> Vote:
+        """Return final run vote given all artifacts.
+
+        The orchestrators pass an :class:`~neurodungeon.artifacts.ArtifactHistory`
+        that reads each artifact from disk on access; iterate over it rather
+        than copying it into a list to keep memory flat.
+        """
+        raise NotImplementedError
+
+
+class AsyncPlayer(abc.ABC):
+    """Abstract player whose ``act`` is a coroutine."""
+
+    @abc.abstractmethod
+    async def act(self, floor: int, hints: Sequence[Hint]) -> FloorArtifact:
+        """Return artifact for given floor based on hints."""
+        raise NotImplementedError
+
+    def retract(self, artifact: FloorArtifact) -> None:
+        """Discard a speculative artifact returned by :meth:`act`."""
+
+
+class AsyncEnemy(abc.ABC):
+    """Abstract enemy critic whose ``evaluate`` is a coroutine."""
+
+    @abc.abstractmethod
+    async def evaluate(self, artifact: FloorArtifact) -> Tuple[Vote, Sequence[Hint]]:
+        """Evaluate artifact and provide hints."""
+        raise NotImplementedError
+
+    async def evaluate_many(self, artifacts: Sequence[FloorArtifact]) -> List[Tuple[Vote, Sequence[Hint]]]:
+        """Evaluate several artifacts, returning verdicts in order."""
+        return [await self.evaluate(artifact) for artifact in artifacts]
+
+
+class AsyncBoss(abc.ABC):
+    """Final holistic critic whose ``judge`` is a coroutine."""
+
+    @abc.abstractmethod
+    async def judge(self, artifacts: Sequence[FloorArtifact]) -> Vote:
         """Return final run vote given all artifacts."""
         raise NotImplementedError
 
 
+class AsyncPlayerAdapter(AsyncPlayer):
+    """Expose a sync :class:`Player` as an :class:`AsyncPlayer`.
+
+    Calls run in a worker thread unless ``offload`` is false, which suits
+    cheap agents such as the stubs.
+    """
+
+    def __init__(self, player: Player, offload: bool = True) -> None:
+        self.player = player
+        self.offload = offload
+
+    async def act(self, floor: int, hints: Sequence[Hint]) -> FloorArtifact:
+        if self.offload:
+            return await asyncio.to_thread(self.player.act, floor, hints)
+        return self.player.act(floor, hints)
+
+    def retract(self, artifact: FloorArtifact) -> None:
+        self.player.retract(artifact)
+
+
+class AsyncEnemyAdapter(AsyncEnemy):
+    """Expose a sync :class:`Enemy` as an :class:`AsyncEnemy`."""
+
+    def __init__(self, enemy: Enemy, offload: bool = True) -> None:
+        self.enemy = enemy
+        self.offload = offload
+
+    async def evaluate(self, artifact: FloorArtifact) -> Tuple[Vote, Sequence[Hint]]:
+        if self.offload:
+            return await asyncio.to_thread(self.enemy.evaluate, artifact)
+        return self.enemy.evaluate(artifact)
+
+    async def evaluate_many(self, artifacts: Sequence[FloorArtifact]) -> List[Tuple[Vote, Sequence[Hint]]]:
+        if self.offload:
+            return await asyncio.to_thread(self.enemy.evaluate_many, artifacts)
+        return self.enemy.evaluate_many(artifacts)
+
+
+class AsyncBossAdapter(AsyncBoss):
+    """Expose a sync :class:`Boss` as an :class:`AsyncBoss`."""
+
+    def __init__(self, boss: Boss, offload: bool = True) -> None:
+        self.boss = boss
+        self.offload = offload
+
+    async def judge(self, artifacts: Sequence[FloorArtifact]) -> Vote:
+        if self.offload:
+            return await asyncio.to_thread(self.boss.judge, artifacts)
+        return self.boss.judge(artifacts)
+
+
+class _Request:
+    __slots__ = ("artifact", "done", "verdict", "error")
+
+    def __init__(self, artifact: FloorArtifact) -> None:
+        self.artifact = artifact
+        self.done = threading.Event()
+        self.verdict: Optional[Tuple[Vote, Sequence[Hint]]] = None
+        self.error: Optional[BaseException] = None
+
+
+class BatchingEnemy(Enemy):
+    """Coalesce concurrent :meth:`evaluate` calls into ``enemy.evaluate_many``.
+
+    Share one instance between runs executing on different threads. The
+    first caller waits up to ``max_wait_s`` for others to join (or until
+    ``max_batch`` artifacts are queued), then grades the whole group in one
+    call and hands every caller its own verdict.
+    """
+
+    def __init__(self, enemy: Enemy, max_batch: int = 8, max_wait_s: float = 0.05) -> None:
+        self.enemy = enemy
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_s
+        self._cond = threading.Condition()
+        self._pending: List[_Request] = []
+
+    def evaluate(self, artifact: FloorArtifact) -> Tuple[Vote, Sequence[Hint]]:
+        request = _Request(artifact)
+        with self._cond:
+            self._pending.append(request)
+            leader = len(self._pending) == 1
+            if not leader:
+                if len(self._pending) >= self.max_batch:
+                    self._cond.notify_all()
+            else:
+                deadline = time.monotonic() + self.max_wait_s
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+        if leader:
+            self._grade(batch)
+        else:
+            request.done.wait()
+        if request.error is not None:
+            raise request.error
+        assert request.verdict is not None
+        return request.verdict
+
+    def _grade(self, batch: List[_Request]) -> None:
+        for start in range(0, len(batch), self.max_batch):
+            chunk = batch[start : start + self.max_batch]
+            try:
+                verdicts = self.enemy.evaluate_many([r.artifact for r in chunk])
+            except BaseException as exc:
+                for request in chunk:
+                    request.error = exc
+            else:
+                for request, verdict in zip(chunk, verdicts):
+                    request.verdict = verdict
+                # requests a short batch left without a verdict are graded alone
+                for request in chunk[len(verdicts) :]:
+                    try:
+                        request.verdict = self.enemy.evaluate(request.artifact)
+                    except BaseException as exc:
+                        request.error = exc
+            for request in chunk:
+                request.done.set()
+
+    def evaluate_many(self, artifacts: Sequence[FloorArtifact]) -> List[Tuple[Vote, Sequence[Hint]]]:
+        return self.enemy.evaluate_many(artifacts)
+
+
+def as_async_player(player: Player | AsyncPlayer) -> AsyncPlayer:
+    """Return ``player`` unchanged if async, otherwise wrap it."""
+    return player if isinstance(player, AsyncPlayer) else AsyncPlayerAdapter(player)
+
+
+def as_async_enemy(enemy: Enemy | AsyncEnemy) -> AsyncEnemy:
+    """Return ``enemy`` unchanged if async, otherwise wrap it."""
+    return enemy if isinstance(enemy, AsyncEnemy) else AsyncEnemyAdapter(enemy)
+
+
+def as_async_boss(boss: Boss | AsyncBoss) -> AsyncBoss:
+    """Return ``boss`` unchanged if async, otherwise wrap it."""
+    return boss if isinstance(boss, AsyncBoss) else AsyncBossAdapter(boss)
+
+
 class StubPlayer(Player):
     """Player stub that increments revision per floor."""
 
@@ -48,14 +246,21 @@ class StubPlayer(Player):
         content = f"artifact floor {floor} rev {rev} ({len(hints)} hints)"
         return FloorArtifact(floor=floor, revision=rev, content=content, ext=".txt")
 
+    def retract(self, artifact: FloorArtifact) -> None:
+        if self._revs[artifact.floor] == artifact.revision + 1:
+            self._revs[artifact.floor] -= 1
+
 
 class StubEnemy(Enemy):
     """Enemy stub that accepts on revision > 0."""
 
+    # Hints are frozen, so one instance serves every rejection.
+    _HINTS = (Hint(text="improve"),)
+
     def evaluate(self, artifact: FloorArtifact) -> Tuple[Vote, Sequence[Hint]]:
         if artifact.revision > 0:
             return Vote.ACCEPT, tuple()
-        return Vote.REJECT, (Hint(text="improve"),)
+        return Vote.REJECT, self._HINTS
 
 
 class StubBoss(Boss):
@@ -2,63 +2,398 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import re
+import threading
+import time
+import weakref
 from collections import defaultdict
-from typing import Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from openai import OpenAI
+from openai import APIConnectionError, AsyncOpenAI, OpenAI
 
 from .models import FloorArtifact, Hint, Vote
-from .agents import Player, Enemy
+from .agents import AsyncEnemy, AsyncPlayer, Player, Enemy
+from .cache import EvalCache, digest, dump_verdict, load_verdict
+from .metering import report_usage
+from .ratelimit import Backoff, RateLimiter
+from .tracing import Span, span
+
+
+def _player_prompt(goal: str, floor: int, hints: Sequence[Hint]) -> str:
+    hint_text = "\n".join(h.text for h in hints)
+    return (
+        f"Goal: {goal}\n"
+        f"Floor: {floor}\n"
+        f"Hints:\n{hint_text}\n"
+        "Provide the artifact content only."
+    )
+
+
+def _lint_prompt(artifact: FloorArtifact) -> str:
+    return (
+        "You are a code reviewer. "
+        "Return ACCEPT or REJECT on the first line followed by up to 3 hints.\n"
+        "Focus on style or bugs.\n"
+        f"Code:\n{artifact.content}"
+    )
+
+
+def _parse_lint(content: str | None) -> Tuple[Vote, Tuple[Hint, ...]]:
+    text = (content or "").strip().splitlines()
+    vote_line = text[0].upper()
+    vote = Vote.ACCEPT if "ACCEPT" in vote_line else Vote.REJECT
+    hints = [Hint(text=line) for line in text[1:4]]
+    return vote, tuple(hints)
+
+
+def _lint_many_prompt(artifacts: Sequence[FloorArtifact]) -> str:
+    sections = "\n".join(f"### Artifact {i}\n{a.content}" for i, a in enumerate(artifacts))
+    return (
+        "You are a code reviewer. "
+        "For each artifact below, repeat its '### Artifact <n>' header, then "
+        "ACCEPT or REJECT on the next line followed by up to 3 hints.\n"
+        "Focus on style or bugs.\n"
+        f"{sections}"
+    )
+
+
+_ARTIFACT_HEADER = re.compile(r"^#+\s*Artifact\s+(\d+)\s*$", re.MULTILINE)
+
+
+def _parse_lint_many(content: str | None, count: int) -> Optional[List[Tuple[Vote, Tuple[Hint, ...]]]]:
+    """Split a batched review by artifact header; ``None`` if any is missing."""
+    parts = _ARTIFACT_HEADER.split(content or "")
+    verdicts = {int(idx): _parse_lint(body) for idx, body in zip(parts[1::2], parts[2::2]) if body.strip()}
+    if sorted(verdicts) != list(range(count)):
+        return None
+    return [verdicts[i] for i in range(count)]
+
+
+def _estimate_tokens(prompt: str) -> int:
+    return len(prompt) // 4 + 1
+
+
+def _retryable(exc: Exception) -> bool:
+    """Connection errors, timeouts, 429 and 5xx responses are worth retrying."""
+    if isinstance(exc, APIConnectionError):
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    value = None if response is None else response.headers.get("retry-after")
+    try:
+        return None if value is None else float(value)
+    except ValueError:
+        return None
+
+
+def _usage(resp: Any) -> Tuple[int, int]:
+    """``(prompt_tokens, completion_tokens)`` reported by the API, or zeros."""
+    usage = getattr(resp, "usage", None)
+    prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "completion_tokens", None)
+    if not isinstance(prompt, int) or not isinstance(completion, int):
+        return 0, 0
+    return prompt, completion
+
+
+def _settle(
+    limiter: Optional[RateLimiter], cost: int, model: str, resp: Any, start: float, sp: Span, retries: int
+) -> None:
+    """Reconcile the limiter, meter a finished request and annotate its span."""
+    prompt, completion = _usage(resp)
+    sp.set(retries=retries, prompt_tokens=prompt, completion_tokens=completion)
+    if limiter is not None:
+        limiter.settle(cost, prompt + completion if prompt or completion else None)
+    report_usage(
+        "llm",
+        seconds=time.perf_counter() - start,
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        model=model,
+    )
+
+
+class ChatClient:
+    """Chat completions through one OpenAI client with rate limiting and retries.
+
+    Requests wait for the ``limiter`` before going out; 429, 5xx and
+    connection failures are retried with jittered exponential backoff,
+    honouring ``Retry-After``. Share one instance between agents so they
+    reuse a single HTTP connection pool (see :func:`shared_client`).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        limiter: Optional[RateLimiter] = None,
+        backoff: Optional[Backoff] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.client = client
+        self.limiter = limiter
+        self.backoff = backoff or Backoff()
+        self._sleep = sleep
+
+    def complete(self, model: str, prompt: str) -> Optional[str]:
+        """Return the first choice's message content for a single-turn prompt.
+
+        Tokens, cost and wall time (including retries) are reported to the
+        active meter as an ``llm`` call; each retry adds an ``llm_retry``.
+        """
+        cost = _estimate_tokens(prompt)
+        start = time.perf_counter()
+        attempt = 0
+        with span("llm.request", model=model) as sp:
+            while True:
+                if self.limiter is not None:
+                    self._sleep(self.limiter.reserve(cost))
+                try:
+                    resp = self.client.chat.completions.create(
+                        model=model, messages=[{"role": "user", "content": prompt}]
+                    )
+                except Exception as exc:
+                    if not _retryable(exc) or attempt >= self.backoff.retries:
+                        raise
+                    report_usage("llm_retry")
+                    self._sleep(self.backoff.delay(attempt, _retry_after(exc)))
+                    attempt += 1
+                    continue
+                _settle(self.limiter, cost, model, resp, start, sp, attempt)
+                content: Optional[str] = resp.choices[0].message.content
+                return content
+
+
+class AsyncChatClient:
+    """Async counterpart of :class:`ChatClient`.
+
+    ``factory`` builds the underlying ``AsyncOpenAI`` client; one is created
+    per event loop because its connections cannot move between loops.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        limiter: Optional[RateLimiter] = None,
+        backoff: Optional[Backoff] = None,
+    ) -> None:
+        self.factory = factory
+        self.limiter = limiter
+        self.backoff = backoff or Backoff()
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            self._clients[loop] = self.factory()
+        return self._clients[loop]
+
+    async def complete(self, model: str, prompt: str) -> Optional[str]:
+        cost = _estimate_tokens(prompt)
+        start = time.perf_counter()
+        attempt = 0
+        with span("llm.request", model=model) as sp:
+            while True:
+                if self.limiter is not None:
+                    await asyncio.sleep(self.limiter.reserve(cost))
+                try:
+                    resp = await self.client.chat.completions.create(
+                        model=model, messages=[{"role": "user", "content": prompt}]
+                    )
+                except Exception as exc:
+                    if not _retryable(exc) or attempt >= self.backoff.retries:
+                        raise
+                    report_usage("llm_retry")
+                    await asyncio.sleep(self.backoff.delay(attempt, _retry_after(exc)))
+                    attempt += 1
+                    continue
+                _settle(self.limiter, cost, model, resp, start, sp, attempt)
+                content: Optional[str] = resp.choices[0].message.content
+                return content
+
+
+_registry_lock = threading.Lock()
+_clients: Dict[Tuple[Any, ...], Any] = {}
+_limiters: Dict[Tuple[Optional[str], Optional[str]], RateLimiter] = {}
+
+
+def _shared(kind: str, factory: Any) -> Any:
+    api_key = os.getenv("OPENAI_API_KEY")
+    base_url = os.getenv("OPENAI_BASE_URL")
+    key = (kind, factory, api_key, base_url)
+    with _registry_lock:
+        if key not in _clients:
+            # Sync and async clients for one account draw from the same limits.
+            limiter = _limiters.setdefault((api_key, base_url), RateLimiter.from_env())
+            if kind == "sync":
+                _clients[key] = ChatClient(factory(api_key=api_key, max_retries=0), limiter, Backoff.from_env())
+            else:
+                _clients[key] = AsyncChatClient(
+                    lambda: factory(api_key=api_key, max_retries=0), limiter, Backoff.from_env()
+                )
+        return _clients[key]
+
+
+def shared_client() -> ChatClient:
+    """Process-wide :class:`ChatClient` for the current ``OPENAI_API_KEY``.
+
+    Limits come from ``NEURODUNGEON_LLM_RPM``, ``NEURODUNGEON_LLM_TPM`` and
+    ``NEURODUNGEON_LLM_RETRIES``; they apply per process.
+    """
+    client: ChatClient = _shared("sync", OpenAI)
+    return client
+
+
+def shared_async_client() -> AsyncChatClient:
+    """Process-wide :class:`AsyncChatClient`, sharing limits with :func:`shared_client`."""
+    client: AsyncChatClient = _shared("async", AsyncOpenAI)
+    return client
+
+
+_Verdict = Tuple[Vote, Sequence[Hint]]
+
+
+def _cached_verdicts(
+    cache: Optional[EvalCache], model: str, artifacts: Sequence[FloorArtifact]
+) -> Tuple[List[Optional[_Verdict]], List[int]]:
+    """Look artifacts up under their single-review keys; return verdicts and miss indices."""
+    verdicts: List[Optional[_Verdict]] = [None] * len(artifacts)
+    if cache is not None:
+        for i, artifact in enumerate(artifacts):
+            hit = cache.get(digest("LintEnemyLLM", model, _lint_prompt(artifact)))
+            if hit is not None:
+                verdicts[i] = load_verdict(hit)
+    return verdicts, [i for i, v in enumerate(verdicts) if v is None]
+
+
+def _store_verdicts(
+    cache: Optional[EvalCache], model: str, artifacts: Sequence[FloorArtifact], verdicts: Sequence[_Verdict]
+) -> None:
+    if cache is None:
+        return
+    for artifact, (vote, hints) in zip(artifacts, verdicts):
+        cache.set(digest("LintEnemyLLM", model, _lint_prompt(artifact)), dump_verdict(vote, hints))
 
 
 class PlayerLLM(Player):
     """Player that delegates artifact creation to an LLM."""
 
-    def __init__(self, goal: str, model: str | None = None) -> None:
+    def __init__(self, goal: str, model: str | None = None, client: Optional[ChatClient] = None) -> None:
         self.goal = goal
         self.model: str = model or os.getenv("OPENAI_MODEL") or "gpt-3.5-turbo"
         self._revs: dict[int, int] = defaultdict(int)
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = client or shared_client()
 
     def act(self, floor: int, hints: Sequence[Hint]) -> FloorArtifact:
-        hint_text = "\n".join(h.text for h in hints)
-        prompt = (
-            f"Goal: {self.goal}\n"
-            f"Floor: {floor}\n"
-            f"Hints:\n{hint_text}\n"
-            "Provide the artifact content only."
-        )
-        resp = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        content = resp.choices[0].message.content or ""
+        content = self.client.complete(self.model, _player_prompt(self.goal, floor, hints)) or ""
         rev = self._revs[floor]
         self._revs[floor] += 1
         return FloorArtifact(floor=floor, revision=rev, content=content, ext=".txt")
 
+    def retract(self, artifact: FloorArtifact) -> None:
+        if self._revs[artifact.floor] == artifact.revision + 1:
+            self._revs[artifact.floor] -= 1
+
 
 class LintEnemyLLM(Enemy):
-    """Enemy that asks the LLM to lint code."""
+    """Enemy that asks the LLM to lint code.
+
+    With a ``cache``, verdicts are keyed by model and prompt, so repeated
+    content skips the API call.
+    """
 
-    def __init__(self, model: str | None = None) -> None:
+    def __init__(
+        self, model: str | None = None, cache: Optional[EvalCache] = None, client: Optional[ChatClient] = None
+    ) -> None:
         self.model: str = model or os.getenv("OPENAI_MODEL") or "gpt-4.1-nano"
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = client or shared_client()
+        self.cache = cache
 
     def evaluate(self, artifact: FloorArtifact) -> Tuple[Vote, Sequence[Hint]]:
-        prompt = (
-            "You are a code reviewer. "
-            "Return ACCEPT or REJECT on the first line followed by up to 3 hints.\n"
-            "Focus on style or bugs.\n"
-            f"Code:\n{artifact.content}"
-        )
-        resp = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        text = (resp.choices[0].message.content or "").strip().splitlines()
-        vote_line = text[0].upper()
-        vote = Vote.ACCEPT if "ACCEPT" in vote_line else Vote.REJECT
-        hints = [Hint(text=line) for line in text[1:4]]
-        return vote, tuple(hints)
+        prompt = _lint_prompt(artifact)
+        key = digest("LintEnemyLLM", self.model, prompt)
+        if self.cache is not None and (hit := self.cache.get(key)) is not None:
+            return load_verdict(hit)
+        vote, hints = _parse_lint(self.client.complete(self.model, prompt))
+        if self.cache is not None:
+            self.cache.set(key, dump_verdict(vote, hints))
+        return vote, hints
+
+    def evaluate_many(self, artifacts: Sequence[FloorArtifact]) -> List[Tuple[Vote, Sequence[Hint]]]:
+        """Review all uncached artifacts in one prompt.
+
+        Falls back to one call per artifact if the reply cannot be split.
+        """
+        verdicts, misses = _cached_verdicts(self.cache, self.model, artifacts)
+        if len(misses) == 1:
+            verdicts[misses[0]] = self.evaluate(artifacts[misses[0]])
+        elif misses:
+            batch = [artifacts[i] for i in misses]
+            parsed = _parse_lint_many(self.client.complete(self.model, _lint_many_prompt(batch)), len(batch))
+            if parsed is not None:
+                _store_verdicts(self.cache, self.model, batch, parsed)
+            results: Sequence[_Verdict] = parsed if parsed is not None else [self.evaluate(a) for a in batch]
+            for i, verdict in zip(misses, results):
+                verdicts[i] = verdict
+        return [v if v is not None else self.evaluate(a) for v, a in zip(verdicts, artifacts)]
+
+
+class AsyncPlayerLLM(AsyncPlayer):
+    """Async counterpart of :class:`PlayerLLM` using ``AsyncOpenAI``."""
+
+    def __init__(self, goal: str, model: str | None = None, client: Optional[AsyncChatClient] = None) -> None:
+        self.goal = goal
+        self.model: str = model or os.getenv("OPENAI_MODEL") or "gpt-3.5-turbo"
+        self._revs: dict[int, int] = defaultdict(int)
+        self.client = client or shared_async_client()
+
+    async def act(self, floor: int, hints: Sequence[Hint]) -> FloorArtifact:
+        content = await self.client.complete(self.model, _player_prompt(self.goal, floor, hints)) or ""
+        rev = self._revs[floor]
+        self._revs[floor] += 1
+        return FloorArtifact(floor=floor, revision=rev, content=content, ext=".txt")
+
+    def retract(self, artifact: FloorArtifact) -> None:
+        if self._revs[artifact.floor] == artifact.revision + 1:
+            self._revs[artifact.floor] -= 1
+
+
+class AsyncLintEnemyLLM(AsyncEnemy):
+    """Async counterpart of :class:`LintEnemyLLM` using ``AsyncOpenAI``."""
+
+    def __init__(
+        self, model: str | None = None, cache: Optional[EvalCache] = None, client: Optional[AsyncChatClient] = None
+    ) -> None:
+        self.model: str = model or os.getenv("OPENAI_MODEL") or "gpt-4.1-nano"
+        self.client = client or shared_async_client()
+        self.cache = cache
+
+    async def evaluate(self, artifact: FloorArtifact) -> Tuple[Vote, Sequence[Hint]]:
+        prompt = _lint_prompt(artifact)
+        key = digest("LintEnemyLLM", self.model, prompt)
+        if self.cache is not None and (hit := self.cache.get(key)) is not None:
+            return load_verdict(hit)
+        vote, hints = _parse_lint(await self.client.complete(self.model, prompt))
+        if self.cache is not None:
+            self.cache.set(key, dump_verdict(vote, hints))
+        return vote, hints
+
+    async def evaluate_many(self, artifacts: Sequence[FloorArtifact]) -> List[Tuple[Vote, Sequence[Hint]]]:
+        verdicts, misses = _cached_verdicts(self.cache, self.model, artifacts)
+        if len(misses) == 1:
+            verdicts[misses[0]] = await self.evaluate(artifacts[misses[0]])
+        elif misses:
+            batch = [artifacts[i] for i in misses]
+            parsed = _parse_lint_many(await self.client.complete(self.model, _lint_many_prompt(batch)), len(batch))
+            if parsed is not None:
+                _store_verdicts(self.cache, self.model, batch, parsed)
+            results: Sequence[_Verdict] = parsed if parsed is not None else [await self.evaluate(a) for a in batch]
+            for i, verdict in zip(misses, results):
+                verdicts[i] = verdict
+        return [v if v is not None else await self.evaluate(a) for v, a in zip(verdicts, artifacts)]
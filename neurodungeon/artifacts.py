@@ -0,0 +1,150 @@
+"""Streaming artifact storage and file-backed artifact handles."""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, overload
+
+from .models import FloorArtifact
+
+# Characters encoded per write; bounds the transient bytes copy.
+CHUNK_CHARS = 1 << 20
+
+
+def artifact_file(persist_dir: Path, floor: int, revision: int, ext: str) -> Path:
+    return persist_dir / f"floor_{floor}" / f"rev_{revision}{ext}"
+
+
+def write_artifact(path: Path, content: str, limit: Optional[int] = None) -> Tuple[int, str]:
+    """Write ``content`` as UTF-8 to ``path``; return ``(size, sha256)``.
+
+    Encoding, the ``limit`` check, hashing and writing happen in one pass
+    over ``content`` with at most one chunk of encoded bytes alive. An
+    artifact over ``limit`` raises ``ValueError`` and leaves no file behind;
+    ASCII content is rejected before anything is written.
+    """
+    if limit is not None and content.isascii() and len(content) > limit:
+        raise ValueError("Artifact too large")
+    tmp = path.with_name(path.name + ".tmp")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with tmp.open("wb") as f:
+            for start in range(0, len(content), CHUNK_CHARS):
+                chunk = content[start : start + CHUNK_CHARS].encode()
+                size += len(chunk)
+                if limit is not None and size > limit:
+                    raise ValueError("Artifact too large")
+                digest.update(chunk)
+                f.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+class ArtifactHandle:
+    """A persisted artifact whose content stays on disk until it is read.
+
+    Mirrors the read-only surface of :class:`FloorArtifact` (``floor``,
+    ``revision``, ``ext``, ``content``, ``path()``); :meth:`mapped` gives
+    zero-copy access to the encoded bytes.
+    """
+
+    __slots__ = ("floor", "revision", "ext", "file", "size", "sha256")
+
+    def __init__(
+        self, floor: int, revision: int, ext: str, file: Path, size: int, sha256: Optional[str] = None
+    ) -> None:
+        self.floor = floor
+        self.revision = revision
+        self.ext = ext
+        self.file = file
+        self.size = size
+        self.sha256 = sha256
+
+    @classmethod
+    def open(cls, persist_dir: Path, floor: int, revision: int, ext: str) -> "ArtifactHandle":
+        """Handle for an artifact already persisted under ``persist_dir``."""
+        file = artifact_file(persist_dir, floor, revision, ext)
+        return cls(floor, revision, ext, file, file.stat().st_size)
+
+    @contextmanager
+    def mapped(self) -> Iterator[memoryview]:
+        """Memory-map the artifact file read-only."""
+        with self.file.open("rb") as f:
+            if self.size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    @property
+    def content(self) -> str:
+        with self.mapped() as data:
+            return str(data, "utf-8")
+
+    def load(self) -> FloorArtifact:
+        return FloorArtifact(floor=self.floor, revision=self.revision, content=self.content, ext=self.ext)
+
+    def path(self, run_id: str) -> Path:
+        return Path(run_id) / f"floor_{self.floor}" / f"rev_{self.revision}{self.ext}"
+
+    def __repr__(self) -> str:
+        return f"ArtifactHandle(floor={self.floor}, revision={self.revision}, ext={self.ext!r}, size={self.size})"
+
+
+Artifact = Union[FloorArtifact, ArtifactHandle]
+
+
+class ArtifactHistory(Sequence[FloorArtifact]):
+    """The artifacts of a run as a sequence of :class:`FloorArtifact`.
+
+    Only :class:`ArtifactHandle` metadata is held; each item is read from
+    disk when it is accessed, so iterating streams one artifact at a time.
+    Use :attr:`handles` to inspect metadata without loading content.
+    """
+
+    def __init__(self, handles: Iterable[ArtifactHandle] = ()) -> None:
+        self.handles: List[ArtifactHandle] = list(handles)
+
+    def append(self, handle: ArtifactHandle) -> None:
+        self.handles.append(handle)
+
+    def latest(self) -> "ArtifactHistory":
+        """The last revision of every floor, in the order floors were first reached."""
+        latest: Dict[int, ArtifactHandle] = {}
+        for handle in self.handles:
+            latest[handle.floor] = handle
+        return ArtifactHistory(latest.values())
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    @overload
+    def __getitem__(self, index: int) -> FloorArtifact: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ArtifactHistory": ...
+
+    def __getitem__(self, index: int | slice) -> "FloorArtifact | ArtifactHistory":
+        if isinstance(index, slice):
+            return ArtifactHistory(self.handles[index])
+        return self.handles[index].load()
+
+    def __iter__(self) -> Iterator[FloorArtifact]:
+        for handle in self.handles:
+            yield handle.load()
+
+    def __repr__(self) -> str:
+        return f"ArtifactHistory({self.handles!r})"
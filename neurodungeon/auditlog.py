@@ -0,0 +1,98 @@
+"""Buffered writer for the per-run ``log.jsonl`` audit log."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, List, Literal, Optional
+
+FsyncPolicy = Literal["record", "floor", "close"]
+
+_encode = json.JSONEncoder().encode
+
+
+def utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp with ``Z`` suffix, as used in audit records."""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+class AuditLog:
+    """Append JSON records to ``path`` through a single open handle.
+
+    Records are timestamped when written and buffered in memory; the buffer
+    goes to the OS when it holds ``buffer_records`` lines, at the end of
+    every floor and on close. ``fsync`` controls durability: ``"record"``
+    syncs after every record, ``"floor"`` at the end of every floor and
+    ``"close"`` only when the log is closed. Use as a context manager so the
+    buffer is flushed even when a run aborts with an exception.
+    """
+
+    def __init__(self, path: Path, fsync: FsyncPolicy = "close", buffer_records: int = 64) -> None:
+        self.path = Path(path)
+        self.fsync = fsync
+        self.buffer_records = buffer_records
+        self._buf: List[bytes] = []
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh: Optional[BinaryIO] = self.path.open("ab")
+
+    def __enter__(self) -> "AuditLog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._fh is None
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Add a ``timestamp`` to ``record`` and queue it for writing."""
+        record["timestamp"] = utc_timestamp()
+        line = (_encode(record) + "\n").encode()
+        with self._lock:
+            self._buf.append(line)
+            if self.fsync == "record":
+                self._flush(sync=True)
+            elif len(self._buf) >= self.buffer_records:
+                self._flush(sync=False)
+
+    def end_floor(self) -> None:
+        """Hand buffered records to the OS; fsync under the ``"floor"`` policy."""
+        with self._lock:
+            self._flush(sync=self.fsync == "floor")
+
+    def flush(self, sync: bool = False) -> None:
+        with self._lock:
+            self._flush(sync)
+
+    def tell(self) -> int:
+        """Flush and return the size of the log in bytes."""
+        with self._lock:
+            self._flush(sync=False)
+            assert self._fh is not None
+            return self._fh.tell()
+
+    def _flush(self, sync: bool) -> None:
+        if self._fh is None:
+            raise ValueError("audit log is closed")
+        if self._buf:
+            self._fh.write(b"".join(self._buf))
+            self._buf.clear()
+            self._fh.flush()
+        if sync:
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        """Flush, fsync and close the handle. Safe to call twice."""
+        with self._lock:
+            if self._fh is None:
+                return
+            try:
+                self._flush(sync=True)
+            finally:
+                self._fh.close()
+                self._fh = None
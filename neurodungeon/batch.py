@@ -0,0 +1,245 @@
+"""Run many NeuroDungeon goals across a process pool."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import ConfigDict
+
+from .agents import BatchingEnemy, Boss, Enemy, Player, StubBoss, StubEnemy, StubPlayer
+from .cache import EvalCache
+from .models import NDModel, RunConfig, Vote
+from .orchestrator import Orchestrator
+from .report import render_report
+
+Agents = Tuple[Player, List[List[Enemy]], Boss]
+AgentFactory = Callable[["BatchJob"], Agents]
+
+
+class BatchJob(NDModel):
+    """One run of a batch: a goal, its config and the enemies per floor."""
+
+    model_config = ConfigDict(frozen=True)
+
+    goal: str
+    config: RunConfig
+    floors: List[int]
+    use_llm: bool = False
+    cache: bool = False
+    report_template: Optional[Path] = None
+    resume: bool = False
+    queue: Optional[Path] = None
+    queue_timeout: float = 600.0
+
+
+class BatchResult(NDModel):
+    """Outcome of a single batch run; ``vote`` is ``None`` if the run errored."""
+
+    run_id: str
+    goal: str
+    vote: Optional[Vote] = None
+    lives: int = 0
+    llm_calls: int = 0
+    error: Optional[str] = None
+
+
+class BatchSummary(NDModel):
+    """Aggregated results of :func:`run_batch`, in job order."""
+
+    results: List[BatchResult]
+
+    @property
+    def passed(self) -> int:
+        return sum(r.vote is Vote.ACCEPT for r in self.results)
+
+    @property
+    def failed(self) -> int:
+        return sum(r.vote is Vote.REJECT for r in self.results)
+
+    @property
+    def errored(self) -> int:
+        return sum(r.error is not None for r in self.results)
+
+
+def build_agents(job: BatchJob) -> Agents:
+    """Default factory: stub agents, or LLM agents when ``job.use_llm``.
+
+    With ``job.cache`` the LLM enemies share an :class:`EvalCache` stored
+    under the run's ``persist_dir``. With ``job.queue`` enemies are
+    :class:`~neurodungeon.workqueue.RemoteEnemy` proxies for the ``lint``
+    (LLM) or ``stub`` enemies of workers polling that queue; a verdict not
+    posted within ``job.queue_timeout`` seconds fails the run. Release them
+    with :func:`close_agents`.
+    """
+    if job.queue is not None:
+        from .workqueue import RemoteEnemy, SQLiteTransport
+
+        transport = SQLiteTransport(job.queue)
+        name = "lint" if job.use_llm else "stub"
+        remote: List[List[Enemy]] = [
+            [RemoteEnemy(transport, name, timeout_s=job.queue_timeout) for _ in range(n)] for n in job.floors
+        ]
+        player: Player = StubPlayer()
+        if job.use_llm:
+            from .agents_llm import PlayerLLM
+
+            player = PlayerLLM(job.goal)
+        return player, remote, StubBoss()
+    if job.use_llm:
+        from .agents_llm import LintEnemyLLM, PlayerLLM
+
+        cache = EvalCache.for_run(job.config) if job.cache else None
+        enemies: List[List[Enemy]] = [[LintEnemyLLM(cache=cache) for _ in range(n)] for n in job.floors]
+        return PlayerLLM(job.goal), enemies, StubBoss()
+    return StubPlayer(), [[StubEnemy() for _ in range(n)] for n in job.floors], StubBoss()
+
+
+def close_agents(agents: Agents) -> None:
+    """Call ``close()`` on the enemies that have one, such as queue-backed ones."""
+    for floor_enemies in agents[1]:
+        for enemy in floor_enemies:
+            close = getattr(enemy, "close", None)
+            if callable(close):
+                close()
+
+
+def jobs_from_goals(
+    goals: Iterable[str],
+    floors: Sequence[int],
+    prefix: str = "batch",
+    use_llm: bool = False,
+    cache: bool = False,
+    report_template: Optional[Path] = None,
+    resume: bool = False,
+    queue: Optional[Path] = None,
+    queue_timeout: float = 600.0,
+    **cfg: Any,
+) -> List[BatchJob]:
+    """Create one job per goal with run ids ``{prefix}_00000``, ``{prefix}_00001`` ..."""
+    return [
+        BatchJob(
+            goal=goal,
+            config=RunConfig(run_id=f"{prefix}_{i:05d}", **cfg),
+            floors=list(floors),
+            use_llm=use_llm,
+            cache=cache,
+            report_template=report_template,
+            resume=resume,
+            queue=queue,
+            queue_timeout=queue_timeout,
+        )
+        for i, goal in enumerate(goals)
+    ]
+
+
+def run_job(job: BatchJob, factory: AgentFactory = build_agents, agents: Optional[Agents] = None) -> BatchResult:
+    """Execute a single job and write its report next to the log.
+
+    ``agents`` overrides ``factory`` with already-built agents, which the
+    caller then closes; agents built here are closed when the run ends.
+    Errors, including those building the agents, are returned in the result.
+    """
+    cfg = job.config
+    assert cfg.persist_dir is not None
+    orch: Optional[Orchestrator] = None
+    built: Optional[Agents] = None
+    try:
+        if agents is None:
+            agents = built = factory(job)
+        player, enemies, boss = agents
+        orch = Orchestrator(player, enemies, boss)
+        vote = orch.run(job.goal, cfg, resume=job.resume)
+    except Exception as exc:
+        return _error_result(job, exc, orch)
+    finally:
+        if built is not None:
+            close_agents(built)
+    report_md = render_report(
+        cfg.run_id,
+        orch.artifacts,
+        cfg.persist_dir / "log.jsonl",
+        orch.llm_calls,
+        cfg.lives,
+        template=job.report_template,
+    )
+    (cfg.persist_dir / "report.md").write_text(report_md)
+    return BatchResult(run_id=cfg.run_id, goal=job.goal, vote=vote, lives=orch.lives, llm_calls=orch.llm_calls)
+
+
+def _error_result(job: BatchJob, exc: Exception, orch: Optional[Orchestrator] = None) -> BatchResult:
+    return BatchResult(
+        run_id=job.config.run_id,
+        goal=job.goal,
+        lives=orch.lives if orch is not None else 0,
+        llm_calls=orch.llm_calls if orch is not None else 0,
+        error=f"{type(exc).__name__}: {exc}",
+    )
+
+
+def _run_coalesced(jobs: Sequence[BatchJob], factory: AgentFactory) -> List[BatchResult]:
+    """Run ``jobs`` on threads with each enemy slot shared through a :class:`BatchingEnemy`.
+
+    Slot ``(floor, enemy_idx)`` is served by the first job's enemy for that
+    slot, so jobs in one chunk are expected to use equivalent enemies. Every
+    job's own agents are closed once the whole chunk has finished.
+    """
+    built: List[Agents | Exception] = []
+    for job in jobs:
+        try:
+            built.append(factory(job))
+        except Exception as exc:
+            built.append(exc)
+    owned = [(a[0], [list(f) for f in a[1]], a[2]) for a in built if not isinstance(a, Exception)]
+    slots: Dict[Tuple[int, int], Enemy] = {}
+    for agents in built:
+        if isinstance(agents, Exception):
+            continue
+        for floor, floor_enemies in enumerate(agents[1]):
+            for idx, enemy in enumerate(floor_enemies):
+                floor_enemies[idx] = slots.setdefault((floor, idx), BatchingEnemy(enemy, max_batch=len(jobs)))
+
+    def run(job: BatchJob, agents: Agents | Exception) -> BatchResult:
+        if isinstance(agents, Exception):
+            return _error_result(job, agents)
+        return run_job(job, agents=agents)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            return list(pool.map(run, jobs, built))
+    finally:
+        for agents in owned:
+            close_agents(agents)
+
+
+def _run_chunk(args: Tuple[Sequence[BatchJob], AgentFactory, bool]) -> List[BatchResult]:
+    jobs, factory, coalesce = args
+    if coalesce and len(jobs) > 1:
+        return _run_coalesced(jobs, factory)
+    return [run_job(job, factory) for job in jobs]
+
+
+def run_batch(
+    jobs: Sequence[BatchJob],
+    workers: Optional[int] = None,
+    factory: AgentFactory = build_agents,
+    chunksize: int = 1,
+    coalesce: bool = False,
+) -> BatchSummary:
+    """Run ``jobs`` on ``workers`` processes (default: CPU count).
+
+    ``factory`` must be picklable, i.e. a module-level function. Jobs are
+    shipped to workers in chunks of ``chunksize`` to amortise IPC for large
+    batches. ``workers=1`` runs everything in the calling process. With
+    ``coalesce`` the jobs of a chunk run concurrently and same-floor
+    artifacts are graded with one ``Enemy.evaluate_many`` call per slot.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [(jobs[i : i + chunksize], factory, coalesce) for i in range(0, len(jobs), chunksize)]
+    if workers == 1:
+        return BatchSummary(results=[r for chunk in chunks for r in _run_chunk(chunk)])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = [r for chunk in pool.map(_run_chunk, chunks) for r in chunk]
+    return BatchSummary(results=results)
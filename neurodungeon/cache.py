@@ -0,0 +1,150 @@
+"""Content-addressed cache for enemy verdicts and sandbox results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+from .models import Hint, RunConfig, Vote
+
+
+def digest(*parts: Union[str, bytes, int, float]) -> str:
+    """Return a SHA-256 hex key over ``parts``; each part is length-prefixed."""
+    h = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode()
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def dump_verdict(vote: Vote, hints: Sequence[Hint]) -> str:
+    """Serialize an enemy verdict for :class:`EvalCache`."""
+    return json.dumps({"vote": vote.value, "hints": [h.text for h in hints]})
+
+
+def load_verdict(value: str) -> Tuple[Vote, Tuple[Hint, ...]]:
+    """Inverse of :func:`dump_verdict`."""
+    data = json.loads(value)
+    return Vote(data["vote"]), tuple(Hint(text=t) for t in data["hints"])
+
+
+class HitCounter:
+    """Cache lookups seen while a :func:`count_hits` block is active."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def served(self) -> bool:
+        """True if every lookup was a hit, i.e. no real work was done."""
+        return self.hits > 0 and self.misses == 0
+
+
+_counter: ContextVar[Optional[HitCounter]] = ContextVar("neurodungeon_cache_counter", default=None)
+
+
+@contextmanager
+def count_hits() -> Iterator[HitCounter]:
+    """Record cache lookups made by the current context (thread or task)."""
+    counter = HitCounter()
+    token = _counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _counter.reset(token)
+
+
+class EvalCache:
+    """Two-tier cache mapping keys from :func:`digest` to JSON strings.
+
+    The memory tier is an LRU holding ``max_entries`` values. When
+    ``disk_dir`` is given, values are also written there (one file per key)
+    so they survive restarts. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = 1024, disk_dir: Optional[Path] = None) -> None:
+        self.max_entries = max_entries
+        self.disk_dir = None if disk_dir is None else Path(disk_dir)
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._mem: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_run(cls, cfg: RunConfig, max_entries: int = 1024) -> "EvalCache":
+        """Cache whose disk tier lives in ``<persist_dir>/cache``."""
+        assert cfg.persist_dir is not None
+        return cls(max_entries=max_entries, disk_dir=cfg.persist_dir / "cache")
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, value: str) -> None:
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for ``key`` or ``None``."""
+        counter = _counter.get()
+        with self._lock:
+            value = self._mem.get(key)
+            if value is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+        if value is None and self.disk_dir is not None:
+            try:
+                value = self._disk_path(key).read_text()
+            except FileNotFoundError:
+                pass
+            else:
+                with self._lock:
+                    self._remember(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+        if value is None:
+            with self._lock:
+                self.misses += 1
+        if counter is not None:
+            if value is None:
+                counter.misses += 1
+            else:
+                counter.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store ``value`` in both tiers."""
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(value)
+            os.replace(tmp, path)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the memory tier size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._mem),
+            }
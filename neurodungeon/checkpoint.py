@@ -0,0 +1,74 @@
+"""Per-floor checkpoints so interrupted runs can resume."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import ConfigDict
+
+from .artifacts import ArtifactHandle
+from .models import Hint, NDModel, RunConfig, Vote
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+class ArtifactRef(NDModel):
+    """Location of a persisted artifact inside ``persist_dir``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    floor: int
+    revision: int
+    ext: str
+
+    def load(self, persist_dir: Path) -> ArtifactHandle:
+        return ArtifactHandle.open(persist_dir, self.floor, self.revision, self.ext)
+
+
+class Checkpoint(NDModel):
+    """Orchestrator state after the last completed floor.
+
+    ``log_offset`` is the size of ``log.jsonl`` at that point; records past
+    it belong to an unfinished floor and are dropped on resume. ``result``
+    is set once the run has finished. ``floor_hints`` holds the hints of
+    every completed floor when the run follows ``floor_deps``.
+    """
+
+    next_floor: int
+    lives: int
+    llm_calls: int
+    prev_hints: List[str]
+    artifacts: List[ArtifactRef]
+    log_offset: int
+    result: Optional[Vote] = None
+    floor_hints: List[List[str]] = []
+
+    @property
+    def hints(self) -> List[Hint]:
+        return [Hint(text=t) for t in self.prev_hints]
+
+    def load_artifacts(self, persist_dir: Path) -> List[ArtifactHandle]:
+        return [ref.load(persist_dir) for ref in self.artifacts]
+
+
+def checkpoint_path(cfg: RunConfig) -> Path:
+    assert cfg.persist_dir is not None
+    return cfg.persist_dir / CHECKPOINT_FILE
+
+
+def save_checkpoint(cfg: RunConfig, checkpoint: Checkpoint) -> None:
+    """Atomically replace the run's checkpoint file."""
+    path = checkpoint_path(cfg)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(checkpoint.model_dump_json())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(cfg: RunConfig) -> Optional[Checkpoint]:
+    """Return the run's checkpoint, or ``None`` if it has none."""
+    path = checkpoint_path(cfg)
+    if not path.exists():
+        return None
+    return Checkpoint.model_validate_json(path.read_text())
@@ -0,0 +1,201 @@
+"""SQLite index over many runs' ``log.jsonl`` files for cross-run analytics."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .report import iter_log
+
+# Bump when the schema changes; older indexes are dropped and rebuilt from the logs.
+_SCHEMA_VERSION = 3
+# Bytes before the indexed offset hashed to detect a log rewritten under us.
+_TAIL_BYTES = 4096
+# Rows are keyed by ``log``, the resolved log path; ``run_id`` is the run
+# directory's name, kept for display since different roots can reuse it.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    offset INTEGER NOT NULL,
+    tail TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS votes (
+    log TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    floor INTEGER NOT NULL,
+    enemy_idx INTEGER NOT NULL,
+    vote TEXT NOT NULL,
+    cached INTEGER NOT NULL DEFAULT 0,
+    timestamp TEXT
+);
+CREATE TABLE IF NOT EXISTS hints (
+    log TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    floor INTEGER NOT NULL,
+    enemy_idx INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS life_losses (
+    log TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    floor INTEGER NOT NULL,
+    timestamp TEXT
+);
+CREATE TABLE IF NOT EXISTS boss_votes (
+    log TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    vote TEXT NOT NULL,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS votes_log_floor ON votes (log, floor);
+CREATE INDEX IF NOT EXISTS hints_log ON hints (log);
+CREATE INDEX IF NOT EXISTS life_losses_log ON life_losses (log);
+CREATE INDEX IF NOT EXISTS boss_votes_log ON boss_votes (log);
+CREATE INDEX IF NOT EXISTS votes_enemy ON votes (enemy_idx, vote);
+CREATE INDEX IF NOT EXISTS hints_text ON hints (text);
+CREATE INDEX IF NOT EXISTS life_losses_floor ON life_losses (floor);
+"""
+
+QUERIES: Dict[str, str] = {
+    "rejects-by-enemy": """
+        SELECT enemy_idx, SUM(vote = 'REJECT') AS rejects, COUNT(*) AS votes,
+               ROUND(AVG(vote = 'REJECT'), 3) AS reject_rate
+        FROM votes GROUP BY enemy_idx ORDER BY rejects DESC, enemy_idx
+    """,
+    "lives-per-floor": """
+        SELECT v.floor, COUNT(DISTINCT v.log) AS runs,
+               ROUND(COALESCE(l.losses, 0) * 1.0 / COUNT(DISTINCT v.log), 3) AS avg_lives_lost
+        FROM votes v
+        LEFT JOIN (SELECT floor, COUNT(*) AS losses FROM life_losses GROUP BY floor) l ON l.floor = v.floor
+        GROUP BY v.floor ORDER BY v.floor
+    """,
+    "boss-votes": "SELECT vote, COUNT(*) AS runs FROM boss_votes GROUP BY vote ORDER BY runs DESC",
+    "top-hints": "SELECT text, COUNT(*) AS uses FROM hints GROUP BY text ORDER BY uses DESC, text LIMIT 20",
+}
+
+
+def _tail_hash(log_path: Path, offset: int) -> str:
+    """Hash the bytes just before ``offset``, which always end a record."""
+    start = max(offset - _TAIL_BYTES, 0)
+    with log_path.open("rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+class RunIndex:
+    """Incrementally ingest run logs into a SQLite database.
+
+    Each ``log.jsonl`` is tracked by path with the byte offset and mtime
+    already indexed, so re-running :meth:`ingest` only parses appended
+    records. A log that shrank, or whose bytes before the offset changed (a
+    resumed run truncates and regrows it), is re-indexed from the start.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            with self.conn:
+                for table in ("files", "votes", "hints", "life_losses", "boss_votes"):
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "RunIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def ingest(self, root: Path) -> int:
+        """Index every ``log.jsonl`` under ``root``; return the number of new records."""
+        root = Path(root)
+        logs = [root / "log.jsonl"] if (root / "log.jsonl").exists() else sorted(root.glob("*/log.jsonl"))
+        return sum(self.ingest_file(log) for log in logs)
+
+    def ingest_file(self, log_path: Path) -> int:
+        path = str(log_path.resolve())
+        run_id = log_path.parent.name
+        stat = log_path.stat()
+        row = self.conn.execute("SELECT mtime, offset, tail FROM files WHERE path = ?", (path,)).fetchone()
+        offset = 0
+        if row is not None:
+            mtime, offset, tail = row
+            if mtime == stat.st_mtime and offset == stat.st_size:
+                return 0
+            if stat.st_size < offset or _tail_hash(log_path, offset) != tail:
+                self._forget(path)
+                offset = 0
+
+        votes: List[Tuple[Any, ...]] = []
+        hints: List[Tuple[Any, ...]] = []
+        losses: List[Tuple[Any, ...]] = []
+        bosses: List[Tuple[Any, ...]] = []
+        for offset, rec in iter_log(log_path, offset):
+            ts = rec.get("timestamp")
+            if "enemy_idx" in rec and "vote" in rec:
+                cached = int(rec.get("cached", False))
+                votes.append((path, run_id, rec["floor"], rec["enemy_idx"], rec["vote"], cached, ts))
+                hints.extend((path, run_id, rec["floor"], rec["enemy_idx"], h) for h in rec.get("hints", ()))
+            elif "life_lost" in rec:
+                losses.append((path, run_id, rec["floor"], ts))
+            elif "boss_vote" in rec:
+                bosses.append((path, run_id, rec["boss_vote"], ts))
+
+        with self.conn:
+            self.conn.executemany("INSERT INTO votes VALUES (?, ?, ?, ?, ?, ?, ?)", votes)
+            self.conn.executemany("INSERT INTO hints VALUES (?, ?, ?, ?, ?)", hints)
+            self.conn.executemany("INSERT INTO life_losses VALUES (?, ?, ?, ?)", losses)
+            self.conn.executemany("INSERT INTO boss_votes VALUES (?, ?, ?, ?)", bosses)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                (path, run_id, stat.st_mtime, offset, _tail_hash(log_path, offset)),
+            )
+        return len(votes) + len(losses) + len(bosses)
+
+    def _forget(self, path: str) -> None:
+        with self.conn:
+            for table in ("votes", "hints", "life_losses", "boss_votes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE log = ?", (path,))
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        """Run ``sql`` (or the name of a query in :data:`QUERIES`); return ``(columns, rows)``."""
+        cur = self.conn.execute(QUERIES.get(sql, sql), params)
+        return [d[0] for d in cur.description or ()], cur.fetchall()
+
+
+def format_rows(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """Tab-separated table with a header line."""
+    lines = ["\t".join(columns)]
+    lines += ["\t".join("" if v is None else str(v) for v in row) for row in rows]
+    return "\n".join(lines)
+
+
+def index_cli(argv: Sequence[str]) -> None:
+    parser = ArgumentParser(description="Index run logs into SQLite for cross-run queries")
+    parser.add_argument("roots", nargs="+", type=Path, help="run directories or their parent")
+    parser.add_argument("--db", type=Path, required=True)
+    args = parser.parse_args(argv)
+    with RunIndex(args.db) as index:
+        added = sum(index.ingest(root) for root in args.roots)
+    print(f"Indexed {added} new records into {args.db.resolve()}")
+
+
+def query_cli(argv: Sequence[str]) -> None:
+    parser = ArgumentParser(description="Query a run index built with `neurodungeon index`")
+    parser.add_argument("query", help=f"one of {', '.join(QUERIES)} or an SQL statement")
+    parser.add_argument("--db", type=Path, required=True)
+    args = parser.parse_args(argv)
+    if not args.db.exists():
+        parser.error(f"index {args.db} does not exist")
+    with RunIndex(args.db) as index:
+        columns, rows = index.query(args.query)
+    print(format_rows(columns, rows))
@@ -0,0 +1,202 @@
+"""Per-floor usage metering: calls by kind, wall time, tokens and cost."""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .models import NDModel
+
+# USD per million (prompt, completion) tokens; unknown models cost nothing.
+PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+
+def cost_usd(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """Price of a call according to :data:`PRICES`."""
+    prompt_price, completion_price = PRICES.get(model or "", (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class Usage(NDModel):
+    """Resources used by one floor (or the boss, or a whole run).
+
+    ``calls`` and ``seconds`` are keyed by kind: ``player``, ``enemy`` and
+    ``boss`` for agent calls as timed by the orchestrator, plus whatever
+    agents report themselves, e.g. ``llm`` requests and ``sandbox`` runs.
+    Agent seconds include the nested ``llm``/``sandbox`` time.
+    """
+
+    calls: Dict[str, int] = {}
+    seconds: Dict[str, float] = {}
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(
+        self,
+        kind: str,
+        calls: int = 1,
+        seconds: float = 0.0,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cost: float = 0.0,
+    ) -> None:
+        self.calls[kind] = self.calls.get(kind, 0) + calls
+        self.seconds[kind] = self.seconds.get(kind, 0.0) + seconds
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost_usd += cost
+
+    def merge(self, other: "Usage") -> None:
+        for kind, calls in other.calls.items():
+            self.add(kind, calls, other.seconds.get(kind, 0.0))
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cost_usd += other.cost_usd
+
+
+class _Tally:
+    """Unvalidated, slotted counterpart of :class:`Usage` for the hot path.
+
+    Metering runs several times per enemy call; mutating a pydantic model
+    there pays for ``__setattr__`` validation on every field update. A
+    :class:`Usage` is only built when a snapshot leaves the :class:`Meter`.
+    """
+
+    __slots__ = ("calls", "seconds", "prompt_tokens", "completion_tokens", "cost_usd")
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+
+    def add(
+        self,
+        kind: str,
+        calls: int = 1,
+        seconds: float = 0.0,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cost: float = 0.0,
+    ) -> None:
+        self.calls[kind] = self.calls.get(kind, 0) + calls
+        self.seconds[kind] = self.seconds.get(kind, 0.0) + seconds
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost_usd += cost
+
+    def merge(self, usage: Usage) -> None:
+        for kind, calls in usage.calls.items():
+            self.add(kind, calls, usage.seconds.get(kind, 0.0))
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.cost_usd += usage.cost_usd
+
+    def usage(self) -> Usage:
+        return Usage(
+            calls=dict(self.calls),
+            seconds=dict(self.seconds),
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+            cost_usd=self.cost_usd,
+        )
+
+
+class Meter:
+    """Thread-safe usage per floor plus a run total.
+
+    The boss is recorded under floor ``None``. :meth:`floor` and
+    :attr:`total` return :class:`Usage` snapshots.
+    """
+
+    def __init__(self) -> None:
+        self._floors: Dict[Optional[int], _Tally] = {}
+        self._total = _Tally()
+        self._lock = threading.Lock()
+
+    def _tally(self, floor: Optional[int]) -> _Tally:
+        tally = self._floors.get(floor)
+        if tally is None:
+            tally = self._floors[floor] = _Tally()
+        return tally
+
+    def record(self, floor: Optional[int], kind: str, **usage: Any) -> None:
+        with self._lock:
+            self._tally(floor).add(kind, **usage)
+            self._total.add(kind, **usage)
+
+    def restore(self, floor: Optional[int], usage: Usage) -> None:
+        """Add usage logged by an earlier, interrupted attempt of the run."""
+        with self._lock:
+            self._tally(floor).merge(usage)
+            self._total.merge(usage)
+
+    def floor(self, floor: Optional[int]) -> Usage:
+        with self._lock:
+            tally = self._floors.get(floor)
+            return Usage() if tally is None else tally.usage()
+
+    @property
+    def total(self) -> Usage:
+        with self._lock:
+            return self._total.usage()
+
+    @property
+    def total_tokens(self) -> int:
+        return self._total.prompt_tokens + self._total.completion_tokens
+
+    @property
+    def cost_usd(self) -> float:
+        return self._total.cost_usd
+
+
+_scope: ContextVar[Optional[Tuple[Meter, Optional[int]]]] = ContextVar("neurodungeon_meter", default=None)
+
+
+@contextmanager
+def metered(meter: Meter, floor: Optional[int]) -> Iterator[Meter]:
+    """Attribute usage reported by the current context (thread or task) to ``floor``."""
+    token = _scope.set((meter, floor))
+    try:
+        yield meter
+    finally:
+        _scope.reset(token)
+
+
+def report_usage(
+    kind: str,
+    seconds: float = 0.0,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    model: Optional[str] = None,
+    calls: int = 1,
+) -> None:
+    """Record work done by an agent; a no-op outside :func:`metered`."""
+    scope = _scope.get()
+    if scope is None:
+        return
+    meter, floor = scope
+    meter.record(
+        floor,
+        kind,
+        calls=calls,
+        seconds=seconds,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cost=cost_usd(model, prompt_tokens, completion_tokens),
+    )
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import enum
 from pathlib import Path
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 
@@ -69,6 +69,24 @@ class RunConfig(NDModel):
 
     ``persist_dir`` may be an absolute or relative path. The ``run_id`` is
     automatically nested inside it so multiple runs do not clobber each other.
+
+    - ``max_parallel_enemies``: enemies of a floor evaluated at once; ``1`` is serial.
+    - ``sandbox_backend``: how ``sandbox_from_config`` runs tests; ``"auto"``
+      falls back to local subprocesses without Docker.
+    - ``log_fsync``: fsync the audit log per record, per floor or on close.
+    - ``checkpoint``: write ``checkpoint.json`` after every floor for ``resume=True``.
+    - ``speculative_player``: prefetch the next floor's artifact while the
+      current one is judged.
+    - ``early_exit``: stop evaluating a floor once its outcome is decided.
+    - ``token_budget``, ``cost_budget_usd``: abort once metered LLM usage
+      exceeds them; ``llm_call_limit`` still caps agent calls.
+    - ``max_revisions_per_floor``: attempts at a floor before a rejection
+      costs a life; retries get the floor's hints.
+    - ``floor_call_budget``: agent calls a floor may spend, retries included.
+    - ``floor_deps``: per floor, the earlier floors whose hints it needs;
+      ``None`` chains each floor to the previous one.
+    - ``max_parallel_floors``: floors with finished dependencies played at once.
+    - ``trace``: export spans to ``traces.jsonl`` or ``traces.otlp.json``, or ``"off"``.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -82,6 +100,19 @@ class RunConfig(NDModel):
     sandbox_cpu: float = 1.0
     sandbox_memory_mb: int = 256
     sandbox_timeout_s: int = 10
+    sandbox_backend: Literal["docker", "pool", "native", "auto"] = "docker"
+    max_parallel_enemies: int = 1
+    log_fsync: Literal["record", "floor", "close"] = "close"
+    checkpoint: bool = True
+    speculative_player: bool = False
+    early_exit: bool = False
+    token_budget: Optional[int] = None
+    cost_budget_usd: Optional[float] = None
+    trace: Literal["off", "jsonl", "otlp"] = "jsonl"
+    max_revisions_per_floor: int = 1
+    floor_call_budget: Optional[int] = None
+    floor_deps: Optional[List[List[int]]] = None
+    max_parallel_floors: int = 4
 
     @model_validator(mode="after")
     def _set_persist_dir(self) -> "RunConfig":
@@ -92,9 +123,26 @@ class RunConfig(NDModel):
         pd.mkdir(parents=True, exist_ok=True)
         return self
 
-    @field_validator("lives", "llm_call_limit", "sandbox_memory_mb", "sandbox_timeout_s")
+    @field_validator(
+        "lives",
+        "llm_call_limit",
+        "sandbox_memory_mb",
+        "sandbox_timeout_s",
+        "max_parallel_enemies",
+        "max_revisions_per_floor",
+        "max_parallel_floors",
+    )
     @classmethod
     def _positive(cls, v: int) -> int:
         if v <= 0:
             raise ValueError("must be > 0")
         return v
+
+    @field_validator("floor_deps")
+    @classmethod
+    def _acyclic(cls, v: Optional[List[List[int]]]) -> Optional[List[List[int]]]:
+        # Deps must point backwards, so floor order is always a valid schedule.
+        for floor, deps in enumerate(v or []):
+            if any(not 0 <= d < floor for d in deps):
+                raise ValueError(f"floor {floor} may only depend on earlier floors")
+        return v
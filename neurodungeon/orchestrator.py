@@ -2,95 +2,935 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import math
-from datetime import datetime
-from pathlib import Path
-from typing import List, Sequence, Any
+import threading
+import time
+from contextvars import ContextVar, copy_context
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Any, Tuple, TypeVar
 
-from .agents import Boss, Enemy, Player
+from .agents import (
+    AsyncBoss,
+    AsyncEnemy,
+    AsyncPlayer,
+    Boss,
+    Enemy,
+    Player,
+    as_async_boss,
+    as_async_enemy,
+    as_async_player,
+)
+from .artifacts import ArtifactHandle, ArtifactHistory, artifact_file, write_artifact
+from .auditlog import AuditLog
+from .cache import count_hits
+from .checkpoint import ArtifactRef, Checkpoint, load_checkpoint, save_checkpoint
+from .metering import Meter, Usage, metered
 from .models import FloorArtifact, Hint, RunConfig, Vote
+from .tracing import Tracer, make_tracer, span, tracing
 
+T = TypeVar("T")
+# ((vote, hints), served_from_cache)
+_Outcome = Tuple[Tuple[Vote, Sequence[Hint]], bool]
+# Hints a speculative ``act`` is given: the floor being judged passes cleanly.
+_PROVISIONAL_HINTS: Tuple[Hint, ...] = ()
 
-class Orchestrator:
+
+class _FloorScope:
+    """State of a floor running concurrently with others under ``floor_deps``.
+
+    Calls, log records and artifacts are kept here until the floor is
+    committed in floor order. ``base`` is the number of calls already made
+    or reserved by other floors when this one started. ``stop`` is set once
+    the run ends so a floor still playing gives up between calls.
+    """
+
+    __slots__ = ("floor", "base", "reserved", "calls", "records", "artifacts", "done", "rejected", "hints", "stop")
+
+    def __init__(self, floor: int, base: int, reserved: int) -> None:
+        self.floor = floor
+        self.base = base
+        self.reserved = reserved
+        self.calls = 0
+        self.records: List[dict[str, Any]] = []
+        self.artifacts: List[ArtifactHandle] = []
+        self.done = False
+        self.rejected = False
+        self.hints: Optional[List[Hint]] = None
+        self.stop = threading.Event()
+
+
+class _FloorAbandoned(Exception):
+    """Raised inside a floor whose run has already ended."""
+
+
+_scope: ContextVar[Optional[_FloorScope]] = ContextVar("neurodungeon_floor_scope", default=None)
+
+
+def _timed(meter: Meter, floor: Optional[int], kind: str, fn: Callable[..., T], *args: Any) -> T:
+    """Call ``fn`` with usage attributed to ``floor`` and record its wall time."""
+    start = time.perf_counter()
+    with metered(meter, floor):
+        try:
+            return fn(*args)
+        finally:
+            meter.record(floor, kind, seconds=time.perf_counter() - start)
+
+
+async def _timed_async(meter: Meter, floor: Optional[int], kind: str, coro: Awaitable[T]) -> T:
+    start = time.perf_counter()
+    with metered(meter, floor):
+        try:
+            return await coro
+        finally:
+            meter.record(floor, kind, seconds=time.perf_counter() - start)
+
+
+def _evaluate_tracked(enemy: Enemy, artifact: FloorArtifact, meter: Meter, enemy_idx: int) -> _Outcome:
+    attrs = {"floor": artifact.floor, "revision": artifact.revision, "enemy_idx": enemy_idx}
+    with span("enemy.evaluate", **attrs) as sp, count_hits() as counter:
+        outcome = _timed(meter, artifact.floor, "enemy", enemy.evaluate, artifact)
+        sp.set(cached=counter.served)
+    return outcome, counter.served
+
+
+async def _evaluate_tracked_async(
+    enemy: AsyncEnemy, artifact: FloorArtifact, meter: Meter, enemy_idx: int
+) -> _Outcome:
+    attrs = {"floor": artifact.floor, "revision": artifact.revision, "enemy_idx": enemy_idx}
+    with span("enemy.evaluate", **attrs) as sp, count_hits() as counter:
+        outcome = await _timed_async(meter, artifact.floor, "enemy", enemy.evaluate(artifact))
+        sp.set(cached=counter.served)
+    return outcome, counter.served
+
+
+class _OrchestratorBase:
+    """Run state and persistence helpers shared by sync and async orchestrators."""
+
+    enemies_per_floor: Sequence[Sequence[Any]]
+
+    def __init__(self) -> None:
+        self.llm_calls = 0
+        self.artifacts = ArtifactHistory()
+        self.lives = 0
+        self.speculative_calls = 0
+        self.speculative_wasted = 0
+        self.meter = Meter()
+        self.tracer: Optional[Tracer] = None
+        self._refs: List[ArtifactRef] = []
+        self._floor_hints: List[List[Hint]] = []
+        self._audit: Optional[AuditLog] = None
+
+    def _restore(self, cfg: RunConfig, resume: bool) -> Tuple[int, List[Hint], Optional[Vote]]:
+        """Prepare run state; return ``(start_floor, prev_hints, finished_result)``.
+
+        With ``resume`` and an existing checkpoint, lives, call count and
+        artifacts are restored and ``log.jsonl`` is cut back to the end of the
+        last completed floor. Without a checkpoint no floor completed, so the
+        log is emptied.
+        """
+        self.lives = cfg.lives
+        checkpoint = load_checkpoint(cfg) if resume else None
+        assert cfg.persist_dir is not None
+        log_path = cfg.persist_dir / "log.jsonl"
+        if checkpoint is None:
+            if resume and log_path.exists():
+                with log_path.open("r+b") as log_f:
+                    log_f.truncate(0)
+            return 0, [], None
+        self.lives = checkpoint.lives
+        self.llm_calls = checkpoint.llm_calls
+        self.artifacts = ArtifactHistory(checkpoint.load_artifacts(cfg.persist_dir))
+        self._floor_hints = [[Hint(text=t) for t in hints] for hints in checkpoint.floor_hints]
+        with log_path.open("r+b") as log_f:
+            log_f.truncate(checkpoint.log_offset)
+        from .report import iter_log
+
+        for _, rec in iter_log(log_path):
+            if "usage" in rec:
+                self.meter.restore(None if rec.get("boss") else rec["floor"], Usage(**rec["usage"]))
+        return checkpoint.next_floor, checkpoint.hints, checkpoint.result
+
+    def _checkpoint(
+        self, cfg: RunConfig, next_floor: int, prev_hints: Sequence[Hint], result: Optional[Vote] = None
+    ) -> None:
+        if not cfg.checkpoint:
+            return
+        assert self._audit is not None
+        # Artifacts are only ever appended, so refs are built once each.
+        for a in self.artifacts.handles[len(self._refs) :]:
+            self._refs.append(ArtifactRef(floor=a.floor, revision=a.revision, ext=a.ext))
+        with span("checkpoint", floor=next_floor - 1):
+            save_checkpoint(
+                cfg,
+                Checkpoint(
+                    next_floor=next_floor,
+                    lives=self.lives,
+                    llm_calls=self.llm_calls,
+                    prev_hints=[h.text for h in prev_hints],
+                    artifacts=self._refs,
+                    log_offset=self._audit.tell(),
+                    result=result,
+                    floor_hints=[[h.text for h in hints] for hints in self._floor_hints],
+                ),
+            )
+
+    def _open_log(self, cfg: RunConfig) -> AuditLog:
+        assert cfg.persist_dir is not None
+        self._audit = AuditLog(cfg.persist_dir / "log.jsonl", fsync=cfg.log_fsync)
+        return self._audit
+
+    def _open_tracer(self, cfg: RunConfig) -> Optional[Tracer]:
+        assert cfg.persist_dir is not None
+        self.tracer = make_tracer(cfg.trace, cfg.persist_dir)
+        return self.tracer
+
+    def _close_tracer(self) -> None:
+        if self.tracer is not None:
+            self.tracer.shutdown()
+
+    def _calls(self) -> int:
+        """Calls made so far, as seen by the current floor."""
+        scope = _scope.get()
+        return self.llm_calls if scope is None else scope.base + scope.calls
+
+    @staticmethod
+    def _check_abandoned() -> None:
+        scope = _scope.get()
+        if scope is not None and scope.stop.is_set():
+            raise _FloorAbandoned(scope.floor)
+
+    def _count_call(self) -> None:
+        scope = _scope.get()
+        if scope is None:
+            self.llm_calls += 1
+        else:
+            scope.calls += 1
+
+    def _check_limits(self, cfg: RunConfig) -> None:
+        """Enforce call, token and cost budgets; artifact size is checked by :meth:`_persist`."""
+        if self._calls() > cfg.llm_call_limit:
+            raise RuntimeError("LLM call limit exceeded")
+        if cfg.token_budget is not None and self.meter.total_tokens > cfg.token_budget:
+            raise RuntimeError("Token budget exceeded")
+        if cfg.cost_budget_usd is not None and self.meter.cost_usd > cfg.cost_budget_usd:
+            raise RuntimeError("Cost budget exceeded")
+
+    def _persist(self, cfg: RunConfig, artifact: FloorArtifact) -> ArtifactHandle:
+        """Write ``artifact`` once, enforcing ``max_artifact_bytes`` on the way.
+
+        Returns the handle kept in :attr:`artifacts` in place of the content.
+        """
+        assert cfg.persist_dir is not None
+        file = artifact_file(cfg.persist_dir, artifact.floor, artifact.revision, artifact.ext)
+        with span("persist", floor=artifact.floor, revision=artifact.revision) as sp:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            size, sha256 = write_artifact(file, artifact.content, cfg.max_artifact_bytes)
+            sp.set(size=size)
+        return ArtifactHandle(artifact.floor, artifact.revision, artifact.ext, file, size, sha256)
+
+    def _log(self, record: dict[str, Any]) -> None:
+        """Append a JSON record with timestamp to the audit log.
+
+        Records of a concurrently running floor are held back until it is
+        committed.
+        """
+        scope = _scope.get()
+        if scope is not None:
+            scope.records.append(record)
+            return
+        assert self._audit is not None
+        self._audit.write(record)
+
+    def _log_usage(self, floor_index: Optional[int]) -> None:
+        usage = self.meter.floor(floor_index).model_dump()
+        self._log({"boss": True, "usage": usage} if floor_index is None else {"floor": floor_index, "usage": usage})
+
+    def _log_latency(self) -> None:
+        """Log per-span latency statistics of this attempt, if tracing is on."""
+        if self.tracer is not None:
+            self._log({"latency": self.tracer.latency()})
+
+    def _audit_floor_done(self, floor_index: int) -> None:
+        assert self._audit is not None
+        with span("audit.flush", floor=floor_index):
+            self._audit.end_floor()
+
+    def _tally(
+        self,
+        cfg: RunConfig,
+        artifact: FloorArtifact,
+        enemy_idx: int,
+        outcome: _Outcome,
+        votes: List[Vote],
+        hints: List[Hint],
+    ) -> None:
+        """Count, log and collect one enemy verdict; cache hits are free."""
+        (vote, enemy_hints), cached = outcome
+        record: dict[str, Any] = {
+            "floor": artifact.floor,
+            "revision": artifact.revision,
+            "enemy_idx": enemy_idx,
+            "vote": vote.value,
+            "hints": [h.text for h in enemy_hints],
+        }
+        if cached:
+            record["cached"] = True
+        else:
+            self._count_call()
+        self._log(record)
+        self._check_limits(cfg)
+        votes.append(vote)
+        hints.extend(enemy_hints)
+
+    def _may_speculate(self, cfg: RunConfig, has_next: bool, num_enemies: int) -> bool:
+        """Reserve a call for prefetching the next floor's artifact.
+
+        Only done when the current floor's enemies, the speculative call and
+        a retry after a miss all fit under ``llm_call_limit``.
+        """
+        if not cfg.speculative_player or not has_next:
+            return False
+        if self.llm_calls + num_enemies + 2 > cfg.llm_call_limit:
+            return False
+        self.llm_calls += 1
+        self.speculative_calls += 1
+        return True
+
+    def _settle(
+        self,
+        floor_index: int,
+        hints: Optional[Sequence[Hint]],
+        artifact: Optional[FloorArtifact],
+        retract: Callable[[FloorArtifact], None],
+    ) -> Optional[FloorArtifact]:
+        """Commit a speculative artifact if the final ``hints`` match the
+        provisional ones; otherwise retract it and return ``None``.
+
+        ``hints=None`` means the run ended and the artifact is not needed.
+        """
+        if artifact is not None and hints is not None and tuple(hints) == _PROVISIONAL_HINTS:
+            self._log({"floor": floor_index, "speculation": "committed"})
+            return artifact
+        self.speculative_wasted += 1
+        self._log({"floor": floor_index, "speculation": "wasted"})
+        if artifact is not None:
+            retract(artifact)
+        return None
+
+    def _skip(self, floor_index: int, enemy_idx: int, revision: int) -> None:
+        self._log({"floor": floor_index, "revision": revision, "enemy_idx": enemy_idx, "skipped": True})
+
+    def _may_retry(self, cfg: RunConfig, attempts: int, floor_start: int, num_enemies: int) -> bool:
+        """Whether a rejected floor gets another revision.
+
+        Allowed while under ``max_revisions_per_floor`` and when the player
+        call plus every enemy still fit ``floor_call_budget`` (counted from
+        ``floor_start``) and ``llm_call_limit``.
+        """
+        if attempts >= cfg.max_revisions_per_floor:
+            return False
+        cost = 1 + num_enemies
+        if cfg.floor_call_budget is not None and self._calls() - floor_start + cost > cfg.floor_call_budget:
+            return False
+        return self._calls() + cost <= cfg.llm_call_limit
+
+    def _retry(self, floor_index: int, artifact: FloorArtifact) -> None:
+        self._log({"floor": floor_index, "revision": artifact.revision, "retry": True})
+
+    @staticmethod
+    def _floor_decided(rejects: int, remaining: int, threshold: int) -> bool:
+        """True once the threshold is reached or can no longer be reached."""
+        return rejects >= threshold or rejects + remaining < threshold
+
+    @staticmethod
+    def _threshold(cfg: RunConfig, num_enemies: int) -> int:
+        if cfg.rejection_thresh == 0:
+            return math.ceil(num_enemies * 0.5)
+        return cfg.rejection_thresh
+
+    def _dispatch_budget(self, cfg: RunConfig, num_enemies: int) -> int:
+        """Number of enemies to fan out; the serial loop stops right after the
+        call that crosses ``llm_call_limit``."""
+        return max(min(num_enemies, cfg.llm_call_limit - self._calls() + 1), 0)
+
+    def _floor_deps(self, cfg: RunConfig, start_floor: int) -> List[List[int]]:
+        assert cfg.floor_deps is not None
+        if len(cfg.floor_deps) != len(self.enemies_per_floor):
+            raise ValueError("floor_deps must list the dependencies of every floor")
+        if len(self._floor_hints) != start_floor:
+            raise ValueError("checkpoint was not written with floor_deps")
+        return cfg.floor_deps
+
+    @staticmethod
+    def _floor_cost(cfg: RunConfig, num_enemies: int) -> int:
+        """Most calls a floor can make, retries included."""
+        cost = (1 + num_enemies) * cfg.max_revisions_per_floor
+        if cfg.floor_call_budget is not None:
+            cost = min(cost, max(1 + num_enemies, cfg.floor_call_budget))
+        return cost
+
+    def _dep_hints(
+        self, deps: Sequence[int], next_floor: int, scopes: Dict[int, _FloorScope]
+    ) -> Optional[List[Hint]]:
+        """Hints of ``deps`` in order, or ``None`` while one is unfinished."""
+        hints: List[Hint] = []
+        for dep in deps:
+            dep_hints = self._floor_hints[dep] if dep < next_floor else getattr(scopes.get(dep), "hints", None)
+            if dep_hints is None:
+                return None
+            hints += dep_hints
+        return hints
+
+    def _admit(
+        self, cfg: RunConfig, deps: Sequence[Sequence[int]], next_floor: int, scopes: Dict[int, _FloorScope]
+    ) -> List[Tuple[_FloorScope, List[Hint]]]:
+        """Pick the floors to start now, in floor order, and register them in ``scopes``.
+
+        A floor is ready once all its dependencies have finished. It starts
+        alone, or alongside running floors only if its worst-case calls fit
+        ``llm_call_limit`` next to theirs, so running floors concurrently
+        can never push the run over the limit.
+        """
+        outstanding = self.llm_calls + sum(s.calls if s.done else s.reserved for s in scopes.values())
+        running = sum(not s.done for s in scopes.values())
+        started: List[Tuple[_FloorScope, List[Hint]]] = []
+        for floor_index in range(next_floor, len(deps)):
+            if running >= cfg.max_parallel_floors:
+                break
+            if floor_index in scopes:
+                continue
+            hints = self._dep_hints(deps[floor_index], next_floor, scopes)
+            if hints is None:
+                continue
+            reserved = self._floor_cost(cfg, len(self.enemies_per_floor[floor_index]))
+            if running and outstanding + reserved > cfg.llm_call_limit:
+                break
+            scope = scopes[floor_index] = _FloorScope(floor_index, outstanding, reserved)
+            started.append((scope, hints))
+            outstanding += reserved
+            running += 1
+        return started
+
+    def _commit(self, cfg: RunConfig, scope: _FloorScope) -> bool:
+        """Apply a finished floor's calls, records and lives; True if the run is over."""
+        assert self._audit is not None and scope.hints is not None
+        self.llm_calls += scope.calls
+        for record in scope.records:
+            self._audit.write(record)
+        for handle in scope.artifacts:
+            self.artifacts.append(handle)
+        self._floor_hints.append(scope.hints)
+        if scope.rejected:
+            self.lives -= 1
+            if self.lives <= 0:
+                self._log_latency()
+                self._checkpoint(cfg, scope.floor + 1, scope.hints, result=Vote.REJECT)
+                return True
+        self._audit_floor_done(scope.floor)
+        self._checkpoint(cfg, scope.floor + 1, scope.hints)
+        return False
+
+    def _commit_failed(self, scope: _FloorScope) -> None:
+        """Apply what a floor that raised had done, as the serial loop would have logged it."""
+        assert self._audit is not None
+        self.llm_calls += scope.calls
+        for record in scope.records:
+            self._audit.write(record)
+        for handle in scope.artifacts:
+            self.artifacts.append(handle)
+
+
+class Orchestrator(_OrchestratorBase):
     """State machine managing floors, lives, and persistence."""
 
     def __init__(self, player: Player, enemies_per_floor: Sequence[Sequence[Enemy]], boss: Boss) -> None:
+        super().__init__()
         self.player = player
         self.enemies_per_floor = list(enemies_per_floor)
         self.boss = boss
-        self.llm_calls = 0
-        self.artifacts: List[FloorArtifact] = []
-        self.lives = 0
 
-    def _check_limits(self, cfg: RunConfig, artifact: FloorArtifact | None = None) -> None:
-        if artifact is not None and len(artifact.content.encode()) > cfg.max_artifact_bytes:
-            raise ValueError("Artifact too large")
-        if self.llm_calls > cfg.llm_call_limit:
-            raise RuntimeError("LLM call limit exceeded")
+    def _evaluate_floor(
+        self,
+        cfg: RunConfig,
+        floor_index: int,
+        enemies: Sequence[Enemy],
+        artifact: FloorArtifact,
+        pool: Optional[Executor],
+    ) -> Tuple[List[Vote], List[Hint]]:
+        """Collect votes and hints from every enemy, in ``enemy_idx`` order.
+
+        Enemies beyond the dispatch budget are evaluated inline; they are
+        either cache hits or the call that crosses ``llm_call_limit``. With
+        ``cfg.early_exit`` enemies are skipped once the floor is decided.
+        """
+        threshold = self._threshold(cfg, len(enemies))
+        futures: List["Future[_Outcome]"] = []
+        if pool is not None:
+            budget = self._dispatch_budget(cfg, len(enemies))
+            futures = [
+                pool.submit(copy_context().run, _evaluate_tracked, enemy, artifact, self.meter, enemy_idx)
+                for enemy_idx, enemy in enumerate(enemies[:budget])
+            ]
+        outcomes: Dict[int, _Outcome] = {}
+        if futures and cfg.early_exit:
+            outcomes = self._collect_until_decided(futures, len(enemies), threshold)
+
+        votes: List[Vote] = []
+        hints: List[Hint] = []
+        for enemy_idx, enemy in enumerate(enemies):
+            try:
+                self._check_abandoned()
+            except _FloorAbandoned:
+                for future in futures:
+                    future.cancel()
+                raise
+            if enemy_idx in outcomes:
+                outcome = outcomes[enemy_idx]
+            elif cfg.early_exit and (
+                enemy_idx < len(futures)
+                or self._floor_decided(votes.count(Vote.REJECT), len(enemies) - enemy_idx, threshold)
+            ):
+                self._skip(floor_index, enemy_idx, artifact.revision)
+                continue
+            elif enemy_idx < len(futures):
+                outcome = futures[enemy_idx].result()
+            else:
+                outcome = _evaluate_tracked(enemy, artifact, self.meter, enemy_idx)
+            self._tally(cfg, artifact, enemy_idx, outcome, votes, hints)
+        return votes, hints
+
+    def _collect_until_decided(
+        self, futures: Sequence["Future[_Outcome]"], num_enemies: int, threshold: int
+    ) -> Dict[int, _Outcome]:
+        """Gather outcomes as they complete until the floor is decided, then
+        cancel the rest. Returns ``{enemy_idx: outcome}`` of finished enemies."""
+        index = {future: i for i, future in enumerate(futures)}
+        outcomes: Dict[int, _Outcome] = {}
+        rejects = 0
+        pending = set(futures)
+        try:
+            while pending and not self._floor_decided(rejects, num_enemies - len(outcomes), threshold):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = outcomes[index[future]] = future.result()
+                    rejects += outcome[0][0] is Vote.REJECT
+        finally:
+            for future in pending:
+                # Keep verdicts that are already paid for; running calls cannot be interrupted.
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    outcomes[index[future]] = future.result()
+                else:
+                    future.cancel()
+        return outcomes
+
+    def run(self, goal: str, cfg: RunConfig, resume: bool = False) -> Vote:
+        """Execute the full NeuroDungeon protocol.
+
+        With ``resume=True`` the run continues after the last floor recorded
+        in ``persist_dir/checkpoint.json``, if there is one.
+        """
+        start_floor, prev_hints, result = self._restore(cfg, resume)
+        if result is not None:
+            return result
+        pool: Optional[Executor] = None
+        spec_pool: Optional[Executor] = None
+        if cfg.max_parallel_enemies > 1:
+            pool = ThreadPoolExecutor(max_workers=cfg.max_parallel_enemies)
+        if cfg.speculative_player and cfg.floor_deps is None:
+            spec_pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            with self._open_log(cfg), tracing(self._open_tracer(cfg)), span("run", run_id=cfg.run_id):
+                if cfg.floor_deps is not None:
+                    return self._run_dag(cfg, pool, start_floor)
+                return self._run(cfg, pool, spec_pool, start_floor, prev_hints)
+        finally:
+            for executor in (pool, spec_pool):
+                if executor is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
+            self._close_tracer()
+
+    def _act(self, floor_index: int, hints: Sequence[Hint]) -> FloorArtifact:
+        with span("player.act", floor=floor_index) as sp:
+            artifact = _timed(self.meter, floor_index, "player", self.player.act, floor_index, hints)
+            sp.set(revision=artifact.revision)
+        return artifact
+
+    def _claim(
+        self, spec: "Future[FloorArtifact]", floor_index: int, hints: Optional[Sequence[Hint]]
+    ) -> Optional[FloorArtifact]:
+        """Wait for a speculative ``act``; a failed one counts as wasted."""
+        try:
+            artifact: Optional[FloorArtifact] = spec.result()
+        except Exception:
+            artifact = None
+        return self._settle(floor_index, hints, artifact, self.player.retract)
+
+    def _run(
+        self,
+        cfg: RunConfig,
+        pool: Optional[Executor],
+        spec_pool: Optional[Executor],
+        start_floor: int,
+        prev_hints: List[Hint],
+    ) -> Vote:
+        lives = self.lives
+        spec: Optional["Future[FloorArtifact]"] = None
+        try:
+            for floor_index in range(start_floor, len(self.enemies_per_floor)):
+                with span("floor", floor=floor_index):
+                    enemies = self.enemies_per_floor[floor_index]
+                    artifact = None
+                    if spec is not None:
+                        artifact, spec = self._claim(spec, floor_index, prev_hints), None
+                    floor_start, attempts, act_hints = self.llm_calls, 1, prev_hints
+                    has_next = floor_index + 1 < len(self.enemies_per_floor)
+                    while True:
+                        if artifact is None:
+                            self.llm_calls += 1
+                            artifact = self._act(floor_index, act_hints)
+                        self._check_limits(cfg)
+                        self.artifacts.append(self._persist(cfg, artifact))
+
+                        if spec_pool is not None and self._may_speculate(cfg, has_next, len(enemies)):
+                            spec = spec_pool.submit(copy_context().run, self._act, floor_index + 1, _PROVISIONAL_HINTS)
+
+                        votes, hints = self._evaluate_floor(cfg, floor_index, enemies, artifact, pool)
+                        rejected = votes.count(Vote.REJECT) >= self._threshold(cfg, len(enemies))
+                        if not rejected or not self._may_retry(cfg, attempts, floor_start, len(enemies)):
+                            break
+                        if spec is not None:
+                            self._claim(spec, floor_index + 1, None)
+                            spec = None
+                        self._retry(floor_index, artifact)
+                        attempts, act_hints, artifact = attempts + 1, hints, None
+
+                    if rejected:
+                        lives -= 1
+                        self.lives = lives
+                        self._log({"floor": floor_index, "life_lost": True})
+                        if lives <= 0:
+                            self._log_usage(floor_index)
+                            self._log_latency()
+                            if spec is not None:
+                                self._claim(spec, floor_index + 1, None)
+                                spec = None
+                            self._checkpoint(cfg, floor_index + 1, hints, result=Vote.REJECT)
+                            return Vote.REJECT
+                    self._log_usage(floor_index)
+                    self._audit_floor_done(floor_index)
+                    prev_hints = hints
+                    self._checkpoint(cfg, floor_index + 1, prev_hints)
+        finally:
+            if spec is not None:
+                spec.cancel()
 
-    def _persist(self, cfg: RunConfig, artifact: FloorArtifact) -> None:
-        persist_base = cfg.persist_dir
-        assert persist_base is not None
-        path = persist_base / f"floor_{artifact.floor}"
-        path.mkdir(parents=True, exist_ok=True)
-        (path / f"rev_{artifact.revision}{artifact.ext}").write_text(artifact.content)
-
-    def _log(self, log_path: Path, record: dict[str, Any]) -> None:
-        """Append a JSON record with timestamp to the audit log."""
-        record["timestamp"] = datetime.utcnow().isoformat() + "Z"
-        with log_path.open("a") as log_f:
-            log_f.write(json.dumps(record) + "\n")
-
-    def run(self, goal: str, cfg: RunConfig) -> Vote:
-        """Execute the full NeuroDungeon protocol."""
-        lives = cfg.lives
         self.lives = lives
-        prev_hints: List[Hint] = []
-        assert cfg.persist_dir is not None
-        log_path = cfg.persist_dir / "log.jsonl"
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        for floor_index, enemies in enumerate(self.enemies_per_floor):
-            self.llm_calls += 1
-            artifact = self.player.act(floor_index, prev_hints)
-            self._check_limits(cfg, artifact)
-            self._persist(cfg, artifact)
-            self.artifacts.append(artifact)
-
-            votes: List[Vote] = []
-            hints: List[Hint] = []
-            for enemy_idx, enemy in enumerate(enemies):
-                self.llm_calls += 1
-                vote, enemy_hints = enemy.evaluate(artifact)
-                self._log(
-                    log_path,
-                    {
-                        "floor": floor_index,
-                        "enemy_idx": enemy_idx,
-                        "vote": vote.value,
-                        "hints": [h.text for h in enemy_hints],
-                    },
-                )
+        return self._judge(cfg, prev_hints)
+
+    def _judge(self, cfg: RunConfig, prev_hints: Sequence[Hint]) -> Vote:
+        self.llm_calls += 1
+        with span("boss.judge"):
+            result = _timed(self.meter, None, "boss", self.boss.judge, self.artifacts.latest())
+        self._check_limits(cfg)
+        self._log_usage(None)
+        self._log_latency()
+        self._log({"boss_vote": result.value})
+        self._checkpoint(cfg, len(self.enemies_per_floor), prev_hints, result=result)
+        return result
+
+    def _run_dag(self, cfg: RunConfig, pool: Optional[Executor], start_floor: int) -> Vote:
+        """Run floors as their dependencies finish; commit them in floor order."""
+        deps = self._floor_deps(cfg, start_floor)
+        scopes: Dict[int, _FloorScope] = {}
+        running: Dict["Future[None]", _FloorScope] = {}
+        finished: Dict[int, "Future[None]"] = {}
+        next_floor = start_floor
+        floor_pool = ThreadPoolExecutor(max_workers=cfg.max_parallel_floors)
+        try:
+            while next_floor < len(deps):
+                for scope, hints in self._admit(cfg, deps, next_floor, scopes):
+                    future = floor_pool.submit(copy_context().run, self._play_floor, cfg, scope, hints, pool)
+                    running[future] = scope
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scope = running.pop(future)
+                    scope.done = True
+                    finished[scope.floor] = future
+                while next_floor in finished:
+                    if finished[next_floor].exception() is not None:
+                        self._commit_failed(scopes.pop(next_floor))
+                    finished.pop(next_floor).result()
+                    if self._commit(cfg, scopes.pop(next_floor)):
+                        return Vote.REJECT
+                    next_floor += 1
+        finally:
+            for scope in scopes.values():
+                scope.stop.set()
+            floor_pool.shutdown(wait=True, cancel_futures=True)
+            # Floors abandoned when the run ended still spent their calls.
+            self.llm_calls += sum(s.calls for s in scopes.values())
+        return self._judge(cfg, self._floor_hints[-1] if self._floor_hints else [])
+
+    def _play_floor(self, cfg: RunConfig, scope: _FloorScope, hints: List[Hint], pool: Optional[Executor]) -> None:
+        """Play one floor, retries included, with its effects held in ``scope``."""
+        _scope.set(scope)
+        floor_index = scope.floor
+        enemies = self.enemies_per_floor[floor_index]
+        with span("floor", floor=floor_index):
+            floor_start, attempts = self._calls(), 1
+            while True:
+                self._check_abandoned()
+                self._count_call()
+                artifact = self._act(floor_index, hints)
                 self._check_limits(cfg)
-                votes.append(vote)
-                hints.extend(enemy_hints)
+                scope.artifacts.append(self._persist(cfg, artifact))
+                votes, hints = self._evaluate_floor(cfg, floor_index, enemies, artifact, pool)
+                rejected = votes.count(Vote.REJECT) >= self._threshold(cfg, len(enemies))
+                if not rejected or not self._may_retry(cfg, attempts, floor_start, len(enemies)):
+                    break
+                self._retry(floor_index, artifact)
+                attempts += 1
+            if rejected:
+                self._log({"floor": floor_index, "life_lost": True})
+            self._log_usage(floor_index)
+        scope.rejected, scope.hints = rejected, hints
+
 
-            reject_count = votes.count(Vote.REJECT)
-            if cfg.rejection_thresh == 0:
-                threshold = math.ceil(len(enemies) * 0.5)
+class AsyncOrchestrator(_OrchestratorBase):
+    """Coroutine-based orchestrator for driving many runs on one event loop.
+
+    Accepts async agents or plain sync ones, which are wrapped with the
+    ``as_async_*`` adapters. Semantics match :class:`Orchestrator`.
+    """
+
+    def __init__(
+        self,
+        player: Player | AsyncPlayer,
+        enemies_per_floor: Sequence[Sequence[Enemy | AsyncEnemy]],
+        boss: Boss | AsyncBoss,
+    ) -> None:
+        super().__init__()
+        self.player = as_async_player(player)
+        self.enemies_per_floor = [[as_async_enemy(e) for e in floor] for floor in enemies_per_floor]
+        self.boss = as_async_boss(boss)
+
+    async def _evaluate_floor(
+        self,
+        cfg: RunConfig,
+        floor_index: int,
+        enemies: Sequence[AsyncEnemy],
+        artifact: FloorArtifact,
+    ) -> Tuple[List[Vote], List[Hint]]:
+        threshold = self._threshold(cfg, len(enemies))
+        votes: List[Vote] = []
+        hints: List[Hint] = []
+        outcomes: Dict[int, _Outcome] = {}
+        dispatched = 0
+        if cfg.max_parallel_enemies > 1:
+            sem = asyncio.Semaphore(cfg.max_parallel_enemies)
+
+            async def bounded(coro: Awaitable[T]) -> T:
+                async with sem:
+                    return await coro
+
+            budget = self._dispatch_budget(cfg, len(enemies))
+            tasks = [
+                asyncio.ensure_future(bounded(_evaluate_tracked_async(enemy, artifact, self.meter, enemy_idx)))
+                for enemy_idx, enemy in enumerate(enemies[:budget])
+            ]
+            dispatched = len(tasks)
+            try:
+                if cfg.early_exit:
+                    outcomes = await self._collect_until_decided(tasks, len(enemies), threshold)
+                else:
+                    outcomes = dict(enumerate(await asyncio.gather(*tasks)))
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                # let cancelled spans end while the tracer is still open
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        for enemy_idx, enemy in enumerate(enemies):
+            if enemy_idx in outcomes:
+                outcome = outcomes[enemy_idx]
+            elif cfg.early_exit and (
+                enemy_idx < dispatched
+                or self._floor_decided(votes.count(Vote.REJECT), len(enemies) - enemy_idx, threshold)
+            ):
+                self._skip(floor_index, enemy_idx, artifact.revision)
+                continue
             else:
-                threshold = cfg.rejection_thresh
-            if reject_count >= threshold:
-                lives -= 1
-                self.lives = lives
-                self._log(log_path, {"floor": floor_index, "life_lost": True})
-                if lives <= 0:
-                    return Vote.REJECT
-            prev_hints = hints
+                outcome = await _evaluate_tracked_async(enemy, artifact, self.meter, enemy_idx)
+            self._tally(cfg, artifact, enemy_idx, outcome, votes, hints)
+        return votes, hints
 
+    async def _collect_until_decided(
+        self, tasks: Sequence["asyncio.Future[_Outcome]"], num_enemies: int, threshold: int
+    ) -> Dict[int, _Outcome]:
+        """Async counterpart of :meth:`Orchestrator._collect_until_decided`;
+        outstanding tasks are cancelled and awaited."""
+        index = {task: i for i, task in enumerate(tasks)}
+        outcomes: Dict[int, _Outcome] = {}
+        rejects = 0
+        pending = set(tasks)
+        while pending and not self._floor_decided(rejects, num_enemies - len(outcomes), threshold):
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                outcome = outcomes[index[task]] = task.result()
+                rejects += outcome[0][0] is Vote.REJECT
+        for task in pending:
+            if task.done() and not task.cancelled() and task.exception() is None:
+                outcomes[index[task]] = task.result()
+            else:
+                task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return outcomes
+
+    async def run(self, goal: str, cfg: RunConfig, resume: bool = False) -> Vote:
+        """Execute the full NeuroDungeon protocol without blocking the loop."""
+        start_floor, prev_hints, result = self._restore(cfg, resume)
+        if result is not None:
+            return result
+        try:
+            with self._open_log(cfg), tracing(self._open_tracer(cfg)), span("run", run_id=cfg.run_id):
+                if cfg.floor_deps is not None:
+                    return await self._run_dag(cfg, start_floor)
+                return await self._run(cfg, start_floor, prev_hints)
+        finally:
+            self._close_tracer()
+
+    async def _act(self, floor_index: int, hints: Sequence[Hint]) -> FloorArtifact:
+        with span("player.act", floor=floor_index) as sp:
+            artifact = await _timed_async(self.meter, floor_index, "player", self.player.act(floor_index, hints))
+            sp.set(revision=artifact.revision)
+        return artifact
+
+    async def _claim(
+        self, spec: "asyncio.Future[FloorArtifact]", floor_index: int, hints: Optional[Sequence[Hint]]
+    ) -> Optional[FloorArtifact]:
+        """Await a speculative ``act``; a failed one counts as wasted."""
+        try:
+            artifact: Optional[FloorArtifact] = await spec
+        except Exception:
+            artifact = None
+        return self._settle(floor_index, hints, artifact, self.player.retract)
+
+    async def _run(self, cfg: RunConfig, start_floor: int, prev_hints: List[Hint]) -> Vote:
+        lives = self.lives
+        spec: Optional["asyncio.Future[FloorArtifact]"] = None
+        try:
+            for floor_index in range(start_floor, len(self.enemies_per_floor)):
+                with span("floor", floor=floor_index):
+                    enemies = self.enemies_per_floor[floor_index]
+                    artifact = None
+                    if spec is not None:
+                        artifact, spec = await self._claim(spec, floor_index, prev_hints), None
+                    floor_start, attempts, act_hints = self.llm_calls, 1, prev_hints
+                    has_next = floor_index + 1 < len(self.enemies_per_floor)
+                    while True:
+                        if artifact is None:
+                            self.llm_calls += 1
+                            artifact = await self._act(floor_index, act_hints)
+                        self._check_limits(cfg)
+                        self.artifacts.append(self._persist(cfg, artifact))
+
+                        if self._may_speculate(cfg, has_next, len(enemies)):
+                            spec = asyncio.ensure_future(self._act(floor_index + 1, _PROVISIONAL_HINTS))
+
+                        votes, hints = await self._evaluate_floor(cfg, floor_index, enemies, artifact)
+                        rejected = votes.count(Vote.REJECT) >= self._threshold(cfg, len(enemies))
+                        if not rejected or not self._may_retry(cfg, attempts, floor_start, len(enemies)):
+                            break
+                        if spec is not None:
+                            await self._claim(spec, floor_index + 1, None)
+                            spec = None
+                        self._retry(floor_index, artifact)
+                        attempts, act_hints, artifact = attempts + 1, hints, None
+
+                    if rejected:
+                        lives -= 1
+                        self.lives = lives
+                        self._log({"floor": floor_index, "life_lost": True})
+                        if lives <= 0:
+                            self._log_usage(floor_index)
+                            self._log_latency()
+                            if spec is not None:
+                                await self._claim(spec, floor_index + 1, None)
+                                spec = None
+                            self._checkpoint(cfg, floor_index + 1, hints, result=Vote.REJECT)
+                            return Vote.REJECT
+                    self._log_usage(floor_index)
+                    self._audit_floor_done(floor_index)
+                    prev_hints = hints
+                    self._checkpoint(cfg, floor_index + 1, prev_hints)
+        finally:
+            if spec is not None:
+                spec.cancel()
+
+        self.lives = lives
+        return await self._judge(cfg, prev_hints)
+
+    async def _judge(self, cfg: RunConfig, prev_hints: Sequence[Hint]) -> Vote:
         self.llm_calls += 1
-        result = self.boss.judge(self.artifacts)
+        with span("boss.judge"):
+            result = await _timed_async(self.meter, None, "boss", self.boss.judge(self.artifacts.latest()))
         self._check_limits(cfg)
-        self.lives = lives
-        self._log(log_path, {"boss_vote": result.value})
+        self._log_usage(None)
+        self._log_latency()
+        self._log({"boss_vote": result.value})
+        self._checkpoint(cfg, len(self.enemies_per_floor), prev_hints, result=result)
         return result
+
+    async def _run_dag(self, cfg: RunConfig, start_floor: int) -> Vote:
+        """Async counterpart of :meth:`Orchestrator._run_dag`."""
+        deps = self._floor_deps(cfg, start_floor)
+        scopes: Dict[int, _FloorScope] = {}
+        running: Dict["asyncio.Future[None]", _FloorScope] = {}
+        finished: Dict[int, "asyncio.Future[None]"] = {}
+        next_floor = start_floor
+        try:
+            while next_floor < len(deps):
+                for scope, hints in self._admit(cfg, deps, next_floor, scopes):
+                    running[asyncio.ensure_future(self._play_floor(cfg, scope, hints))] = scope
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    scope = running.pop(task)
+                    scope.done = True
+                    finished[scope.floor] = task
+                while next_floor in finished:
+                    if finished[next_floor].exception() is not None:
+                        self._commit_failed(scopes.pop(next_floor))
+                    finished.pop(next_floor).result()
+                    if self._commit(cfg, scopes.pop(next_floor)):
+                        return Vote.REJECT
+                    next_floor += 1
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, *finished.values(), return_exceptions=True)
+            self.llm_calls += sum(s.calls for s in scopes.values())
+        return await self._judge(cfg, self._floor_hints[-1] if self._floor_hints else [])
+
+    async def _play_floor(self, cfg: RunConfig, scope: _FloorScope, hints: List[Hint]) -> None:
+        _scope.set(scope)
+        floor_index = scope.floor
+        enemies = self.enemies_per_floor[floor_index]
+        with span("floor", floor=floor_index):
+            floor_start, attempts = self._calls(), 1
+            while True:
+                self._count_call()
+                artifact = await self._act(floor_index, hints)
+                self._check_limits(cfg)
+                scope.artifacts.append(self._persist(cfg, artifact))
+                votes, hints = await self._evaluate_floor(cfg, floor_index, enemies, artifact)
+                rejected = votes.count(Vote.REJECT) >= self._threshold(cfg, len(enemies))
+                if not rejected or not self._may_retry(cfg, attempts, floor_start, len(enemies)):
+                    break
+                self._retry(floor_index, artifact)
+                attempts += 1
+            if rejected:
+                self._log({"floor": floor_index, "life_lost": True})
+            self._log_usage(floor_index)
+        scope.rejected, scope.hints = rejected, hints
@@ -0,0 +1,121 @@
+"""Token-bucket rate limiting and jittered exponential backoff for API calls."""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Bucket refilled with ``per_minute`` tokens per minute, up to ``capacity``.
+
+    :meth:`reserve` takes tokens straight away, going into debt when the
+    bucket is short, and returns how long the caller has to wait before
+    using them. Concurrent callers are therefore spaced out in arrival order
+    instead of all waking up at once. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be > 0")
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute if capacity is None else capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def reserve(self, n: float = 1.0) -> float:
+        """Take ``n`` tokens; return the seconds to wait before they are available.
+
+        Requests larger than the bucket are charged its full capacity so
+        they are delayed rather than blocked forever.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= min(n, self.capacity)
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, n: float) -> None:
+        """Give back ``n`` tokens; a negative ``n`` charges extra."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + n)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits; ``None`` disables one."""
+
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.requests = None if rpm is None else TokenBucket(rpm, clock=clock)
+        self.tokens = None if tpm is None else TokenBucket(tpm, clock=clock)
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Limits from ``NEURODUNGEON_LLM_RPM`` and ``NEURODUNGEON_LLM_TPM``."""
+        rpm = os.getenv("NEURODUNGEON_LLM_RPM")
+        tpm = os.getenv("NEURODUNGEON_LLM_TPM")
+        return cls(rpm=float(rpm) if rpm else None, tpm=float(tpm) if tpm else None)
+
+    def reserve(self, tokens: float) -> float:
+        """Reserve one request and ``tokens``; return the seconds to wait."""
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.reserve(1)
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def settle(self, estimated: float, actual: Optional[float]) -> None:
+        """Correct a reservation once the real token usage is known."""
+        if self.tokens is not None and actual is not None:
+            self.tokens.refund(estimated - actual)
+
+
+class Backoff:
+    """Exponential backoff with full jitter.
+
+    Attempt ``i`` waits a random time in ``[0, min(cap_s, base_s * 2**i)]``,
+    or at least ``retry_after`` seconds when the server asked for it.
+    """
+
+    def __init__(
+        self,
+        retries: int = 5,
+        base_s: float = 0.5,
+        cap_s: float = 30.0,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.retries = retries
+        self.base_s = base_s
+        self.cap_s = cap_s
+        self._rng = rng
+
+    @classmethod
+    def from_env(cls) -> "Backoff":
+        """Retry count from ``NEURODUNGEON_LLM_RETRIES`` (default 5)."""
+        return cls(retries=int(os.getenv("NEURODUNGEON_LLM_RETRIES", "5")))
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        wait = self._rng() * min(self.cap_s, self.base_s * 2.0**attempt)
+        if retry_after is not None:
+            wait = max(wait, retry_after)
+        return wait
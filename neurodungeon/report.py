@@ -3,14 +3,65 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from pydantic import ConfigDict
 
-from jinja2 import Template
+from .artifacts import Artifact, ArtifactHistory
+from .metering import Usage
+from .models import NDModel
 
-from .models import NDModel, FloorArtifact
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+
+_REPORT_TEMPLATE = """# Run {{run_id}} Report
+
+| Floor | Accepts | Rejects | Lives |
+|-------|---------|---------|-------|
+{% for f in floors %}| {{f.floor}} | {{f.accepts}} | {{f.rejects}} | {{f.lives}} |
+{% endfor %}
+
+Boss vote: **{{boss_vote}}**  
+LLM calls: {{llm_calls}}{% if speculative_wasted %}  
+Wasted speculative player calls: {{speculative_wasted}}{% endif %}{% if skipped %}  
+Skipped enemy evaluations: {{skipped}}{% endif %}{% if retries %}  
+Floor retries: {{retries}}{% endif %}
+
+## Artifacts
+{% for a in artifacts %}- [floor {{a.floor}} rev {{a.revision}}]({{a.path(run_id)}})
+{% endfor %}{% if usage %}
+## Usage
+
+| Floor | Calls | Prompt tokens | Completion tokens | Cost (USD) |
+|-------|-------|---------------|-------------------|------------|
+{% for u in usage %}| {{u.floor}} | {{u.calls}} | {{u.prompt_tokens}} | {{u.completion_tokens}} | {{"%.4f"|format(u.cost_usd)}} |
+{% endfor %}{% endif %}{% if latency %}
+## Latency
+
+| Phase | Count | Total (s) | p50 (s) | p95 (s) | Max (s) |
+|-------|-------|-----------|---------|---------|---------|
+{% for l in latency %}| {{l.phase}} | {{l.count}} | {{"%.3f"|format(l.total_s)}} | {{"%.3f"|format(l.p50_s)}} | {{"%.3f"|format(l.p95_s)}} | {{"%.3f"|format(l.max_s)}} |
+{% endfor %}{% endif %}
+"""
+
+
+@lru_cache(maxsize=32)
+def get_template(path: Optional[Path] = None) -> Template:
+    """Return the compiled report template, compiling it on first use.
+
+    ``path`` selects a user-supplied Jinja2 file instead of the built-in
+    template. Each file is read and compiled once per process; the template
+    receives ``run_id``, ``floors``, ``boss_vote``, ``llm_calls``,
+    ``speculative_wasted``, ``skipped``, ``retries``, ``artifacts``, ``usage`` (see
+    :func:`usage_rows`) and ``latency`` (see :func:`latency_rows`).
+    """
+    from jinja2 import Template
+
+    source = _REPORT_TEMPLATE if path is None else Path(path).read_text()
+    return Template(source)
 
 
 class FloorSummary(NDModel):
@@ -19,41 +70,151 @@ class FloorSummary(NDModel):
     accepts: int
     rejects: int
     lives: int
+    skipped: int = 0
+    revisions: int = 1
+
+
+def iter_log(log_path: Path, offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(end_offset, record)`` for complete lines after byte ``offset``.
+
+    A trailing line without newline is a record still being written and is
+    left for the next call.
+    """
+    with log_path.open("rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                yield offset, json.loads(line)
+
 
+class LogAggregator:
+    """Incrementally fold ``log.jsonl`` records into per-floor summaries.
 
-def render_report(run_id: str, artifacts: List[FloorArtifact], log_path: Path, llm_calls: int, lives_start: int) -> str:
-    data = [json.loads(line) for line in log_path.read_text().splitlines()]
-    floor_stats: List[FloorSummary] = []
-    lives = lives_start
-    for rec in data:
+    Only the summaries are kept, so memory does not grow with the log. Call
+    :meth:`consume` again while a run is in progress to pick up records
+    appended since the last call; it resumes from the stored byte offset.
+    """
+
+    def __init__(self, lives_start: int) -> None:
+        self.floors: List[FloorSummary] = []
+        self.lives = lives_start
+        self.boss_vote: Optional[str] = None
+        self.speculative_wasted = 0
+        self.usage: Dict[str, Usage] = {}
+        self.latency: Dict[str, Dict[str, float]] = {}
+        self.offset = 0
+
+    def feed(self, rec: Dict[str, Any]) -> None:
         if "floor" in rec and "enemy_idx" in rec:
-            floor = rec["floor"]
-            while len(floor_stats) <= floor:
-                floor_stats.append(FloorSummary(floor=len(floor_stats), accepts=0, rejects=0, lives=lives))
-            if rec["vote"] == "REJECT":
-                floor_stats[floor].rejects += 1
+            summary = self._floor(rec["floor"])
+            if rec.get("skipped"):
+                summary.skipped += 1
+            elif rec["vote"] == "REJECT":
+                summary.rejects += 1
             else:
-                floor_stats[floor].accepts += 1
+                summary.accepts += 1
+        if rec.get("retry"):
+            # Counts are for the floor's final revision.
+            summary = self._floor(rec["floor"])
+            summary.accepts = summary.rejects = summary.skipped = 0
+            summary.revisions += 1
         if "life_lost" in rec:
-            lives -= 1
-            if rec["floor"] < len(floor_stats):
-                floor_stats[rec["floor"].__int__()].lives = lives
-    boss_vote = next((rec["boss_vote"] for rec in data if "boss_vote" in rec), "?")
+            self.lives -= 1
+            if rec["floor"] < len(self.floors):
+                self.floors[rec["floor"]].lives = self.lives
+        if "usage" in rec:
+            self.usage["boss" if rec.get("boss") else str(rec["floor"])] = Usage(**rec["usage"])
+        if "latency" in rec:
+            self.latency = rec["latency"]
+        if rec.get("speculation") == "wasted":
+            self.speculative_wasted += 1
+        if "boss_vote" in rec and self.boss_vote is None:
+            self.boss_vote = rec["boss_vote"]
 
-    tmpl = Template(
-        """# Run {{run_id}} Report
+    def _floor(self, floor: int) -> FloorSummary:
+        while len(self.floors) <= floor:
+            self.floors.append(FloorSummary(floor=len(self.floors), accepts=0, rejects=0, lives=self.lives))
+        return self.floors[floor]
 
-| Floor | Accepts | Rejects | Lives |
-|-------|---------|---------|-------|
-{% for f in floors %}| {{f.floor}} | {{f.accepts}} | {{f.rejects}} | {{f.lives}} |
-{% endfor %}
+    @property
+    def skipped(self) -> int:
+        return sum(f.skipped for f in self.floors)
 
-Boss vote: **{{boss_vote}}**  
-LLM calls: {{llm_calls}}
+    @property
+    def retries(self) -> int:
+        return sum(f.revisions - 1 for f in self.floors)
 
-## Artifacts
-{% for a in artifacts %}- [floor {{a.floor}} rev {{a.revision}}]({{a.path(run_id)}})
-{% endfor %}
-"""
+    def consume(self, log_path: Path) -> int:
+        """Feed complete lines after :attr:`offset`; return how many were read."""
+        count = 0
+        for self.offset, rec in iter_log(log_path, self.offset):
+            self.feed(rec)
+            count += 1
+        return count
+
+
+def _format_calls(usage: Usage) -> str:
+    return ", ".join(
+        f"{kind} {n} ({usage.seconds.get(kind, 0.0):.2f}s)" for kind, n in sorted(usage.calls.items())
+    )
+
+
+def usage_rows(usage: Dict[str, Usage]) -> List[Dict[str, Any]]:
+    """Table rows for per-floor usage, ending with a ``total`` row."""
+    if not usage:
+        return []
+    total = Usage()
+    rows = []
+    for floor, u in usage.items():
+        total.merge(u)
+        rows.append({"floor": floor, **u.model_dump(), "calls": _format_calls(u)})
+    rows.append({"floor": "total", **total.model_dump(), "calls": _format_calls(total)})
+    return rows
+
+
+def latency_rows(latency: Dict[str, Dict[str, float]]) -> List[Dict[str, Any]]:
+    """Table rows for span latency statistics, slowest total first."""
+    return [
+        {"phase": phase, **stats}
+        for phase, stats in sorted(latency.items(), key=lambda item: item[1]["total_s"], reverse=True)
+    ]
+
+
+def render_report(
+    run_id: str,
+    artifacts: Sequence[Artifact],
+    log_path: Path,
+    llm_calls: int,
+    lives_start: int,
+    aggregator: Optional[LogAggregator] = None,
+    template: Optional[Path] = None,
+) -> str:
+    """Render the Markdown report for a run.
+
+    Pass the same ``aggregator`` on repeated calls to only parse records
+    appended since the previous render. ``template`` is an optional Jinja2
+    file used instead of the built-in layout (see :func:`get_template`).
+    """
+    if isinstance(artifacts, ArtifactHistory):
+        # Links only need metadata; do not read every artifact back from disk.
+        artifacts = artifacts.handles
+    agg = aggregator if aggregator is not None else LogAggregator(lives_start)
+    agg.consume(log_path)
+
+    tmpl = get_template(template)
+    boss_vote = "?" if agg.boss_vote is None else agg.boss_vote
+    return tmpl.render(
+        run_id=run_id,
+        floors=agg.floors,
+        boss_vote=boss_vote,
+        llm_calls=llm_calls,
+        speculative_wasted=agg.speculative_wasted,
+        skipped=agg.skipped,
+        retries=agg.retries,
+        usage=usage_rows(agg.usage),
+        latency=latency_rows(agg.latency),
+        artifacts=artifacts,
     )
-    return tmpl.render(run_id=run_id, floors=floor_stats, boss_vote=boss_vote, llm_calls=llm_calls, artifacts=artifacts)
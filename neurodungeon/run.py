@@ -1,60 +1,191 @@
 """Command-line interface for quick NeuroDungeon runs."""
 
-from argparse import ArgumentParser
+import sys
+from argparse import ArgumentParser, Namespace
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
 
 import os
-from .agents import StubBoss, StubEnemy, StubPlayer
-from .agents_llm import PlayerLLM, LintEnemyLLM
+from .batch import BatchJob, build_agents, close_agents, jobs_from_goals, run_batch
 from .models import RunConfig
 from .orchestrator import Orchestrator
 from .config import load_config
+from .index import index_cli, query_cli
+from .workqueue import worker_cli
 from .report import render_report
 
 
-def cli() -> None:
-    parser = ArgumentParser(description="Run NeuroDungeon with stub or LLM-backed agents")
-    parser.add_argument("--goal", required=True)
+def _common_parser(description: str) -> ArgumentParser:
+    parser = ArgumentParser(description=description)
     parser.add_argument("--lives", type=int, default=3)
     parser.add_argument("--persist-dir", type=Path, default=None)
     parser.add_argument("--enemies", type=int, default=8)
     parser.add_argument("--config", type=Path, default=None)
-    args = parser.parse_args()
+    parser.add_argument("--parallel", type=int, default=1, help="max enemies evaluated at once")
+    parser.add_argument("--cache", action="store_true", help="cache LLM enemy verdicts under persist-dir")
+    parser.add_argument("--report-template", type=Path, default=None, help="Jinja2 file for report.md")
+    parser.add_argument("--resume", action="store_true", help="continue from the run's last checkpoint")
+    parser.add_argument("--speculate", action="store_true", help="prefetch the next floor while enemies judge")
+    parser.add_argument("--early-exit", action="store_true", help="stop judging a floor once it is decided")
+    parser.add_argument("--max-revisions", type=int, default=1, help="attempts per floor before a life is lost")
+    parser.add_argument("--queue", type=Path, default=None, help="SQLite queue; enemies run on `neurodungeon worker`s")
+    parser.add_argument(
+        "--queue-timeout", type=float, default=600.0, help="seconds to wait for a worker's verdict"
+    )
+    parser.add_argument(
+        "--trace", choices=["off", "jsonl", "otlp"], default="jsonl", help="span export format under persist-dir"
+    )
+    return parser
 
+
+def _settings(args: Namespace) -> Dict[str, Any]:
+    """Merge CLI flags with the optional dungeon config file."""
     if args.config:
         cfg_data = load_config(args.config)
         lives = cfg_data.get("lives", args.lives)
         enemies_num = cfg_data.get("enemies", args.enemies)
         floors = cfg_data.get("floors")
         llm_limit = cfg_data.get("llm_call_limit", 50)
+        parallel = cfg_data.get("max_parallel_enemies", args.parallel)
+        cache = cfg_data.get("cache", args.cache)
+        speculate = cfg_data.get("speculative_player", args.speculate)
+        early_exit = cfg_data.get("early_exit", args.early_exit)
+        token_budget = cfg_data.get("token_budget")
+        cost_budget = cfg_data.get("cost_budget_usd")
+        trace = cfg_data.get("trace", args.trace)
+        max_revisions = cfg_data.get("max_revisions_per_floor", args.max_revisions)
+        floor_budget = cfg_data.get("floor_call_budget")
+        floor_deps = cfg_data.get("floor_deps")
+        parallel_floors = cfg_data.get("max_parallel_floors", 4)
+        queue = cfg_data.get("queue", args.queue)
+        queue_timeout = cfg_data.get("queue_timeout", args.queue_timeout)
     else:
         lives = args.lives
         enemies_num = args.enemies
         floors = None
         llm_limit = 50
+        parallel = args.parallel
+        cache = args.cache
+        speculate = args.speculate
+        early_exit = args.early_exit
+        token_budget = cost_budget = None
+        trace = args.trace
+        max_revisions = args.max_revisions
+        floor_budget = floor_deps = None
+        parallel_floors = 4
+        queue = args.queue
+        queue_timeout = args.queue_timeout
+    return {
+        "floors": list(floors) if floors else [1] * enemies_num,
+        "use_llm": bool(args.config and os.getenv("OPENAI_API_KEY")),
+        "cache": bool(cache),
+        "queue": None if queue is None else Path(queue),
+        "queue_timeout": float(queue_timeout),
+        "lives": lives,
+        "llm_call_limit": llm_limit,
+        "max_parallel_enemies": parallel,
+        "speculative_player": bool(speculate),
+        "early_exit": bool(early_exit),
+        "token_budget": token_budget,
+        "cost_budget_usd": cost_budget,
+        "trace": trace,
+        "max_revisions_per_floor": max_revisions,
+        "floor_call_budget": floor_budget,
+        "floor_deps": floor_deps,
+        "max_parallel_floors": parallel_floors,
+    }
+
+
+def batch_cli(argv: Sequence[str]) -> None:
+    parser = _common_parser("Run many NeuroDungeon goals on a process pool")
+    parser.add_argument("--goal", action="append", default=[], help="may be repeated")
+    parser.add_argument("--goals-file", type=Path, default=None, help="one goal per line")
+    parser.add_argument("--workers", type=int, default=None, help="default: CPU count")
+    parser.add_argument("--chunksize", type=int, default=1)
+    parser.add_argument("--prefix", default="batch", help="run id prefix")
+    parser.add_argument(
+        "--coalesce", action="store_true", help="grade same-floor artifacts of a chunk in one enemy call"
+    )
+    args = parser.parse_args(argv)
+
+    goals: List[str] = list(args.goal)
+    if args.goals_file:
+        goals += [line.strip() for line in args.goals_file.read_text().splitlines() if line.strip()]
+    if not goals:
+        parser.error("no goals given; use --goal or --goals-file")
+
+    settings = _settings(args)
+    jobs = jobs_from_goals(
+        goals,
+        settings.pop("floors"),
+        prefix=args.prefix,
+        use_llm=settings.pop("use_llm"),
+        cache=settings.pop("cache"),
+        queue=settings.pop("queue"),
+        queue_timeout=settings.pop("queue_timeout"),
+        report_template=args.report_template,
+        resume=args.resume,
+        persist_dir=args.persist_dir,
+        **settings,
+    )
+    summary = run_batch(jobs, workers=args.workers, chunksize=args.chunksize, coalesce=args.coalesce)
+    out_dir = args.persist_dir or Path(".")
+    summary_path = out_dir / "batch_summary.json"
+    summary_path.write_text(summary.model_dump_json())
+    print(
+        f"Batch of {len(jobs)} complete — passed {summary.passed}, failed {summary.failed}, "
+        f"errored {summary.errored} — summary: {summary_path.resolve()}"
+    )
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    subcommands = {"batch": batch_cli, "index": index_cli, "query": query_cli, "worker": worker_cli}
+    if argv and argv[0] in subcommands:
+        subcommands[argv[0]](argv[1:])
+        return
+
+    parser = _common_parser("Run NeuroDungeon with stub or LLM-backed agents")
+    parser.add_argument("--goal", required=True)
+    args = parser.parse_args(argv)
+    settings = _settings(args)
 
-    use_llm = bool(args.config and os.getenv("OPENAI_API_KEY"))
-    if floors:
-        enemies = [
-            [LintEnemyLLM() if use_llm else StubEnemy() for _ in range(n)]
-            for n in floors
-        ]
-    else:
-        enemies = [
-            [LintEnemyLLM() if use_llm else StubEnemy()] for _ in range(enemies_num)
-        ]
-    player = PlayerLLM(args.goal) if use_llm else StubPlayer()
-    orch = Orchestrator(player, enemies, StubBoss())
     cfg = RunConfig(
         run_id="cli_run",
-        lives=lives,
+        lives=settings["lives"],
         persist_dir=args.persist_dir,
-        llm_call_limit=llm_limit,
+        llm_call_limit=settings["llm_call_limit"],
+        max_parallel_enemies=settings["max_parallel_enemies"],
+        speculative_player=settings["speculative_player"],
+        early_exit=settings["early_exit"],
+        token_budget=settings["token_budget"],
+        cost_budget_usd=settings["cost_budget_usd"],
+        trace=settings["trace"],
+        max_revisions_per_floor=settings["max_revisions_per_floor"],
+        floor_call_budget=settings["floor_call_budget"],
+        floor_deps=settings["floor_deps"],
+        max_parallel_floors=settings["max_parallel_floors"],
     )
-    orch.run(args.goal, cfg)
+    job = BatchJob(
+        goal=args.goal,
+        config=cfg,
+        floors=settings["floors"],
+        use_llm=settings["use_llm"],
+        cache=settings["cache"],
+        queue=settings["queue"],
+        queue_timeout=settings["queue_timeout"],
+    )
+    agents = build_agents(job)
+    orch = Orchestrator(*agents)
+    try:
+        orch.run(args.goal, cfg, resume=args.resume)
+    finally:
+        close_agents(agents)
     log_path = cfg.persist_dir / "log.jsonl" if cfg.persist_dir else Path(cfg.run_id) / "log.jsonl"
     print(f"Run {cfg.run_id} complete — log: {log_path.resolve()}")
-    report_md = render_report(cfg.run_id, orch.artifacts, log_path, orch.llm_calls, cfg.lives)
+    report_md = render_report(
+        cfg.run_id, orch.artifacts, log_path, orch.llm_calls, cfg.lives, template=args.report_template
+    )
     run_dir = cfg.persist_dir
     assert run_dir is not None
     (run_dir / "report.md").write_text(report_md)
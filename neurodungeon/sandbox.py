@@ -1,16 +1,37 @@
-"""Docker-based sandbox for executing code."""
+"""Sandboxes for executing code: Docker containers or local subprocesses."""
 
 from __future__ import annotations
 
+import abc
+import io
+import math
+import os
+import queue
+import secrets
 import shutil
+import signal
 import subprocess
+import sys
+import tarfile
 import tempfile
+import threading
+import time
+import warnings
 from pathlib import Path
-from typing import Sequence
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
 
 from pydantic import ConfigDict
 
-from .models import FloorArtifact, Hint, Vote, NDModel
+from .agents import Enemy
+from .cache import EvalCache, digest, dump_verdict, load_verdict
+from .metering import report_usage
+from .models import FloorArtifact, Hint, Vote, NDModel, RunConfig
+from .tracing import span
 
 
 def docker_available() -> bool:
@@ -38,27 +59,128 @@ class SandboxResult(NDModel):
     timed_out: bool
 
 
-class Sandbox:
-    """Execute code inside a limited Docker container."""
+def _decode(out: str | bytes | None) -> str:
+    return out.decode() if isinstance(out, bytes) else (out or "")
+
+
+_BATCH_MARK = "@@neurodungeon"
+# Applies rlimits in the child before exec'ing the real command, which a
+# preexec_fn cannot do safely once the parent has started threads.
+_RLIMIT_BOOTSTRAP = (
+    "import os, resource, sys; "
+    "mem, cpu = int(sys.argv[1]), int(sys.argv[2]); "
+    "resource.setrlimit(resource.RLIMIT_AS, (mem, mem)); "
+    "resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1)); "
+    "os.execv(sys.executable, [sys.executable, *sys.argv[3:]])"
+)
+_TIMEOUT_HINT = Hint(text="timeout")
+_FAILED_HINT = Hint(text="tests failed")
+
+
+def _split_batch(stdout: str, count: int, mark: str) -> List[Optional[SandboxResult]]:
+    """Cut the output of a batched exec into per-artifact results.
+
+    ``mark`` carries a per-batch nonce so artifacts cannot forge markers.
+    Entries for artifacts whose end marker is missing are ``None``; a
+    malformed marker fails the artifact being run.
+    """
+    results: List[Optional[SandboxResult]] = [None] * count
+    current: Optional[int] = None
+    lines: List[str] = []
+    for line in stdout.splitlines(keepends=True):
+        fields = line.split()
+        if not fields or fields[0] != mark:
+            lines.append(line)
+            continue
+        if len(fields) == 2 and fields[1].isdigit() and int(fields[1]) < count:
+            current, lines = int(fields[1]), []
+            continue
+        if current is None:
+            continue
+        rc = int(fields[2]) if len(fields) == 3 and fields[1] == "rc" and fields[2].isdigit() else 1
+        # 124 is coreutils ``timeout``'s exit status.
+        results[current] = SandboxResult(
+            stdout="".join(lines), stderr="", exit_code=1 if rc == 124 else rc, timed_out=rc == 124
+        )
+        current = None
+    return results
+
+
+class SandboxBackend(abc.ABC):
+    """Interface for running an artifact's tests under CPU, memory and time limits."""
 
     def __init__(self, cpu: float, memory_mb: int, timeout_s: int) -> None:
         self.cpu = cpu
         self.memory_mb = memory_mb
         self.timeout_s = timeout_s
 
+    def __enter__(self) -> "SandboxBackend":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @abc.abstractmethod
+    def run(self, code: str, tests: str) -> SandboxResult:
+        """Run ``tests`` against ``code`` saved as ``code.py``."""
+        raise NotImplementedError
+
+    def run_many(self, codes: Sequence[str], tests: str) -> List[SandboxResult]:
+        """Run ``tests`` against each of ``codes``, returning results in order.
+
+        The default runs them one by one; backends override it to share
+        set-up cost across the batch.
+        """
+        return [self.run(code, tests) for code in codes]
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+
+    @staticmethod
+    def _write_files(workdir: Path, code: str, tests: str) -> None:
+        (workdir / "code.py").write_text(code)
+        (workdir / "test_code.py").write_text(tests)
+
+    def _kill(self, proc: subprocess.Popen[str]) -> None:
+        proc.kill()
+
+    def _exec(self, cmd: Sequence[str], timeout: Optional[float] = None, **popen_kw: Any) -> SandboxResult:
+        with span("sandbox.pytest") as sp:
+            result = self._communicate(cmd, timeout, **popen_kw)
+            sp.set(exit_code=result.exit_code, timed_out=result.timed_out)
+        return result
+
+    def _communicate(self, cmd: Sequence[str], timeout: Optional[float], **popen_kw: Any) -> SandboxResult:
+        with subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **popen_kw
+        ) as proc:
+            try:
+                stdout, stderr = proc.communicate(timeout=timeout or self.timeout_s)
+            except subprocess.TimeoutExpired:
+                self._kill(proc)
+                stdout, stderr = proc.communicate()
+                return SandboxResult(stdout=_decode(stdout), stderr=_decode(stderr), exit_code=1, timed_out=True)
+            return SandboxResult(stdout=stdout, stderr=stderr, exit_code=proc.returncode, timed_out=False)
+
+
+class Sandbox(SandboxBackend):
+    """Execute code inside a limited Docker container."""
+
+    def __init__(self, cpu: float, memory_mb: int, timeout_s: int, docker: str = "docker") -> None:
+        super().__init__(cpu, memory_mb, timeout_s)
+        self.docker = docker
+
+    def _limit_args(self) -> list[str]:
+        return [f"--cpus={self.cpu}", f"--memory={self.memory_mb}m", "--network", "none"]
+
     def run(self, code: str, tests: str) -> SandboxResult:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp = Path(tmpdir)
-            (tmp / "code.py").write_text(code)
-            (tmp / "test_code.py").write_text(tests)
+        with span("sandbox.run", backend="docker"), tempfile.TemporaryDirectory() as tmpdir:
+            self._write_files(Path(tmpdir), code, tests)
             cmd = [
-                "docker",
+                self.docker,
                 "run",
                 "--rm",
-                f"--cpus={self.cpu}",
-                f"--memory={self.memory_mb}m",
-                "--network",
-                "none",
+                *self._limit_args(),
                 "-v",
                 f"{tmpdir}:/work",
                 "-w",
@@ -67,44 +189,392 @@ class Sandbox:
                 "pytest",
                 "-q",
             ]
+            return self._exec(cmd)
+
+
+class NativeSandbox(SandboxBackend):
+    """Run pytest in a fresh local subprocess instead of a container.
+
+    Intended for trusted workloads on hosts without Docker: there is no
+    filesystem or network isolation. The process gets its own session and a
+    temporary working directory; ``memory_mb`` becomes an address-space
+    rlimit and ``cpu`` a CPU-time rlimit of ``ceil(cpu * timeout_s)``
+    seconds. ``timeout_s`` is enforced on wall time by killing the process
+    group. Third-party pytest plugins are not auto-loaded, matching the bare
+    container image.
+    """
+
+    def __init__(self, cpu: float, memory_mb: int, timeout_s: int, python: str = sys.executable) -> None:
+        super().__init__(cpu, memory_mb, timeout_s)
+        self.python = python
+
+    def _limited(self, args: Sequence[str]) -> list[str]:
+        """Prefix ``python`` arguments with the rlimit bootstrap, where rlimits exist."""
+        if resource is None:
+            return [self.python, *args]
+        mem = self.memory_mb * 1024 * 1024
+        cpu_s = max(math.ceil(self.cpu * self.timeout_s), 1)
+        return [self.python, "-c", _RLIMIT_BOOTSTRAP, str(mem), str(cpu_s), *args]
+
+    def _kill(self, proc: subprocess.Popen[str]) -> None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def run(self, code: str, tests: str) -> SandboxResult:
+        with span("sandbox.run", backend="native"), tempfile.TemporaryDirectory() as tmpdir:
+            self._write_files(Path(tmpdir), code, tests)
+            env = {
+                "PATH": os.environ.get("PATH", ""),
+                "PYTHONDONTWRITEBYTECODE": "1",
+                "PYTEST_DISABLE_PLUGIN_AUTOLOAD": "1",
+            }
+            cmd = self._limited(["-m", "pytest", "-q", "-p", "no:cacheprovider"])
+            return self._exec(cmd, cwd=tmpdir, env=env, start_new_session=True)
+
+
+class _Container:
+    __slots__ = ("cid", "uses", "checked_at")
+
+    def __init__(self, cid: str) -> None:
+        self.cid = cid
+        self.uses = 0
+        self.checked_at = time.monotonic()
+
+
+class PooledSandbox(Sandbox):
+    """Sandbox reusing a pool of warm, network-less containers.
+
+    Up to ``size`` containers are started ahead of time with the same CPU and
+    memory limits as :class:`Sandbox`, a read-only root filesystem and an
+    unprivileged ``user``. Each run copies the files in, runs pytest, then
+    wipes the writable tmpfs mounts and kills leftover processes so nothing
+    carries over to the next run. Containers are evicted after
+    ``max_uses`` runs, after a timeout, or when a health check fails; health
+    is re-checked when a container has been idle for ``health_interval_s``.
+    Call :meth:`close` (or use as a context manager) to remove containers.
+    """
+
+    image = "python:3.11-slim"
+    # the only paths ``user`` can write to; ``kill -1`` spares the shell and PID 1
+    _RESET = "find /work /tmp /dev/shm -mindepth 1 -delete 2>/dev/null; kill -9 -1 2>/dev/null"
+
+    def __init__(
+        self,
+        cpu: float,
+        memory_mb: int,
+        timeout_s: int,
+        size: int = 2,
+        max_uses: int = 50,
+        health_interval_s: float = 30.0,
+        docker: str = "docker",
+        user: str = "65534:65534",
+    ) -> None:
+        super().__init__(cpu, memory_mb, timeout_s, docker=docker)
+        self.user = user
+        self.size = size
+        self.max_uses = max_uses
+        self.health_interval_s = health_interval_s
+        self._idle: "queue.SimpleQueue[_Container]" = queue.SimpleQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._live: set[str] = set()
+        for _ in range(size):
+            self._idle.put(self._start())
+
+    def _docker(self, *args: str, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            [self.docker, *args], capture_output=True, text=True, timeout=timeout, check=False
+        )
+
+    def _start(self) -> _Container:
+        with span("sandbox.start"):
+            args = ["run", "-d", "--rm", *self._limit_args(), *self._isolation_args(), "-w", "/work"]
+            proc = self._docker(*args, self.image, "sleep", "infinity")
+        if proc.returncode != 0:
+            raise RuntimeError(f"failed to start sandbox container: {proc.stderr.strip()}")
+        container = _Container(proc.stdout.strip())
+        with self._lock:
+            self._live.add(container.cid)
+        return container
+
+    def _isolation_args(self) -> list[str]:
+        return [
+            "--read-only",
+            "--tmpfs",
+            "/work:exec,mode=777",
+            "--tmpfs",
+            "/tmp:exec,mode=1777",
+            "--user",
+            self.user,
+        ]
+
+    def _remove(self, container: _Container) -> None:
+        with self._lock:
+            self._live.discard(container.cid)
+        self._docker("rm", "-f", container.cid)
+
+    def _healthy(self, container: _Container) -> bool:
+        if time.monotonic() - container.checked_at < self.health_interval_s:
+            return True
+        try:
+            ok = self._docker("exec", container.cid, "true", timeout=self.timeout_s).returncode == 0
+        except subprocess.TimeoutExpired:
+            ok = False
+        container.checked_at = time.monotonic()
+        return ok
+
+    def _acquire(self) -> _Container:
+        with span("sandbox.acquire"):
+            return self._checkout()
+
+    def _checkout(self) -> _Container:
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    container = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._start()
+                if self._healthy(container):
+                    return container
+                self._remove(container)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, container: _Container, recycle: bool) -> None:
+        container.uses += 1
+        if recycle or container.uses >= self.max_uses:
+            self._remove(container)
+        else:
+            self._idle.put(container)
+        self._slots.release()
+
+    def run(self, code: str, tests: str) -> SandboxResult:
+        with span("sandbox.run", backend="pool"):
+            container = self._acquire()
+            recycle = True
             try:
-                proc = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout_s,
-                    check=False,
-                )
-                stdout = proc.stdout
-                stderr = proc.stderr
-                ret = proc.returncode
-                timed_out = False
-            except subprocess.TimeoutExpired as exc:
-                stdout = (
-                    exc.stdout.decode() if isinstance(exc.stdout, bytes) else (exc.stdout or "")
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    self._write_files(Path(tmpdir), code, tests)
+                    self._copy_in(tmpdir, container)
+                # Reset in the same exec so it costs no extra round-trip.
+                result = self._exec(
+                    [
+                        self.docker,
+                        "exec",
+                        "-w",
+                        "/work",
+                        container.cid,
+                        "sh",
+                        "-c",
+                        f"pytest -q; rc=$?; {self._RESET}; exit $rc",
+                    ]
                 )
-                stderr = (
-                    exc.stderr.decode() if isinstance(exc.stderr, bytes) else (exc.stderr or "")
-                )
-                ret = 1
-                timed_out = True
-            return SandboxResult(stdout=stdout, stderr=stderr, exit_code=ret, timed_out=timed_out)
+                recycle = result.timed_out
+                return result
+            finally:
+                self._release(container, recycle)
+
+    def _copy_in(self, tmpdir: str, container: _Container) -> None:
+        # docker cp cannot write into tmpfs mounts, so stream a tar into the
+        # container instead; extracted as ``user``, the files stay deletable.
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tar:
+            for path in sorted(Path(tmpdir).iterdir()):
+                tar.add(path, arcname=path.name)
+        with span("sandbox.copy"):
+            copied = subprocess.run(
+                [self.docker, "exec", "-i", container.cid, "tar", "-x", "-C", "/work"],
+                input=buf.getvalue(),
+                capture_output=True,
+                check=False,
+            )
+        if copied.returncode != 0:
+            stderr = copied.stderr.decode(errors="replace").strip()
+            raise RuntimeError(f"failed to copy into sandbox container: {stderr}")
+
+    def run_many(self, codes: Sequence[str], tests: str) -> List[SandboxResult]:
+        """Run a batch in one container with one copy and one test ``exec``.
 
+        Each artifact gets its own directory and ``timeout_s`` budget, and
+        its output is delimited by markers carrying a per-batch nonce.
+        Artifacts left unfinished by a failed batch are re-run one by one.
+        """
+        if len(codes) < 2:
+            return [self.run(code, tests) for code in codes]
+        with span("sandbox.run", backend="pool", batch=len(codes)):
+            results = self._run_batch(codes, tests)
+        return [r if r is not None else self.run(code, tests) for r, code in zip(results, codes)]
+
+    def _run_batch(self, codes: Sequence[str], tests: str) -> List[Optional[SandboxResult]]:
+        container = self._acquire()
+        recycle = True
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                for i, code in enumerate(codes):
+                    workdir = Path(tmpdir) / str(i)
+                    workdir.mkdir()
+                    self._write_files(workdir, code, tests)
+                self._copy_in(tmpdir, container)
+            dirs = " ".join(str(i) for i in range(len(codes)))
+            mark = f"{_BATCH_MARK}-{secrets.token_hex(16)}"
+            script = (
+                f"for d in {dirs}; do echo {mark} $d; cd /work/$d; "
+                f"timeout {self.timeout_s} pytest -q 2>&1; echo {mark} rc $?; done; {self._RESET}"
+            )
+            batch = self._exec(
+                [self.docker, "exec", "-w", "/work", container.cid, "sh", "-c", script],
+                timeout=self.timeout_s * len(codes) + self.timeout_s,
+            )
+            results = _split_batch(batch.stdout, len(codes), mark)
+            recycle = batch.timed_out or any(r is None or r.timed_out for r in results)
+        finally:
+            self._release(container, recycle)
+        return results
+
+    def close(self) -> None:
+        """Remove every container started by this pool."""
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            live, self._live = self._live, set()
+        for cid in live:
+            self._docker("rm", "-f", cid)
 
-class RuntimeEnemy:
-    """Enemy rejecting artifacts that fail sandbox tests."""
 
-    def __init__(self, sandbox: Sandbox, tests: str) -> None:
+class CachedSandbox(SandboxBackend):
+    """Wrap a backend so identical ``(code, tests)`` runs are served from an :class:`EvalCache`.
+
+    Timed-out results are not cached since they depend on host load.
+    """
+
+    def __init__(self, backend: SandboxBackend, cache: EvalCache) -> None:
+        super().__init__(backend.cpu, backend.memory_mb, backend.timeout_s)
+        self.backend = backend
+        self.cache = cache
+
+    def run(self, code: str, tests: str) -> SandboxResult:
+        key = self._key(code, tests)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return SandboxResult.model_validate_json(hit)
+        result = self.backend.run(code, tests)
+        if not result.timed_out:
+            self.cache.set(key, result.model_dump_json())
+        return result
+
+    def run_many(self, codes: Sequence[str], tests: str) -> List[SandboxResult]:
+        keys = [self._key(code, tests) for code in codes]
+        results: List[Optional[SandboxResult]] = []
+        for key in keys:
+            hit = self.cache.get(key)
+            results.append(None if hit is None else SandboxResult.model_validate_json(hit))
+        misses = [i for i, r in enumerate(results) if r is None]
+        for i, result in zip(misses, self.backend.run_many([codes[i] for i in misses], tests)):
+            results[i] = result
+            if not result.timed_out:
+                self.cache.set(keys[i], result.model_dump_json())
+        # codes a short batch left without a result are run alone
+        return [r if r is not None else self.run(code, tests) for r, code in zip(results, codes)]
+
+    def _key(self, code: str, tests: str) -> str:
+        return digest("sandbox", type(self.backend).__name__, self.cpu, self.memory_mb, self.timeout_s, code, tests)
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+SANDBOX_BACKENDS: dict[str, Callable[..., SandboxBackend]] = {
+    "docker": Sandbox,
+    "pool": PooledSandbox,
+    "native": NativeSandbox,
+}
+
+
+def make_sandbox(backend: str, cpu: float, memory_mb: int, timeout_s: int, **kwargs: Any) -> SandboxBackend:
+    """Create a sandbox by backend name.
+
+    ``"auto"`` picks ``"docker"`` when :func:`docker_available` and falls back
+    to ``"native"`` with a warning otherwise.
+    """
+    if backend == "auto":
+        if docker_available():
+            backend = "docker"
+        else:
+            warnings.warn("Docker unavailable; running sandbox tests in local subprocesses", RuntimeWarning)
+            backend = "native"
+    try:
+        factory = SANDBOX_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown sandbox backend {backend!r}") from None
+    return factory(cpu, memory_mb, timeout_s, **kwargs)
+
+
+def sandbox_from_config(cfg: RunConfig, **kwargs: Any) -> SandboxBackend:
+    """Create the sandbox selected by ``cfg.sandbox_backend`` with the config's limits."""
+    return make_sandbox(cfg.sandbox_backend, cfg.sandbox_cpu, cfg.sandbox_memory_mb, cfg.sandbox_timeout_s, **kwargs)
+
+
+class RuntimeEnemy(Enemy):
+    """Enemy rejecting artifacts that fail sandbox tests.
+
+    With a ``cache``, verdicts are keyed by artifact content, the test suite
+    and the sandbox limits.
+    """
+
+    def __init__(self, sandbox: SandboxBackend, tests: str, cache: Optional[EvalCache] = None) -> None:
         self.sandbox = sandbox
         self.tests = tests
+        self.cache = cache
 
-    def evaluate(self, artifact: FloorArtifact) -> tuple[Vote, tuple[Hint, ...]]:
+    def _key(self, artifact: FloorArtifact) -> str:
+        sb = self.sandbox
+        return digest(
+            "RuntimeEnemy", type(sb).__name__, sb.cpu, sb.memory_mb, sb.timeout_s, self.tests, artifact.content
+        )
 
-        result = self.sandbox.run(artifact.content, self.tests)
+    def _verdict(self, key: str, result: SandboxResult) -> tuple[Vote, tuple[Hint, ...]]:
         hints = []
         if result.timed_out:
-            hints.append(Hint(text="timeout"))
+            hints.append(_TIMEOUT_HINT)
         if result.exit_code != 0:
-            hints.append(Hint(text="tests failed"))
+            hints.append(_FAILED_HINT)
         vote = Vote.ACCEPT if result.exit_code == 0 and not result.timed_out else Vote.REJECT
+        if self.cache is not None and not result.timed_out:
+            self.cache.set(key, dump_verdict(vote, hints))
         return vote, tuple(hints)
+
+    def evaluate(self, artifact: FloorArtifact) -> tuple[Vote, tuple[Hint, ...]]:
+        key = ""
+        if self.cache is not None:
+            key = self._key(artifact)
+            hit = self.cache.get(key)
+            if hit is not None:
+                return load_verdict(hit)
+        start = time.perf_counter()
+        result = self.sandbox.run(artifact.content, self.tests)
+        report_usage("sandbox", seconds=time.perf_counter() - start)
+        return self._verdict(key, result)
+
+    def evaluate_many(self, artifacts: Sequence[FloorArtifact]) -> List[Tuple[Vote, Sequence[Hint]]]:
+        """Run every uncached artifact through one :meth:`SandboxBackend.run_many` call."""
+        keys = [self._key(a) if self.cache is not None else "" for a in artifacts]
+        verdicts: List[Optional[Tuple[Vote, Sequence[Hint]]]] = []
+        for key in keys:
+            hit = self.cache.get(key) if self.cache is not None else None
+            verdicts.append(None if hit is None else load_verdict(hit))
+        misses = [i for i, v in enumerate(verdicts) if v is None]
+        start = time.perf_counter()
+        results = self.sandbox.run_many([artifacts[i].content for i in misses], self.tests)
+        if misses:
+            report_usage("sandbox", seconds=time.perf_counter() - start, calls=len(misses))
+        for i, result in zip(misses, results):
+            verdicts[i] = self._verdict(keys[i], result)
+        # artifacts a short batch left without a result are run alone
+        return [v if v is not None else self.evaluate(a) for v, a in zip(verdicts, artifacts)]
@@ -0,0 +1,227 @@
+"""Timed spans for run phases, with JSONL and OTLP/JSON exporters."""
+
+from __future__ import annotations
+
+import abc
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
+
+TraceFormat = Literal["off", "jsonl", "otlp"]
+
+
+class Span:
+    """A timed operation; ``attributes`` hold floor, enemy_idx, revision etc."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class _NoopSpan(Span):
+    def __init__(self) -> None:
+        super().__init__("noop", "", None, {})
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class SpanExporter(abc.ABC):
+    """Receives every finished span."""
+
+    @abc.abstractmethod
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        """Flush and release resources."""
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Append one JSON object per span to ``path``."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._fh = self.path.open("a")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(
+            {
+                "name": span.name,
+                "trace_id": span.trace_id,
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                "start_ns": span.start_ns,
+                "end_ns": span.end_ns,
+                "duration_ms": round(span.duration_s * 1000, 3),
+                "attributes": span.attributes,
+            }
+        )
+        with self._lock:
+            self._fh.write(line + "\n")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpJsonSpanExporter(SpanExporter):
+    """Write spans as an OTLP/JSON ``ExportTraceServiceRequest`` on shutdown.
+
+    The file can be replayed to any OTLP/HTTP collector at ``/v1/traces``.
+    """
+
+    def __init__(self, path: Path, service_name: str = "neurodungeon") -> None:
+        self.path = Path(path)
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self._spans: List[Dict[str, Any]] = []
+
+    def export(self, span: Span) -> None:
+        record = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        }
+        if span.parent_id is not None:
+            record["parentSpanId"] = span.parent_id
+        with self._lock:
+            self._spans.append(record)
+
+    def shutdown(self) -> None:
+        resource = {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]}
+        with self._lock:
+            payload = {
+                "resourceSpans": [
+                    {"resource": resource, "scopeSpans": [{"scope": {"name": "neurodungeon"}, "spans": self._spans}]}
+                ]
+            }
+            self.path.write_text(json.dumps(payload))
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Tracer:
+    """Create spans for one run and keep per-name latency statistics."""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None) -> None:
+        self.exporter = exporter
+        self.trace_id = os.urandom(16).hex()
+        self._durations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def start(self, name: str, parent: Optional[Span], attributes: Dict[str, Any]) -> Span:
+        return Span(name, self.trace_id, None if parent is None else parent.span_id, attributes)
+
+    def end(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        with self._lock:
+            self._durations.setdefault(span.name, []).append(span.duration_s)
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def latency(self) -> Dict[str, Dict[str, float]]:
+        """``{name: {count, total_s, p50_s, p95_s, max_s}}`` over finished spans."""
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self._durations.items()}
+        return {
+            name: {
+                "count": len(values),
+                "total_s": round(sum(values), 6),
+                "p50_s": round(_percentile(values, 0.5), 6),
+                "p95_s": round(_percentile(values, 0.95), 6),
+                "max_s": round(values[-1], 6),
+            }
+            for name, values in durations.items()
+        }
+
+    def shutdown(self) -> None:
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+TRACE_FILES = {"jsonl": "traces.jsonl", "otlp": "traces.otlp.json"}
+
+
+def make_tracer(fmt: TraceFormat, persist_dir: Path) -> Optional[Tracer]:
+    """Tracer exporting to ``persist_dir`` in format ``fmt``; ``None`` for ``"off"``."""
+    if fmt == "off":
+        return None
+    path = persist_dir / TRACE_FILES[fmt]
+    exporter: SpanExporter = JsonlSpanExporter(path) if fmt == "jsonl" else OtlpJsonSpanExporter(path)
+    return Tracer(exporter)
+
+
+_current: ContextVar[Optional[Tuple[Tracer, Optional[Span]]]] = ContextVar("neurodungeon_span", default=None)
+
+
+@contextmanager
+def tracing(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """Make ``tracer`` current for :func:`span` calls in this context."""
+    token = _current.set(None if tracer is None else (tracer, None))
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time the block as a child of the current span; a no-op without a tracer.
+
+    Exceptions are recorded in the ``error`` attribute and re-raised.
+    """
+    current = _current.get()
+    if current is None:
+        yield _NOOP
+        return
+    tracer, parent = current
+    sp = tracer.start(name, parent, attributes)
+    token = _current.set((tracer, sp))
+    try:
+        yield sp
+    except BaseException as exc:
+        sp.set(error=type(exc).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        tracer.end(sp)
@@ -0,0 +1,329 @@
+"""Work queue for evaluating enemies in worker processes on other hosts."""
+
+from __future__ import annotations
+
+import abc
+import importlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Collection, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from pydantic import ConfigDict
+
+from .agents import Enemy
+from .cache import dump_verdict, load_verdict
+from .models import FloorArtifact, Hint, NDModel, Vote
+
+
+class Task(NDModel):
+    """An artifact to be graded by the enemy a worker registered as ``enemy``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: str
+    enemy: str
+    artifact: FloorArtifact
+    attempts: int = 1
+
+
+class TaskResult(NDModel):
+    """Outcome of a task: a :func:`~neurodungeon.cache.dump_verdict` string or an error."""
+
+    model_config = ConfigDict(frozen=True)
+
+    verdict: Optional[str] = None
+    error: Optional[str] = None
+
+
+class RemoteError(RuntimeError):
+    """A worker failed to evaluate a task."""
+
+
+class Transport(abc.ABC):
+    """Channel between coordinators posting tasks and workers running them.
+
+    Delivery is at least once: a task whose worker does not report back is
+    handed out again, so enemies should be safe to run twice.
+    """
+
+    @abc.abstractmethod
+    def submit(self, enemy: str, artifact: FloorArtifact) -> str:
+        """Queue ``artifact`` for ``enemy``; return the task id."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def claim(self, worker: str, enemies: Collection[str]) -> Optional[Task]:
+        """Take the oldest pending task for one of ``enemies``, if any."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def finish(self, task_id: str, result: TaskResult) -> None:
+        """Post the result of a claimed task."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def collect(self, task_ids: Sequence[str]) -> Dict[str, TaskResult]:
+        """Return and remove the results of finished tasks among ``task_ids``."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def discard(self, task_ids: Sequence[str]) -> None:
+        """Drop tasks whose results are no longer wanted."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources held by the transport."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    enemy TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    verdict TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, enemy);
+"""
+
+
+class SQLiteTransport(Transport):
+    """Queue kept in a SQLite file, for workers on one host or a shared disk.
+
+    A claimed task is leased for ``lease_s`` seconds; if its worker has not
+    finished it by then it is handed to the next worker, up to
+    ``max_attempts`` times before it fails. Safe to share between threads.
+    """
+
+    def __init__(self, path: Path, lease_s: float = 300.0, max_attempts: int = 3) -> None:
+        self.path = Path(path)
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "SQLiteTransport":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # sqlite3 connections may be closed more than once
+        self.conn.close()
+
+    def submit(self, enemy: str, artifact: FloorArtifact) -> str:
+        task_id = uuid.uuid4().hex
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO tasks (id, enemy, artifact) VALUES (?, ?, ?)",
+                (task_id, enemy, artifact.model_dump_json(indent=None)),
+            )
+        return task_id
+
+    def claim(self, worker: str, enemies: Collection[str]) -> Optional[Task]:
+        names = list(enemies)
+        marks = ", ".join("?" * len(names))
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "UPDATE tasks SET state = 'done', error = 'lease expired ' || attempts || ' times' "
+                    "WHERE state = 'claimed' AND lease_until < ? AND attempts >= ?",
+                    (now, self.max_attempts),
+                )
+                row = self.conn.execute(
+                    f"SELECT id, enemy, artifact, attempts FROM tasks WHERE enemy IN ({marks}) "
+                    "AND (state = 'pending' OR (state = 'claimed' AND lease_until < ?)) ORDER BY rowid LIMIT 1",
+                    (*names, now),
+                ).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        "UPDATE tasks SET state = 'claimed', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                        "WHERE id = ?",
+                        (worker, now + self.lease_s, row[0]),
+                    )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        task_id, enemy, artifact, attempts = row
+        return Task(
+            id=task_id, enemy=enemy, artifact=FloorArtifact.model_validate_json(artifact), attempts=attempts + 1
+        )
+
+    def finish(self, task_id: str, result: TaskResult) -> None:
+        with self._lock:
+            self.conn.execute(
+                "UPDATE tasks SET state = 'done', verdict = ?, error = ? WHERE id = ? AND state != 'done'",
+                (result.verdict, result.error, task_id),
+            )
+
+    def collect(self, task_ids: Sequence[str]) -> Dict[str, TaskResult]:
+        marks = ", ".join("?" * len(task_ids))
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.conn.execute(
+                    f"SELECT id, verdict, error FROM tasks WHERE state = 'done' AND id IN ({marks})", tuple(task_ids)
+                ).fetchall()
+                self.conn.executemany("DELETE FROM tasks WHERE id = ?", [(row[0],) for row in rows])
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return {task_id: TaskResult(verdict=verdict, error=error) for task_id, verdict, error in rows}
+
+    def discard(self, task_ids: Sequence[str]) -> None:
+        with self._lock:
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in task_ids])
+
+
+class RemoteEnemy(Enemy):
+    """Enemy graded by whichever worker registered ``name`` on ``transport``.
+
+    :meth:`evaluate_many` queues the whole batch before waiting, so workers
+    grade it in parallel; use ``max_parallel_enemies`` to do the same across
+    a floor's enemies. Worker failures raise :class:`RemoteError`; after
+    ``timeout_s`` outstanding tasks are discarded and ``TimeoutError`` is
+    raised.
+    """
+
+    def __init__(
+        self, transport: Transport, name: str, poll_s: float = 0.05, timeout_s: Optional[float] = None
+    ) -> None:
+        self.transport = transport
+        self.name = name
+        self.poll_s = poll_s
+        self.timeout_s = timeout_s
+
+    def evaluate(self, artifact: FloorArtifact) -> Tuple[Vote, Sequence[Hint]]:
+        return self.evaluate_many([artifact])[0]
+
+    def close(self) -> None:
+        """Close the transport; safe to call from every enemy sharing it."""
+        self.transport.close()
+
+    def evaluate_many(self, artifacts: Sequence[FloorArtifact]) -> List[Tuple[Vote, Sequence[Hint]]]:
+        task_ids = [self.transport.submit(self.name, artifact) for artifact in artifacts]
+        results = self._wait(task_ids)
+        verdicts: List[Tuple[Vote, Sequence[Hint]]] = []
+        for task_id in task_ids:
+            result = results[task_id]
+            if result.verdict is None:
+                raise RemoteError(f"{self.name}: {result.error}")
+            verdicts.append(load_verdict(result.verdict))
+        return verdicts
+
+    def _wait(self, task_ids: Sequence[str]) -> Dict[str, TaskResult]:
+        deadline = None if self.timeout_s is None else time.monotonic() + self.timeout_s
+        results: Dict[str, TaskResult] = {}
+        pending = list(task_ids)
+        while True:
+            results.update(self.transport.collect(pending))
+            pending = [task_id for task_id in pending if task_id not in results]
+            if not pending:
+                return results
+            if deadline is not None and time.monotonic() > deadline:
+                self.transport.discard(pending)
+                raise TimeoutError(f"{self.name}: no worker answered {len(pending)} task(s)")
+            time.sleep(self.poll_s)
+
+
+class Worker:
+    """Pull tasks for the registered ``enemies`` and post their verdicts."""
+
+    def __init__(
+        self,
+        transport: Transport,
+        enemies: Mapping[str, Enemy],
+        worker_id: Optional[str] = None,
+        poll_s: float = 0.1,
+    ) -> None:
+        self.transport = transport
+        self.enemies = dict(enemies)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_s = poll_s
+        self._stop = threading.Event()
+
+    def run_once(self) -> bool:
+        """Handle one task; return ``False`` if none was waiting."""
+        task = self.transport.claim(self.worker_id, self.enemies)
+        if task is None:
+            return False
+        try:
+            vote, hints = self.enemies[task.enemy].evaluate(task.artifact)
+        except Exception as exc:
+            result = TaskResult(error=f"{type(exc).__name__}: {exc}")
+        else:
+            result = TaskResult(verdict=dump_verdict(vote, hints))
+        self.transport.finish(task.id, result)
+        return True
+
+    def run(self, max_tasks: Optional[int] = None, idle_timeout_s: Optional[float] = None) -> int:
+        """Work until :meth:`stop`, ``max_tasks`` or ``idle_timeout_s`` without tasks; return tasks handled."""
+        handled = 0
+        idle_since = time.monotonic()
+        while not self._stop.is_set() and (max_tasks is None or handled < max_tasks):
+            if self.run_once():
+                handled += 1
+                idle_since = time.monotonic()
+            elif idle_timeout_s is not None and time.monotonic() - idle_since > idle_timeout_s:
+                break
+            else:
+                self._stop.wait(self.poll_s)
+        return handled
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def load_enemy(spec: str) -> Enemy:
+    """Build an enemy from ``"module:factory"``; the factory takes no arguments."""
+    module, _, attr = spec.partition(":")
+    enemy = getattr(importlib.import_module(module), attr)()
+    if not isinstance(enemy, Enemy):
+        raise TypeError(f"{spec} did not return an Enemy")
+    return enemy
+
+
+def worker_cli(argv: Sequence[str]) -> None:
+    parser = ArgumentParser(description="Evaluate enemies for runs started with --queue")
+    parser.add_argument("--queue", type=Path, required=True, help="SQLite queue file shared with the coordinator")
+    parser.add_argument(
+        "--enemy",
+        action="append",
+        default=[],
+        metavar="NAME=MODULE:FACTORY",
+        help="may be repeated; default: stub=neurodungeon.agents:StubEnemy",
+    )
+    parser.add_argument("--id", default=None, help="worker id; default: host:pid")
+    parser.add_argument("--max-tasks", type=int, default=None)
+    parser.add_argument("--idle-timeout", type=float, default=None, help="exit after this many idle seconds")
+    parser.add_argument("--lease", type=float, default=300.0, help="seconds before an unfinished task is retried")
+    args = parser.parse_args(argv)
+
+    enemies: Dict[str, Enemy] = {}
+    for entry in args.enemy or ["stub=neurodungeon.agents:StubEnemy"]:
+        name, sep, spec = entry.partition("=")
+        if not sep:
+            parser.error(f"--enemy {entry!r} is not NAME=MODULE:FACTORY")
+        enemies[name] = load_enemy(spec)
+    with SQLiteTransport(args.queue, lease_s=args.lease) as transport:
+        handled = Worker(transport, enemies, args.id).run(args.max_tasks, args.idle_timeout)
+    print(f"Worker handled {handled} task(s)")
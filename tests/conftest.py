@@ -0,0 +1,21 @@
+import json
+
+import pytest
+
+
+def _read_log_records(cfg, strip_timing=False):
+    records = []
+    for line in (cfg.persist_dir / "log.jsonl").read_text().splitlines():
+        record = json.loads(line)
+        if strip_timing:
+            record.pop("timestamp")
+            record.pop("latency", None)
+            record.get("usage", {}).pop("seconds", None)
+        records.append(record)
+    return records
+
+
+@pytest.fixture
+def log_records():
+    """Read a run's ``log.jsonl``; ``strip_timing`` drops fields that vary between runs."""
+    return _read_log_records
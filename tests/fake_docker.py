@@ -0,0 +1,116 @@
+"""Stand-in for the ``docker`` CLI used by sandbox tests and benchmarks.
+
+Containers are plain directories under ``$FAKE_DOCKER_STATE``; commands run
+on the host with ``/work``, ``/tmp`` and ``/dev/shm`` mapped to directories of
+the container and ``kill -9 -1`` disarmed so it cannot reach host processes.
+Like the real daemon, ``cp`` refuses tmpfs and read-only destinations. Every
+invocation is appended to ``calls.log``. ``FAKE_DOCKER_START_DELAY``
+adds a sleep to each container start to mimic real start-up cost.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+STATE = Path(os.environ["FAKE_DOCKER_STATE"])
+DELAY = float(os.environ.get("FAKE_DOCKER_START_DELAY", "0"))
+os.environ["PYTEST_DISABLE_PLUGIN_AUTOLOAD"] = "1"
+PYTEST = [sys.executable, "-m", "pytest", "-p", "no:cacheprovider"]
+
+
+def _work(cid: str) -> Path:
+    return STATE / "containers" / cid / "work"
+
+
+def _mounts(cid: str):
+    root = STATE / "containers" / cid
+    return {"/work": root / "work", "/tmp": root / "tmp", "/dev/shm": root / "shm"}
+
+
+def _translate(args, mounts):
+    pattern = re.compile("|".join(re.escape(path) for path in mounts))
+    out = []
+    for arg in args:
+        if arg == "pytest":
+            out += PYTEST
+        else:
+            arg = pattern.sub(lambda m: str(mounts[m.group(0)]), arg.replace("kill -9 -1", "true"))
+            out.append(arg.replace("pytest ", " ".join(PYTEST) + " "))
+    return out
+
+
+def _split_options(args):
+    """Return (options, rest) where rest starts at the image/container id."""
+    opts = {}
+    i = 0
+    while i < len(args) and args[i].startswith("-"):
+        flag = args[i]
+        if "=" in flag:
+            key, val = flag.split("=", 1)
+            opts[key] = val
+            i += 1
+        elif flag in {"-d", "-i", "--rm", "--read-only"}:
+            opts[flag] = True
+            i += 1
+        elif flag == "--tmpfs":
+            opts.setdefault(flag, []).append(args[i + 1].split(":")[0])
+            i += 2
+        else:
+            opts[flag] = args[i + 1]
+            i += 2
+    return opts, args[i:]
+
+
+def main(argv):
+    STATE.mkdir(parents=True, exist_ok=True)
+    with (STATE / "calls.log").open("a") as f:
+        f.write(" ".join(argv) + "\n")
+    cmd, args = argv[0], argv[1:]
+    if cmd == "info":
+        return 0
+    if cmd == "run":
+        opts, rest = _split_options(args)
+        time.sleep(DELAY)
+        if "-d" in opts:
+            cid = uuid.uuid4().hex[:12]
+            for path in _mounts(cid).values():
+                path.mkdir(parents=True)
+            (STATE / "containers" / cid / "limits").write_text(
+                f"{opts.get('--cpus')} {opts.get('--memory')} {opts.get('--network')}"
+            )
+            readonly = ["/"] if "--read-only" in opts else []
+            (STATE / "containers" / cid / "no_cp").write_text("\n".join(opts.get("--tmpfs", []) + readonly))
+            print(cid)
+            return 0
+        host = opts["-v"].split(":")[0]
+        return subprocess.call(_translate(rest[1:], {"/work": Path(host)}), cwd=host)
+    if cmd == "exec":
+        opts, rest = _split_options(args)
+        cid, command = rest[0], rest[1:]
+        work = _work(cid)
+        if not work.exists():
+            print(f"No such container: {cid}", file=sys.stderr)
+            return 1
+        return subprocess.call(_translate(command, _mounts(cid)), cwd=work)
+    if cmd == "cp":
+        src, dest = args
+        cid, path = dest.split(":", 1)
+        if any(path.startswith(mount) for mount in (STATE / "containers" / cid / "no_cp").read_text().split()):
+            print(f"Error response from daemon: cannot copy to {path}: tmpfs or read-only", file=sys.stderr)
+            return 1
+        shutil.copytree(src, _work(cid), dirs_exist_ok=True)
+        return 0
+    if cmd == "rm":
+        shutil.rmtree(STATE / "containers" / args[-1], ignore_errors=True)
+        return 0
+    print(f"unsupported command: {cmd}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,66 @@
+import hashlib
+
+import pytest
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.artifacts import ArtifactHandle, ArtifactHistory, write_artifact
+from neurodungeon.models import FloorArtifact, RunConfig, Vote
+from neurodungeon.orchestrator import Orchestrator
+from neurodungeon.report import render_report
+
+
+def test_write_artifact_encodes_once_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr("neurodungeon.artifacts.CHUNK_CHARS", 3)
+    content = "héllo wörld ✓"
+    path = tmp_path / "a.txt"
+    size, sha256 = write_artifact(path, content, limit=100)
+    data = content.encode()
+    assert path.read_bytes() == data
+    assert (size, sha256) == (len(data), hashlib.sha256(data).hexdigest())
+
+
+@pytest.mark.parametrize("content", ["x" * 20, "é" * 6])
+def test_write_artifact_limit_leaves_no_file(tmp_path, content):
+    path = tmp_path / "a.txt"
+    with pytest.raises(ValueError, match="too large"):
+        write_artifact(path, content, limit=10)
+    assert list(tmp_path.iterdir()) == []
+
+
+class StreamingBoss(StubBoss):
+    def judge(self, artifacts):
+        self.received = artifacts
+        self.seen = [(a.floor, a.content) for a in artifacts]
+        return Vote.ACCEPT
+
+
+def test_history_keeps_only_handles(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=2)
+    boss = StreamingBoss()
+
+    class Player(StubPlayer):
+        def act(self, floor, hints):
+            art = super().act(floor, hints)
+            return art if floor == 0 else art.model_copy(update={"content": "ü" * 100})
+
+    orch = Orchestrator(Player(), [[StubEnemy()], [StubEnemy()]], boss)
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    assert isinstance(orch.artifacts, ArtifactHistory) and isinstance(boss.received, ArtifactHistory)
+    small, big = orch.artifacts.handles
+    assert big.size == 200 and big.sha256 == hashlib.sha256(("ü" * 100).encode()).hexdigest()
+    assert orch.artifacts[1] == FloorArtifact(floor=1, revision=0, content="ü" * 100, ext=".txt")
+    with big.mapped() as view:
+        assert bytes(view[:2]) == "ü".encode()
+    assert boss.seen == [(0, small.content), (1, "ü" * 100)]
+    report = render_report(cfg.run_id, orch.artifacts, cfg.persist_dir / "log.jsonl", orch.llm_calls, cfg.lives)
+    assert "floor_1/rev_0.txt" in report
+
+
+def test_history_reads_lazily(tmp_path):
+    path = tmp_path / "floor_0" / "rev_0.py"
+    path.parent.mkdir()
+    size, _ = write_artifact(path, "old")
+    history = ArtifactHistory([ArtifactHandle(0, 0, ".py", path, size)])
+    path.write_text("new")
+    assert [a.content for a in history] == ["new"]
+    assert len(history[:0]) == 0
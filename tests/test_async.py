@@ -0,0 +1,64 @@
+import asyncio
+import json
+import time
+from unittest import mock
+
+from neurodungeon.agents import AsyncEnemy, StubBoss, StubEnemy, StubPlayer
+from neurodungeon.agents_llm import AsyncLintEnemyLLM
+from neurodungeon.models import FloorArtifact, Hint, RunConfig, Vote
+from neurodungeon.orchestrator import AsyncOrchestrator, Orchestrator
+
+
+class SlowAsyncEnemy(AsyncEnemy):
+    async def evaluate(self, artifact: FloorArtifact):
+        await asyncio.sleep(0.1)
+        return Vote.ACCEPT, (Hint(text="ok"),)
+
+
+def test_async_matches_sync(tmp_path):
+    sync_cfg = RunConfig(run_id=str(tmp_path / "sync"), rejection_thresh=1)
+    async_cfg = RunConfig(run_id=str(tmp_path / "async"), rejection_thresh=1)
+    enemies = [[StubEnemy()] for _ in range(3)]
+    sync_orch = Orchestrator(StubPlayer(), enemies, StubBoss())
+    async_orch = AsyncOrchestrator(StubPlayer(), enemies, StubBoss())
+    assert asyncio.run(async_orch.run("goal", async_cfg)) is sync_orch.run("goal", sync_cfg)
+    assert async_orch.lives == sync_orch.lives
+    assert async_orch.llm_calls == sync_orch.llm_calls
+    def strip(path):
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        for rec in records:
+            del rec["timestamp"]
+            rec.get("usage", {}).pop("seconds", None)
+            if "latency" in rec:
+                rec["latency"] = {name: stats["count"] for name, stats in rec["latency"].items()}
+        return records
+
+    assert strip(async_cfg.persist_dir / "log.jsonl") == strip(sync_cfg.persist_dir / "log.jsonl")
+
+
+def test_many_runs_share_one_loop(tmp_path):
+    async def main():
+        runs = []
+        for i in range(20):
+            cfg = RunConfig(run_id=str(tmp_path / f"run{i}"), max_parallel_enemies=4)
+            orch = AsyncOrchestrator(StubPlayer(), [[SlowAsyncEnemy() for _ in range(4)]], StubBoss())
+            runs.append(orch.run("goal", cfg))
+        return await asyncio.gather(*runs)
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    assert results == [Vote.ACCEPT] * 20
+    assert time.perf_counter() - start < 1.0
+
+
+def test_async_lint_enemy_llm(monkeypatch):
+    fake_resp = mock.Mock()
+    fake_resp.choices = [mock.Mock(message=mock.Mock(content="REJECT\nfix it"))]
+    fake_client = mock.Mock()
+    fake_client.chat.completions.create = mock.AsyncMock(return_value=fake_resp)
+    monkeypatch.setattr("neurodungeon.agents_llm.AsyncOpenAI", lambda **kwargs: fake_client)
+    vote, hints = asyncio.run(
+        AsyncLintEnemyLLM().evaluate(FloorArtifact(floor=0, revision=0, content="code", ext=".py"))
+    )
+    assert vote is Vote.REJECT
+    assert hints[0].text == "fix it"
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.auditlog import AuditLog
+from neurodungeon.models import RunConfig
+from neurodungeon.orchestrator import Orchestrator
+
+
+def test_buffers_until_floor_end(tmp_path):
+    path = tmp_path / "log.jsonl"
+    with AuditLog(path) as log:
+        log.write({"floor": 0, "enemy_idx": 0})
+        assert path.read_text() == ""
+        log.end_floor()
+        assert json.loads(path.read_text())["floor"] == 0
+        log.write({"boss_vote": "ACCEPT"})
+    assert len(path.read_text().splitlines()) == 2
+    assert log.closed
+
+
+@pytest.mark.parametrize("policy,expected", [("record", 3), ("floor", 2), ("close", 1)])
+def test_fsync_policy(tmp_path, monkeypatch, policy, expected):
+    synced = []
+    monkeypatch.setattr("neurodungeon.auditlog.os.fsync", synced.append)
+    with AuditLog(tmp_path / "log.jsonl", fsync=policy) as log:
+        log.write({"a": 1})
+        log.write({"b": 2})
+        log.end_floor()
+    # "record": two records + close, "floor": one floor + close, "close": close only
+    assert len(synced) == expected
+
+
+def test_log_flushed_when_run_aborts(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "abort"), llm_call_limit=2)
+    orch = Orchestrator(StubPlayer(), [[StubEnemy(), StubEnemy()]], StubBoss())
+    with pytest.raises(RuntimeError, match="LLM call limit exceeded"):
+        orch.run("goal", cfg)
+    data = [json.loads(line) for line in (cfg.persist_dir / "log.jsonl").read_text().splitlines()]
+    assert [d["enemy_idx"] for d in data] == [0, 1]
@@ -0,0 +1,54 @@
+import json
+import sys
+
+from neurodungeon import run
+from neurodungeon.batch import build_agents, jobs_from_goals, run_batch
+from neurodungeon.models import Vote
+
+
+def test_run_batch_process_pool(tmp_path):
+    jobs = jobs_from_goals(["a", "b", "c"], [1, 1], persist_dir=tmp_path, rejection_thresh=1, lives=3)
+    jobs += jobs_from_goals(["d"], [1, 1, 1], prefix="deep", persist_dir=tmp_path, rejection_thresh=1, lives=3)
+    summary = run_batch(jobs, workers=2)
+    assert [r.run_id for r in summary.results] == ["batch_00000", "batch_00001", "batch_00002", "deep_00000"]
+    assert (summary.passed, summary.failed, summary.errored) == (3, 1, 0)
+    assert summary.results[-1].vote is Vote.REJECT
+    for r in summary.results:
+        assert (tmp_path / r.run_id / "log.jsonl").exists()
+        assert (tmp_path / r.run_id / "report.md").exists()
+
+
+def test_run_batch_records_errors(tmp_path):
+    jobs = jobs_from_goals(["a"], [1, 1], persist_dir=tmp_path, llm_call_limit=1)
+    summary = run_batch(jobs, workers=1)
+    assert summary.errored == 1
+    assert summary.results[0].error == "RuntimeError: LLM call limit exceeded"
+
+
+def test_batch_cli(tmp_path, monkeypatch):
+    goals = tmp_path / "goals.txt"
+    goals.write_text("one\ntwo\n\n")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["neurodungeon", "batch", "--goals-file", str(goals), "--goal", "three",
+         "--persist-dir", str(tmp_path), "--workers", "2", "--enemies", "2"],
+    )
+    run.cli()
+    data = json.loads((tmp_path / "batch_summary.json").read_text())
+    assert [r["goal"] for r in data["results"]] == ["three", "one", "two"]
+    assert all(r["vote"] == "ACCEPT" for r in data["results"])
+
+
+def flaky_factory(job):
+    if job.goal == "bad":
+        raise ValueError("no agents for bad")
+    return build_agents(job)
+
+
+def test_run_batch_records_factory_errors(tmp_path):
+    jobs = jobs_from_goals(["a", "bad", "b"], [1], persist_dir=tmp_path, rejection_thresh=1)
+    for coalesce in (False, True):
+        summary = run_batch(jobs, workers=2, chunksize=3, factory=flaky_factory, coalesce=coalesce)
+        assert [r.error for r in summary.results] == [None, "ValueError: no agents for bad", None]
+        assert summary.passed == 2
@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _bench(*args):
+    cmd = [sys.executable, "-m", "benchmarks", "--suite", "models", "--scale", "quick", "--repeat", "1", *args]
+    return subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+
+
+def test_results_file_and_baseline_comparison(tmp_path):
+    out = tmp_path / "current.json"
+    proc = _bench("-k", "Hint", "--output", str(out))
+    assert proc.returncode == 0, proc.stderr
+    data = json.loads(out.read_text())
+    assert list(data["results"]) == ["models.Hint()"]
+    assert data["meta"]["scale"] == "quick"
+
+    slow = tmp_path / "slow.json"
+    for name in data["results"]:
+        data["results"][name]["median_s"] *= 100
+    slow.write_text(json.dumps(data))
+    assert _bench("-k", "Hint", "--output", str(out), "--baseline", str(slow)).returncode == 0
+
+    fast = tmp_path / "fast.json"
+    for name in data["results"]:
+        data["results"][name]["median_s"] /= 10_000
+    fast.write_text(json.dumps(data))
+    proc = _bench("-k", "Hint", "--output", str(out), "--baseline", str(fast))
+    assert proc.returncode == 1
+    assert "REGRESSION" in proc.stdout
+
+
+def test_sandbox_suite_closes_warm_pools(tmp_path, monkeypatch):
+    from benchmarks import bench_sandbox
+    from benchmarks.harness import measure
+
+    monkeypatch.setenv("FAKE_DOCKER_STATE", str(tmp_path / "docker_state"))
+    for name, (setup, _) in bench_sandbox.cases("quick", tmp_path):
+        if name == "sandbox.run[warm]":
+            measure(setup, 1, 2)
+            assert len(list((tmp_path / "docker_state" / "containers").iterdir())) == 1
+    assert not any((tmp_path / "docker_state" / "containers").iterdir())
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from neurodungeon.agents import StubBoss, StubPlayer
+from neurodungeon.agents_llm import LintEnemyLLM
+from neurodungeon.cache import EvalCache, digest
+from neurodungeon.models import FloorArtifact, RunConfig, Vote
+from neurodungeon.orchestrator import Orchestrator
+from neurodungeon.sandbox import CachedSandbox, RuntimeEnemy, SandboxBackend, SandboxResult
+
+
+class CountingSandbox(SandboxBackend):
+    def __init__(self) -> None:
+        super().__init__(cpu=1, memory_mb=256, timeout_s=10)
+        self.runs = 0
+
+    def run(self, code: str, tests: str) -> SandboxResult:
+        self.runs += 1
+        return SandboxResult(stdout="", stderr="", exit_code=0 if "ok" in code else 1, timed_out=False)
+
+
+def test_lru_and_disk_tiers(tmp_path):
+    cache = EvalCache(max_entries=2, disk_dir=tmp_path)
+    for k in "abc":
+        cache.set(digest(k), k)
+    assert cache.stats()["entries"] == 2
+    assert cache.get(digest("a")) == "a"  # evicted from memory, served from disk
+    assert cache.get(digest("zzz")) is None
+    assert cache.stats() == {"hits": 1, "disk_hits": 1, "misses": 1, "entries": 2}
+    assert EvalCache(disk_dir=tmp_path).get(digest("b")) == "b"
+
+
+def test_runtime_enemy_and_sandbox_cache():
+    cache = EvalCache()
+    sandbox = CountingSandbox()
+    enemy = RuntimeEnemy(CachedSandbox(sandbox, cache), "tests", cache=cache)
+    art = FloorArtifact(floor=0, revision=0, content="ok", ext=".py")
+    assert enemy.evaluate(art) == (Vote.ACCEPT, ())
+    assert enemy.evaluate(art.model_copy(update={"revision": 3})) == (Vote.ACCEPT, ())
+    assert sandbox.runs == 1
+    other = RuntimeEnemy(CachedSandbox(sandbox, cache), "other tests", cache=cache)
+    other.evaluate(art)
+    assert sandbox.runs == 2
+
+
+def test_cache_hits_do_not_count_against_llm_limit(tmp_path, monkeypatch):
+    fake_resp = mock.Mock()
+    fake_resp.choices = [mock.Mock(message=mock.Mock(content="ACCEPT"))]
+    fake_client = mock.Mock()
+    fake_client.chat.completions.create.return_value = fake_resp
+    monkeypatch.setattr("neurodungeon.agents_llm.OpenAI", lambda **kwargs: fake_client)
+
+    class SamePlayer(StubPlayer):
+        def act(self, floor, hints):
+            return FloorArtifact(floor=floor, revision=0, content="same", ext=".py")
+
+    cfg = RunConfig(run_id=str(tmp_path / "cached"), llm_call_limit=6)
+    cache = EvalCache.for_run(cfg)
+    enemies = [[LintEnemyLLM(cache=cache) for _ in range(2)] for _ in range(4)]
+    orch = Orchestrator(SamePlayer(), enemies, StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    # 4 player calls + 1 real lint call + boss; the other 7 verdicts are cache hits
+    assert fake_client.chat.completions.create.call_count == 1
+    assert orch.llm_calls == 6
+    assert cache.stats()["hits"] == 7
+
+
+def test_short_backend_batches_fall_back_to_single_runs():
+    class ShortSandbox(CountingSandbox):
+        def run_many(self, codes, tests):
+            return [self.run(code, tests) for code in codes[:1]]
+
+    sandbox = ShortSandbox()
+    assert [r.exit_code for r in CachedSandbox(sandbox, EvalCache()).run_many(["ok", "bad", "ok"], "t")] == [0, 1, 0]
+    arts = [FloorArtifact(floor=0, revision=i, content=c, ext=".py") for i, c in enumerate(["bad", "ok"])]
+    assert [v[0] for v in RuntimeEnemy(sandbox, "t").evaluate_many(arts)] == [Vote.REJECT, Vote.ACCEPT]
+    assert sandbox.runs == 4
@@ -0,0 +1,74 @@
+import pytest
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.checkpoint import load_checkpoint
+from neurodungeon.models import FloorArtifact, RunConfig, Vote
+from neurodungeon.orchestrator import Orchestrator
+
+
+class FlakyEnemy(StubEnemy):
+    def __init__(self) -> None:
+        self.fail = True
+
+    def evaluate(self, artifact: FloorArtifact):
+        if self.fail:
+            raise ConnectionError("API outage")
+        return Vote.ACCEPT, ()
+
+
+class CountingPlayer(StubPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.floors: list[int] = []
+
+    def act(self, floor, hints):
+        self.floors.append(floor)
+        return super().act(floor, hints)
+
+
+def test_resume_after_crash(tmp_path, log_records):
+    cfg = RunConfig(run_id=str(tmp_path / "resume"), rejection_thresh=1)
+    flaky = FlakyEnemy()
+    enemies = [[StubEnemy()], [StubEnemy()], [StubEnemy(), flaky]]
+    with pytest.raises(ConnectionError):
+        Orchestrator(StubPlayer(), enemies, StubBoss()).run("goal", cfg)
+    checkpoint = load_checkpoint(cfg)
+    assert checkpoint is not None and checkpoint.next_floor == 2
+    assert checkpoint.lives == 1 and checkpoint.prev_hints == ["improve"]
+    assert [r.get("floor") for r in log_records(cfg)][-1] == 2  # partial floor 2 logged
+
+    flaky.fail = False
+    player = CountingPlayer()
+    orch = Orchestrator(player, enemies, StubBoss())
+    assert orch.run("goal", cfg, resume=True) is Vote.REJECT
+    assert player.floors == [2]
+    assert [a.floor for a in orch.artifacts] == [0, 1, 2]
+    assert orch.artifacts[1].content == "artifact floor 1 rev 0 (1 hints)"
+    assert orch.llm_calls == 2 + 2 + 3
+    floor2 = [r for r in log_records(cfg) if r.get("floor") == 2 and "enemy_idx" in r]
+    assert [r["enemy_idx"] for r in floor2] == [0, 1]
+
+    # a finished run resumes straight to its result
+    assert Orchestrator(CountingPlayer(), enemies, StubBoss()).run("goal", cfg, resume=True) is Vote.REJECT
+
+
+def test_resume_without_checkpoint_starts_fresh(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "fresh"), checkpoint=False)
+    orch = Orchestrator(StubPlayer(), [[StubEnemy()]], StubBoss())
+    assert orch.run("goal", cfg, resume=True) is Vote.ACCEPT
+    assert load_checkpoint(cfg) is None
+
+
+def test_resume_after_crash_in_first_floor(tmp_path, log_records):
+    cfg = RunConfig(run_id=str(tmp_path / "first"), rejection_thresh=1)
+    flaky = FlakyEnemy()
+    enemies = [[StubEnemy(), flaky], [StubEnemy()]]
+    with pytest.raises(ConnectionError):
+        Orchestrator(StubPlayer(), enemies, StubBoss()).run("goal", cfg)
+    assert load_checkpoint(cfg) is None
+    assert [r["enemy_idx"] for r in log_records(cfg) if "enemy_idx" in r] == [0]
+
+    flaky.fail = False
+    assert Orchestrator(StubPlayer(), enemies, StubBoss()).run("goal", cfg, resume=True) is Vote.ACCEPT
+    floor0 = [r["enemy_idx"] for r in log_records(cfg) if r.get("floor") == 0 and "enemy_idx" in r]
+    assert floor0 == [0, 1]
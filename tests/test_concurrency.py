@@ -0,0 +1,52 @@
+import json
+import time
+
+import pytest
+
+from neurodungeon.agents import Enemy, StubBoss, StubPlayer
+from neurodungeon.models import FloorArtifact, Hint, RunConfig, Vote
+from neurodungeon.orchestrator import Orchestrator
+
+
+class SleepyEnemy(Enemy):
+    def __init__(self, delay: float, name: str) -> None:
+        self.delay = delay
+        self.name = name
+        self.calls = 0
+
+    def evaluate(self, artifact: FloorArtifact):
+        self.calls += 1
+        time.sleep(self.delay)
+        return Vote.ACCEPT, (Hint(text=self.name),)
+
+
+def test_parallel_floor_tracks_slowest_enemy(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "par"), max_parallel_enemies=4)
+    enemies = [[SleepyEnemy(0.2, f"e{i}") for i in range(4)]]
+    orch = Orchestrator(StubPlayer(), enemies, StubBoss())
+    start = time.perf_counter()
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    assert time.perf_counter() - start < 0.6
+
+
+def test_parallel_votes_logged_in_enemy_order(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "order"), max_parallel_enemies=3)
+    # Later enemies finish first.
+    enemies = [[SleepyEnemy(0.05 * (3 - i), f"e{i}") for i in range(3)]]
+    orch = Orchestrator(StubPlayer(), enemies, StubBoss())
+    orch.run("goal", cfg)
+    data = [json.loads(line) for line in (cfg.persist_dir / "log.jsonl").read_text().splitlines()]
+    votes = [d for d in data if "enemy_idx" in d]
+    assert [d["enemy_idx"] for d in votes] == [0, 1, 2]
+    assert [d["hints"] for d in votes] == [["e0"], ["e1"], ["e2"]]
+
+
+def test_parallel_respects_llm_call_limit(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "limit"), llm_call_limit=3, max_parallel_enemies=8)
+    enemies = [[SleepyEnemy(0, f"e{i}") for i in range(6)]]
+    orch = Orchestrator(StubPlayer(), enemies, StubBoss())
+    with pytest.raises(RuntimeError):
+        orch.run("goal", cfg)
+    # player + 2 enemies fit the budget, the third crosses it like the serial loop
+    assert sum(e.calls for e in enemies[0]) == 3
+    assert orch.llm_calls == 4
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import time
+
+from neurodungeon.agents import AsyncEnemy, Enemy, StubBoss, StubPlayer
+from neurodungeon.models import FloorArtifact, Hint, RunConfig, Vote
+from neurodungeon.orchestrator import AsyncOrchestrator, Orchestrator
+from neurodungeon.report import render_report
+
+
+class FixedEnemy(Enemy):
+    def __init__(self, vote: Vote) -> None:
+        self.vote = vote
+        self.calls = 0
+
+    def evaluate(self, artifact: FloorArtifact):
+        self.calls += 1
+        return self.vote, (Hint(text=self.vote.value.lower()),)
+
+
+class SlowAsyncEnemy(AsyncEnemy):
+    async def evaluate(self, artifact: FloorArtifact):
+        await asyncio.sleep(5)
+        return Vote.ACCEPT, ()
+
+
+def test_stops_after_threshold_reached(tmp_path, log_records):
+    cfg = RunConfig(run_id=str(tmp_path / "reject"), rejection_thresh=2, lives=1, early_exit=True)
+    enemies = [FixedEnemy(Vote.REJECT), FixedEnemy(Vote.REJECT)] + [FixedEnemy(Vote.ACCEPT) for _ in range(3)]
+    orch = Orchestrator(StubPlayer(), [enemies], StubBoss())
+    assert orch.run("goal", cfg) is Vote.REJECT
+    assert [e.calls for e in enemies] == [1, 1, 0, 0, 0]
+    assert orch.llm_calls == 3
+    skipped = [r["enemy_idx"] for r in log_records(cfg) if r.get("skipped")]
+    assert skipped == [2, 3, 4]
+    report = render_report(cfg.run_id, orch.artifacts, cfg.persist_dir / "log.jsonl", orch.llm_calls, cfg.lives)
+    assert "| 0 | 0 | 2 | 0 |" in report
+    assert "Skipped enemy evaluations: 3" in report
+
+
+def test_stops_once_threshold_unreachable(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "accept"), rejection_thresh=3, early_exit=True)
+    enemies = [FixedEnemy(Vote.ACCEPT) for _ in range(4)]
+    orch = Orchestrator(StubPlayer(), [enemies], StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    # after two accepts at most two rejects remain, short of the threshold
+    assert [e.calls for e in enemies] == [1, 1, 0, 0]
+
+
+def test_concurrent_cancels_queued_enemies(tmp_path, log_records):
+    cfg = RunConfig(
+        run_id=str(tmp_path / "par"), rejection_thresh=2, lives=2, max_parallel_enemies=2, early_exit=True
+    )
+    enemies = [FixedEnemy(Vote.REJECT), FixedEnemy(Vote.REJECT)] + [FixedEnemy(Vote.ACCEPT) for _ in range(4)]
+    orch = Orchestrator(StubPlayer(), [enemies], StubBoss())
+    orch.run("goal", cfg)
+    # a worker freed by the deciding verdict may pick up one more enemy
+    assert sum(e.calls for e in enemies[2:]) <= 2
+    votes = [r for r in log_records(cfg) if "enemy_idx" in r]
+    assert [r["enemy_idx"] for r in votes] == list(range(6))
+    skipped = {r["enemy_idx"] for r in votes if r.get("skipped")}
+    assert len(skipped) >= 2
+
+
+def test_async_cancels_outstanding_enemies(tmp_path, log_records):
+    cfg = RunConfig(
+        run_id=str(tmp_path / "async"), rejection_thresh=2, lives=2, max_parallel_enemies=8, early_exit=True
+    )
+    enemies = [FixedEnemy(Vote.REJECT), FixedEnemy(Vote.REJECT)] + [SlowAsyncEnemy() for _ in range(3)]
+    orch = AsyncOrchestrator(StubPlayer(), [enemies], StubBoss())
+    start = time.perf_counter()
+    asyncio.run(orch.run("goal", cfg))
+    assert time.perf_counter() - start < 2
+    assert orch.lives == 1
+    assert [r["enemy_idx"] for r in log_records(cfg) if r.get("skipped")] == [2, 3, 4]
+
+
+def test_async_cancelled_enemies_finish_before_tracer_closes(tmp_path):
+    cfg = RunConfig(
+        run_id=str(tmp_path / "traced"), rejection_thresh=1, lives=1, max_parallel_enemies=4, early_exit=True
+    )
+    errors = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx))
+        enemies = [FixedEnemy(Vote.REJECT), SlowAsyncEnemy(), SlowAsyncEnemy()]
+        await AsyncOrchestrator(StubPlayer(), [enemies], StubBoss()).run("goal", cfg)
+
+    asyncio.run(main())
+    assert errors == []
+    spans = [json.loads(line) for line in (cfg.persist_dir / "traces.jsonl").read_text().splitlines()]
+    assert sum(s["name"] == "enemy.evaluate" for s in spans) == 3
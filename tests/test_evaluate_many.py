@@ -0,0 +1,104 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from neurodungeon.agents import BatchingEnemy, Enemy, StubEnemy
+from neurodungeon.agents_llm import ChatClient, LintEnemyLLM
+from neurodungeon.batch import jobs_from_goals, run_batch
+from neurodungeon.cache import EvalCache
+from neurodungeon.models import FloorArtifact, Hint, Vote
+
+
+def _art(rev, content="code"):
+    return FloorArtifact(floor=0, revision=rev, content=content, ext=".py")
+
+
+class RecordingEnemy(Enemy):
+    batches = []
+
+    def evaluate(self, artifact):
+        return StubEnemy().evaluate(artifact)
+
+    def evaluate_many(self, artifacts):
+        RecordingEnemy.batches.append(len(artifacts))
+        return super().evaluate_many(artifacts)
+
+
+def test_default_evaluate_many_loops():
+    verdicts = StubEnemy().evaluate_many([_art(0), _art(1)])
+    assert [v[0] for v in verdicts] == [Vote.REJECT, Vote.ACCEPT]
+
+
+def test_batching_enemy_coalesces_concurrent_calls():
+    RecordingEnemy.batches = []
+    enemy = BatchingEnemy(RecordingEnemy(), max_batch=4, max_wait_s=5)
+    results = {}
+    threads = [threading.Thread(target=lambda r=r: results.update({r: enemy.evaluate(_art(r))})) for r in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert RecordingEnemy.batches == [4]
+    assert [results[r][0] for r in range(4)] == [Vote.REJECT, Vote.ACCEPT, Vote.ACCEPT, Vote.ACCEPT]
+
+
+def test_batching_enemy_propagates_errors():
+    class Broken(Enemy):
+        def evaluate(self, artifact):
+            raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        BatchingEnemy(Broken(), max_wait_s=0).evaluate(_art(0))
+
+
+def test_batching_enemy_grades_short_batches_one_by_one():
+    class Short(StubEnemy):
+        def evaluate_many(self, artifacts):
+            return []
+
+    assert BatchingEnemy(Short(), max_wait_s=0).evaluate(_art(1)) == (Vote.ACCEPT, ())
+
+
+def _lint_client(*replies):
+    fake = mock.Mock()
+    fake.chat.completions.create.side_effect = [
+        mock.Mock(choices=[mock.Mock(message=mock.Mock(content=r))]) for r in replies
+    ]
+    return fake, ChatClient(fake)
+
+
+def test_lint_enemy_reviews_batch_in_one_prompt(tmp_path):
+    fake, client = _lint_client("### Artifact 0\nREJECT\nadd tests\n### Artifact 1\nACCEPT")
+    cache = EvalCache(disk_dir=tmp_path)
+    enemy = LintEnemyLLM(model="m", client=client, cache=cache)
+    verdicts = enemy.evaluate_many([_art(0, "a = 1"), _art(1, "b = 2")])
+    assert verdicts == [(Vote.REJECT, (Hint(text="add tests"),)), (Vote.ACCEPT, ())]
+    assert fake.chat.completions.create.call_count == 1
+    prompt = fake.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+    assert "### Artifact 1\nb = 2" in prompt
+    # single-artifact reviews share the cache entries
+    assert enemy.evaluate(_art(2, "b = 2")) == (Vote.ACCEPT, ())
+    assert fake.chat.completions.create.call_count == 1
+
+
+def test_lint_enemy_falls_back_when_reply_unsplittable():
+    fake, client = _lint_client("ACCEPT", "REJECT\nno", "ACCEPT")
+    verdicts = LintEnemyLLM(model="m", client=client).evaluate_many([_art(0, "a"), _art(1, "b")])
+    assert [v[0] for v in verdicts] == [Vote.REJECT, Vote.ACCEPT]
+    assert fake.chat.completions.create.call_count == 3
+
+
+def recording_agents(job):
+    from neurodungeon.agents import StubBoss, StubPlayer
+
+    return StubPlayer(), [[RecordingEnemy() for _ in range(n)] for n in job.floors], StubBoss()
+
+
+def test_run_batch_coalesces_same_floor_artifacts(tmp_path):
+    RecordingEnemy.batches = []
+    jobs = jobs_from_goals(list("abcd"), [1, 1], persist_dir=tmp_path, rejection_thresh=1, lives=3)
+    summary = run_batch(jobs, workers=1, chunksize=4, factory=recording_agents, coalesce=True)
+    assert summary.passed == 4
+    assert sum(RecordingEnemy.batches) == 8
+    assert len(RecordingEnemy.batches) < 8
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.checkpoint import load_checkpoint
+from neurodungeon.models import FloorArtifact, RunConfig, Vote
+from neurodungeon.orchestrator import AsyncOrchestrator, Orchestrator
+
+
+class BarrierPlayer(StubPlayer):
+    """Only returns once ``parties`` floors are being played at the same time."""
+
+    def __init__(self, parties: int) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def act(self, floor, hints):
+        if floor < self.barrier.parties:
+            self.barrier.wait()
+        return super().act(floor, hints)
+
+
+class CountingPlayer(StubPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def act(self, floor, hints):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        threading.Event().wait(0.02)
+        with self.lock:
+            self.running -= 1
+        return super().act(floor, hints)
+
+
+class FlakyEnemy(StubEnemy):
+    def __init__(self) -> None:
+        self.fail = True
+
+    def evaluate(self, artifact: FloorArtifact):
+        if self.fail:
+            raise ConnectionError("API outage")
+        return Vote.ACCEPT, ()
+
+
+def test_chain_matches_serial_run(tmp_path, log_records):
+    def run(name, deps):
+        cfg = RunConfig(run_id=str(tmp_path / name), rejection_thresh=1, lives=2, floor_deps=deps)
+        orch = Orchestrator(StubPlayer(), [[StubEnemy()], [StubEnemy()], [StubEnemy()]], StubBoss())
+        return orch.run("goal", cfg), orch.llm_calls, log_records(cfg, strip_timing=True)
+
+    assert run("serial", None) == run("dag", [[], [0], [1]])
+
+
+def test_independent_floors_run_concurrently_and_commit_in_order(tmp_path, log_records):
+    # a single rejection stays under the threshold but still yields a hint
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=2, floor_deps=[[], [], [], [0, 2]])
+    orch = Orchestrator(BarrierPlayer(3), [[StubEnemy()]] * 4, StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    records = log_records(cfg, strip_timing=True)
+    assert [r["floor"] for r in records if "floor" in r] == sorted(r["floor"] for r in records if "floor" in r)
+    assert [a.floor for a in orch.artifacts] == [0, 1, 2, 3]
+    # floor 3 joins the hints of floors 0 and 2
+    assert orch.artifacts[3].content == "artifact floor 3 rev 0 (2 hints)"
+    assert load_checkpoint(cfg).floor_hints == [["improve"]] * 4
+
+
+def test_lives_end_the_run_in_floor_order(tmp_path, log_records):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1, lives=2, floor_deps=[[]] * 5)
+    orch = Orchestrator(StubPlayer(), [[StubEnemy()]] * 5, StubBoss())
+    assert orch.run("goal", cfg) is Vote.REJECT
+    assert orch.lives == 0
+    records = log_records(cfg, strip_timing=True)
+    assert [r["floor"] for r in records if r.get("life_lost")] == [0, 1]
+    assert {r.get("floor") for r in records} <= {0, 1, None}
+    # floors abandoned mid-flight still spent their calls
+    assert 4 <= orch.llm_calls <= cfg.llm_call_limit
+
+
+def test_run_end_abandons_floors_in_flight(tmp_path):
+    class SlowEnemy(StubEnemy):
+        calls = 0
+
+        def evaluate(self, artifact):
+            SlowEnemy.calls += 1
+            threading.Event().wait(0.3)
+            return Vote.ACCEPT, ()
+
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1, lives=1, floor_deps=[[], []])
+    orch = Orchestrator(StubPlayer(), [[StubEnemy()], [SlowEnemy() for _ in range(5)]], StubBoss())
+    start = time.perf_counter()
+    assert orch.run("goal", cfg) is Vote.REJECT
+    assert time.perf_counter() - start < 1.2
+    assert SlowEnemy.calls <= 2 and orch.llm_calls == 3 + SlowEnemy.calls
+
+
+def test_failing_floor_keeps_its_records(tmp_path, log_records):
+    def run(name, deps):
+        cfg = RunConfig(run_id=str(tmp_path / name), rejection_thresh=1, llm_call_limit=4, floor_deps=deps)
+        orch = Orchestrator(StubPlayer(), [[StubEnemy()] * 2, [StubEnemy()] * 2], StubBoss())
+        with pytest.raises(RuntimeError, match="LLM call limit"):
+            orch.run("goal", cfg)
+        return orch.llm_calls, log_records(cfg, strip_timing=True)
+
+    serial = run("serial", None)
+    assert [r.get("floor") for r in serial[1] if "enemy_idx" in r] == [0, 0, 1]
+    assert run("dag", [[], [0]]) == serial
+
+    async def run_async():
+        cfg = RunConfig(run_id=str(tmp_path / "async"), rejection_thresh=1, llm_call_limit=4, floor_deps=[[], [0]])
+        orch = AsyncOrchestrator(StubPlayer(), [[StubEnemy()] * 2, [StubEnemy()] * 2], StubBoss())
+        with pytest.raises(RuntimeError, match="LLM call limit"):
+            await orch.run("goal", cfg)
+        return orch.llm_calls, log_records(cfg, strip_timing=True)
+
+    assert asyncio.run(run_async()) == serial
+
+
+def test_call_limit_bounds_concurrency(tmp_path):
+    cfg = RunConfig(
+        run_id=str(tmp_path / "run"),
+        rejection_thresh=2,
+        llm_call_limit=9,
+        max_revisions_per_floor=2,
+        floor_deps=[[]] * 4,
+    )
+    player = CountingPlayer()
+    orch = Orchestrator(player, [[StubEnemy()]] * 4, StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    # each floor reserves 4 calls for a possible retry but spends 2
+    assert player.peak <= 2 and orch.llm_calls == 9
+    cfg = RunConfig(run_id=str(tmp_path / "tight"), rejection_thresh=2, llm_call_limit=7, floor_deps=[[]] * 4)
+    player = CountingPlayer()
+    with pytest.raises(RuntimeError, match="LLM call limit"):
+        Orchestrator(player, [[StubEnemy()]] * 4, StubBoss()).run("goal", cfg)
+    assert player.peak <= 3
+
+
+def test_resume_restores_dependency_hints(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1, floor_deps=[[], [], [0, 1]])
+    flaky = FlakyEnemy()
+    enemies = [[StubEnemy()], [StubEnemy()], [flaky]]
+    with pytest.raises(ConnectionError):
+        Orchestrator(StubPlayer(), enemies, StubBoss()).run("goal", cfg)
+    assert load_checkpoint(cfg).next_floor == 2
+
+    flaky.fail = False
+    orch = Orchestrator(StubPlayer(), enemies, StubBoss())
+    assert orch.run("goal", cfg, resume=True) is Vote.ACCEPT
+    assert orch.artifacts[2].content == "artifact floor 2 rev 0 (2 hints)"
+
+
+def test_async_matches_sync(tmp_path, log_records):
+    deps = [[], [], [0], [1, 2]]
+
+    def cfg(name):
+        return RunConfig(run_id=str(tmp_path / name), rejection_thresh=1, max_revisions_per_floor=2, floor_deps=deps)
+
+    sync_cfg, async_cfg = cfg("sync"), cfg("async")
+    sync = Orchestrator(StubPlayer(), [[StubEnemy()]] * 4, StubBoss())
+    sync.run("goal", sync_cfg)
+    orch = AsyncOrchestrator(StubPlayer(), [[StubEnemy()]] * 4, StubBoss())
+    asyncio.run(orch.run("goal", async_cfg))
+    assert (orch.llm_calls, orch.lives) == (sync.llm_calls, sync.lives)
+    assert log_records(async_cfg, strip_timing=True) == log_records(sync_cfg, strip_timing=True)
+
+
+def test_invalid_deps(tmp_path):
+    with pytest.raises(ValidationError, match="earlier floors"):
+        RunConfig(run_id=str(tmp_path / "run"), floor_deps=[[], [1]])
+    cfg = RunConfig(run_id=str(tmp_path / "run"), floor_deps=[[]])
+    with pytest.raises(ValueError, match="every floor"):
+        Orchestrator(StubPlayer(), [[StubEnemy()], [StubEnemy()]], StubBoss()).run("goal", cfg)
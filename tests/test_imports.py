@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import neurodungeon
+from neurodungeon import orchestrator
+
+
+def _loaded(code, modules):
+    probe = f"import sys; {code}; print(' '.join(m for m in {modules!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+    return out.splitlines()[-1].split()
+
+
+def test_cli_import_skips_heavy_dependencies():
+    assert _loaded("import neurodungeon.run", ("openai", "jinja2", "yaml", "neurodungeon.sandbox")) == []
+
+
+def test_stub_run_skips_openai(tmp_path):
+    argv = ["--goal", "g", "--enemies", "1", "--persist-dir", str(tmp_path)]
+    assert _loaded(f"from neurodungeon.run import cli; cli({argv!r})", ("openai", "yaml")) == []
+
+
+def test_lazy_exports():
+    assert neurodungeon.Orchestrator is orchestrator.Orchestrator
+    assert "RunConfig" in dir(neurodungeon)
+    assert neurodungeon.dataclasses.__name__ == "neurodungeon.dataclasses"
+    assert all(hasattr(neurodungeon, name) for name in neurodungeon.__all__)
+    try:
+        neurodungeon.missing
+    except AttributeError as exc:
+        assert "missing" in str(exc)
+    else:
+        raise AssertionError("expected AttributeError")
@@ -0,0 +1,73 @@
+import sys
+
+from neurodungeon import run
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.index import RunIndex
+from neurodungeon.models import RunConfig
+from neurodungeon.orchestrator import Orchestrator
+
+
+def _run(tmp_path, run_id, floors):
+    cfg = RunConfig(run_id=run_id, persist_dir=tmp_path, rejection_thresh=1)
+    Orchestrator(StubPlayer(), [[StubEnemy(), StubEnemy()] for _ in range(floors)], StubBoss()).run("g", cfg)
+    return cfg
+
+
+def test_incremental_ingest_and_queries(tmp_path):
+    _run(tmp_path, "a", 2)
+    with RunIndex(tmp_path / "index.sqlite") as index:
+        assert index.ingest(tmp_path) == 2 * 2 + 2 + 1
+        assert index.ingest(tmp_path) == 0
+        cfg = _run(tmp_path, "b", 1)
+        assert index.ingest(tmp_path) == 2 + 1 + 1
+        # appended records are picked up from the stored offset
+        with (cfg.persist_dir / "log.jsonl").open("a") as f:
+            f.write('{"boss_vote": "REJECT"}\n')
+        assert index.ingest(tmp_path) == 1
+
+        _, rows = index.query("rejects-by-enemy")
+        assert rows == [(0, 3, 3, 1.0), (1, 3, 3, 1.0)]
+        _, rows = index.query("lives-per-floor")
+        assert rows == [(0, 2, 1.0), (1, 1, 1.0)]
+        _, rows = index.query("SELECT COUNT(*) FROM hints WHERE text = 'improve'")
+        assert rows == [(6,)]
+
+
+def test_index_and_query_cli(tmp_path, monkeypatch, capsys):
+    _run(tmp_path, "a", 1)
+    db = tmp_path / "idx.sqlite"
+    monkeypatch.setattr(sys, "argv", ["neurodungeon", "index", str(tmp_path), "--db", str(db)])
+    run.cli()
+    monkeypatch.setattr(sys, "argv", ["neurodungeon", "query", "boss-votes", "--db", str(db)])
+    run.cli()
+    out = capsys.readouterr().out.splitlines()
+    assert out[-2:] == ["vote\truns", "ACCEPT\t1"]
+
+
+def test_runs_with_the_same_dir_name_stay_apart(tmp_path):
+    _run(tmp_path / "x", "cli_run", 1)
+    cfg = _run(tmp_path / "y", "cli_run", 2)
+    with RunIndex(tmp_path / "index.sqlite") as index:
+        assert index.ingest(tmp_path / "x") + index.ingest(tmp_path / "y") == 4 + 7
+        # rewriting one run's log must not drop the other's rows
+        log = cfg.persist_dir / "log.jsonl"
+        log.write_text('{"boss_vote": "REJECT"}\n')
+        assert index.ingest(tmp_path / "y") == 1
+        _, rows = index.query("SELECT run_id, COUNT(*) FROM boss_votes GROUP BY log ORDER BY 2")
+        assert rows == [("cli_run", 1), ("cli_run", 1)]
+        _, rows = index.query("lives-per-floor")
+        assert rows == [(0, 1, 1.0)]
+
+
+def test_regrown_log_is_reindexed(tmp_path):
+    cfg = _run(tmp_path, "a", 1)
+    log = cfg.persist_dir / "log.jsonl"
+    with RunIndex(tmp_path / "index.sqlite") as index:
+        assert index.ingest(tmp_path) == 4
+        # a resume truncates the log and appends past the old offset
+        size = log.stat().st_size
+        first = log.read_text().splitlines(keepends=True)[0]
+        log.write_text(first + '{"boss_vote": "REJECT", "note": "%s"}\n' % ("x" * size))
+        assert index.ingest(tmp_path) == 2
+        _, rows = index.query("SELECT vote FROM boss_votes")
+        assert rows == [("REJECT",)]
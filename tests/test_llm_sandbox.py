@@ -13,7 +13,7 @@ def test_player_llm(monkeypatch):
     fake_resp.choices = [mock.Mock(message=mock.Mock(content="artifact"))]
     fake_client = mock.Mock()
     fake_client.chat.completions.create.return_value = fake_resp
-    monkeypatch.setattr("neurodungeon.agents_llm.OpenAI", lambda api_key=None: fake_client)
+    monkeypatch.setattr("neurodungeon.agents_llm.OpenAI", lambda **kwargs: fake_client)
     player = PlayerLLM(goal="goal")
     art = player.act(0, [Hint(text="h")])
     assert art.content == "artifact"
@@ -25,7 +25,7 @@ def test_lint_enemy_llm(monkeypatch):
     fake_resp.choices = [mock.Mock(message=mock.Mock(content="ACCEPT\nhi"))]
     fake_client = mock.Mock()
     fake_client.chat.completions.create.return_value = fake_resp
-    monkeypatch.setattr("neurodungeon.agents_llm.OpenAI", lambda api_key=None: fake_client)
+    monkeypatch.setattr("neurodungeon.agents_llm.OpenAI", lambda **kwargs: fake_client)
     enemy = LintEnemyLLM()
     vote, hints = enemy.evaluate(
         FloorArtifact(floor=0, revision=0, content="code", ext=".py")
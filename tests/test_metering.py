@@ -0,0 +1,90 @@
+import json
+from unittest import mock
+
+import pytest
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.agents_llm import ChatClient, LintEnemyLLM
+from neurodungeon.metering import Meter, cost_usd, metered, report_usage
+from neurodungeon.models import RunConfig, Vote
+from neurodungeon.orchestrator import Orchestrator
+from neurodungeon.report import render_report
+
+
+def _lint_enemy(prompt_tokens=100, completion_tokens=20):
+    resp = mock.Mock()
+    resp.choices = [mock.Mock(message=mock.Mock(content="ACCEPT"))]
+    resp.usage = mock.Mock(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    fake = mock.Mock()
+    fake.chat.completions.create.return_value = resp
+    return LintEnemyLLM(model="gpt-4.1-nano", client=ChatClient(fake))
+
+
+def test_report_usage_outside_meter_is_noop():
+    report_usage("llm", prompt_tokens=10)
+    meter = Meter()
+    with metered(meter, 2):
+        report_usage("llm", prompt_tokens=10, completion_tokens=5, model="gpt-4o")
+    assert meter.floor(2).calls == {"llm": 1}
+    assert meter.total.total_tokens == 15
+    assert meter.total.cost_usd == pytest.approx(cost_usd("gpt-4o", 10, 5))
+
+
+def test_stub_run_has_calls_but_no_tokens(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "stub"), rejection_thresh=1)
+    orch = Orchestrator(StubPlayer(), [[StubEnemy(), StubEnemy()], [StubEnemy()]], StubBoss())
+    orch.run("goal", cfg)
+    assert orch.meter.floor(0).calls == {"player": 1, "enemy": 2}
+    assert orch.meter.floor(None).calls == {"boss": 1}
+    assert orch.meter.total.total_tokens == 0
+    records = [json.loads(line) for line in (cfg.persist_dir / "log.jsonl").read_text().splitlines()]
+    assert [r.get("floor", "boss") for r in records if "usage" in r] == [0, 1, "boss"]
+
+
+def test_llm_tokens_and_cost_per_floor(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "llm"))
+    orch = Orchestrator(StubPlayer(), [[_lint_enemy()], [_lint_enemy(), _lint_enemy()]], StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    assert orch.meter.floor(1).calls["llm"] == 2
+    assert orch.meter.floor(1).prompt_tokens == 200
+    assert orch.meter.total.completion_tokens == 60
+    assert orch.meter.total.cost_usd == pytest.approx(cost_usd("gpt-4.1-nano", 300, 60))
+    report = render_report(cfg.run_id, orch.artifacts, cfg.persist_dir / "log.jsonl", orch.llm_calls, cfg.lives)
+    assert "## Usage" in report
+    assert "| 1 | enemy 2" in report
+    assert "| 200 | 40 |" in report
+
+
+def test_token_budget(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "tokens"), token_budget=250)
+    orch = Orchestrator(StubPlayer(), [[_lint_enemy()] for _ in range(3)], StubBoss())
+    with pytest.raises(RuntimeError, match="Token budget exceeded"):
+        orch.run("goal", cfg)
+    assert orch.meter.total.total_tokens == 360
+
+
+def test_cost_budget(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "cost"), cost_budget_usd=0.00001)
+    orch = Orchestrator(StubPlayer(), [[_lint_enemy()]], StubBoss())
+    with pytest.raises(RuntimeError, match="Cost budget exceeded"):
+        orch.run("goal", cfg)
+
+
+def test_resume_restores_usage(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "resume"))
+    first = Orchestrator(StubPlayer(), [[_lint_enemy()], [_lint_enemy()]], StubBoss())
+    first.run("goal", cfg)
+    again = Orchestrator(StubPlayer(), [[_lint_enemy()], [_lint_enemy()]], StubBoss())
+    assert again.run("goal", cfg, resume=True) is Vote.ACCEPT
+    assert again.meter.total.calls == first.meter.total.calls
+    assert again.meter.total.prompt_tokens == 200
+
+
+def test_meter_returns_snapshots():
+    meter = Meter()
+    meter.record(0, "enemy", seconds=1.0, prompt_tokens=3)
+    snapshot = meter.floor(0)
+    snapshot.add("enemy", prompt_tokens=100)
+    meter.total.add("enemy", prompt_tokens=100)
+    assert meter.floor(0).calls == {"enemy": 1}
+    assert meter.total_tokens == meter.total.prompt_tokens == 3
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import AsyncOpenAI, BadRequestError, OpenAI
+
+from neurodungeon.agents_llm import (
+    AsyncChatClient,
+    AsyncPlayerLLM,
+    ChatClient,
+    LintEnemyLLM,
+    PlayerLLM,
+    shared_client,
+)
+from neurodungeon.models import FloorArtifact, Vote
+from neurodungeon.ratelimit import Backoff, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubAPI(ThreadingHTTPServer):
+    """Chat completions endpoint that fails with ``errors`` before succeeding."""
+
+    def __init__(self, errors, content="ACCEPT\nlooks fine"):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.errors = list(errors)
+        self.content = content
+        self.requests = 0
+        self.peers = set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers["Content-Length"]))
+        server.requests += 1
+        server.peers.add(self.client_address)
+        if server.errors:
+            status = server.errors.pop(0)
+            body = json.dumps({"error": {"message": "slow down", "type": "rate_limit"}}).encode()
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+        else:
+            status = 200
+            body = json.dumps(
+                {
+                    "id": "x",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": "stub",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": server.content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {"prompt_tokens": 5, "completion_tokens": 5, "total_tokens": 10},
+                }
+            ).encode()
+            self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stub_api():
+    servers = []
+
+    def start(errors=(), content="ACCEPT\nlooks fine"):
+        server = StubAPI(errors, content)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_token_bucket_spaces_out_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=2, clock=clock)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    clock.now = 10
+    assert bucket.reserve() == 0
+
+
+def test_rate_limiter_settles_token_usage():
+    clock = FakeClock()
+    limiter = RateLimiter(tpm=600, clock=clock)
+    assert limiter.reserve(600) == 0
+    limiter.settle(600, 300)
+    assert limiter.reserve(300) == 0
+    assert limiter.reserve(10) == pytest.approx(1.0)
+
+
+def test_backoff_is_jittered_and_honours_retry_after():
+    backoff = Backoff(base_s=1, cap_s=4, rng=lambda: 0.5)
+    assert [backoff.delay(i) for i in range(4)] == [0.5, 1.0, 2.0, 2.0]
+    assert backoff.delay(0, retry_after=3) == 3
+
+
+def test_retries_429_and_5xx(stub_api):
+    server, url = stub_api(errors=[429, 503])
+    sleeps = []
+    openai_client = OpenAI(api_key="sk-test", base_url=url, max_retries=0)
+    client = ChatClient(openai_client, RateLimiter(rpm=600), sleep=sleeps.append)
+    vote, hints = LintEnemyLLM(client=client).evaluate(FloorArtifact(floor=0, revision=0, content="x", ext=".py"))
+    assert vote is Vote.ACCEPT and hints[0].text == "looks fine"
+    assert server.requests == 3
+    # three limiter waits and two backoff delays
+    assert len(sleeps) == 5
+
+
+def test_gives_up_after_retries(stub_api):
+    server, url = stub_api(errors=[500] * 5)
+    client = ChatClient(OpenAI(api_key="sk-test", base_url=url, max_retries=0), backoff=Backoff(retries=2, base_s=0))
+    with pytest.raises(Exception):
+        client.complete("stub", "hi")
+    assert server.requests == 3
+
+
+def test_client_errors_are_not_retried(stub_api):
+    server, url = stub_api(errors=[400])
+    client = ChatClient(OpenAI(api_key="sk-test", base_url=url, max_retries=0), backoff=Backoff(base_s=0))
+    with pytest.raises(BadRequestError):
+        client.complete("stub", "hi")
+    assert server.requests == 1
+
+
+def test_agents_share_one_connection_pool(stub_api, monkeypatch):
+    server, url = stub_api(content="artifact")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-shared")
+    monkeypatch.setenv("OPENAI_BASE_URL", url)
+    player = PlayerLLM("goal")
+    enemies = [LintEnemyLLM() for _ in range(4)]
+    assert all(e.client is player.client is shared_client() for e in enemies)
+    for floor in range(3):
+        player.act(floor, [])
+    assert server.requests == 3
+    assert len(server.peers) == 1
+
+
+def test_async_client_retries(stub_api):
+    server, url = stub_api(errors=[429], content="async artifact")
+    client = AsyncChatClient(
+        lambda: AsyncOpenAI(api_key="sk-test", base_url=url, max_retries=0), backoff=Backoff(base_s=0)
+    )
+    art = asyncio.run(AsyncPlayerLLM("goal", client=client).act(0, []))
+    assert art.content == "async artifact"
+    assert server.requests == 2
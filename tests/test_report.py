@@ -8,3 +8,36 @@ def test_report_written(tmp_path, monkeypatch):
     run.cli()
     report_path = tmp_path / "cli_run" / "report.md"
     assert report_path.exists()
+
+
+def test_incremental_report_matches_full_render(tmp_path):
+    from neurodungeon.report import LogAggregator, render_report
+
+    log = tmp_path / "log.jsonl"
+    records = [
+        '{"floor": 0, "enemy_idx": 0, "vote": "REJECT", "hints": []}',
+        '{"floor": 0, "life_lost": true}',
+        '{"floor": 1, "enemy_idx": 0, "vote": "ACCEPT", "hints": []}',
+        '{"boss_vote": "ACCEPT"}',
+    ]
+    log.write_text(records[0] + "\n" + records[1] + "\n" + records[2][:10])
+    agg = LogAggregator(lives_start=3)
+    render_report("r", [], log, 3, 3, aggregator=agg)
+    assert agg.offset == len(records[0]) + len(records[1]) + 2
+    log.write_text("\n".join(records) + "\n")
+    incremental = render_report("r", [], log, 5, 3, aggregator=agg)
+    assert incremental == render_report("r", [], log, 5, 3)
+    assert "| 0 | 0 | 1 | 2 |" in incremental
+    assert "Boss vote: **ACCEPT**" in incremental
+
+
+def test_template_compiled_once_and_custom_file(tmp_path):
+    from neurodungeon.report import get_template, render_report
+
+    assert get_template() is get_template()
+    tmpl = tmp_path / "short.md.j2"
+    tmpl.write_text("{{run_id}}: {{boss_vote}} after {{llm_calls}} calls")
+    log = tmp_path / "log.jsonl"
+    log.write_text('{"boss_vote": "REJECT"}\n')
+    assert render_report("r", [], log, 4, 3, template=tmpl) == "r: REJECT after 4 calls"
+    assert get_template(tmpl) is get_template(tmpl)
@@ -0,0 +1,63 @@
+import asyncio
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.models import RunConfig, Vote
+from neurodungeon.orchestrator import AsyncOrchestrator, Orchestrator
+from neurodungeon.report import render_report
+
+
+class RecordingBoss(StubBoss):
+    def judge(self, artifacts):
+        self.seen = [(a.floor, a.revision) for a in artifacts]
+        return Vote.ACCEPT
+
+
+def test_rejected_floor_is_retried_before_losing_a_life(tmp_path, log_records):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1, max_revisions_per_floor=2)
+    boss = RecordingBoss()
+    orch = Orchestrator(StubPlayer(), [[StubEnemy()], [StubEnemy()]], boss)
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    assert orch.lives == cfg.lives
+    assert orch.llm_calls == 2 * (1 + 1) * 2 + 1
+    assert sorted(p.name for p in (cfg.persist_dir / "floor_1").iterdir()) == ["rev_0.txt", "rev_1.txt"]
+    # the retry sees the floor's own hint
+    assert "(1 hints)" in (cfg.persist_dir / "floor_0" / "rev_1.txt").read_text()
+    assert boss.seen == [(0, 1), (1, 1)]
+    records = log_records(cfg)
+    assert [r["revision"] for r in records if "vote" in r] == [0, 1, 0, 1]
+    assert [r["floor"] for r in records if r.get("retry")] == [0, 1]
+    assert not any("life_lost" in r for r in records)
+
+    report = render_report(cfg.run_id, orch.artifacts, cfg.persist_dir / "log.jsonl", orch.llm_calls, cfg.lives)
+    assert "| 0 | 1 | 0 | 3 |" in report
+    assert "Floor retries: 2" in report
+    assert "floor 0 rev 0" in report and "floor 0 rev 1" in report
+
+
+def test_floor_call_budget_stops_retries(tmp_path, log_records):
+    cfg = RunConfig(
+        run_id=str(tmp_path / "run"), rejection_thresh=1, max_revisions_per_floor=3, floor_call_budget=3
+    )
+    orch = Orchestrator(StubPlayer(), [[StubEnemy()]], StubBoss())
+    orch.run("goal", cfg)
+    assert orch.lives == cfg.lives - 1
+    assert not any(r.get("retry") for r in log_records(cfg))
+
+
+def test_call_limit_stops_retries_instead_of_failing(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1, max_revisions_per_floor=2, llm_call_limit=3)
+    orch = Orchestrator(StubPlayer(), [[StubEnemy()]], StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    assert orch.lives == cfg.lives - 1
+
+
+def test_async_retries_match_sync(tmp_path):
+    def run(orch_cls, name):
+        cfg = RunConfig(run_id=str(tmp_path / name), rejection_thresh=1, max_revisions_per_floor=2)
+        orch = orch_cls(StubPlayer(), [[StubEnemy()], [StubEnemy()]], StubBoss())
+        result = orch.run("goal", cfg)
+        if asyncio.iscoroutine(result):
+            result = asyncio.run(result)
+        return result, orch.lives, [(a.floor, a.revision) for a in orch.artifacts.handles]
+
+    assert run(Orchestrator, "sync") == run(AsyncOrchestrator, "async")
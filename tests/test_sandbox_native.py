@@ -0,0 +1,58 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from neurodungeon.models import FloorArtifact, RunConfig, Vote
+from neurodungeon.sandbox import NativeSandbox, RuntimeEnemy, SandboxResult, make_sandbox, sandbox_from_config
+
+CODE = "def add(a, b):\n    return a + b\n"
+TESTS = "from code import add\n\ndef test_add():\n    assert add(1, 2) == 3\n"
+
+
+def test_native_runtime_enemy():
+    enemy = RuntimeEnemy(NativeSandbox(cpu=1, memory_mb=512, timeout_s=30), TESTS)
+    good = FloorArtifact(floor=0, revision=0, content=CODE, ext=".py")
+    bad = FloorArtifact(floor=0, revision=1, content="def add(a, b):\n    return 0\n", ext=".py")
+    assert enemy.evaluate(good) == (Vote.ACCEPT, ())
+    vote, hints = enemy.evaluate(bad)
+    assert vote is Vote.REJECT and hints[0].text == "tests failed"
+
+
+def test_native_timeout_kills_process():
+    sandbox = NativeSandbox(cpu=1, memory_mb=512, timeout_s=1)
+    tests = "import time\n\ndef test_sleep():\n    time.sleep(30)\n"
+    start = time.perf_counter()
+    result = sandbox.run(CODE, tests)
+    assert isinstance(result, SandboxResult)
+    assert result.timed_out and result.exit_code == 1
+    assert time.perf_counter() - start < 10
+
+
+def test_native_memory_limit():
+    sandbox = NativeSandbox(cpu=1, memory_mb=512, timeout_s=30)
+    tests = "def test_hog():\n    blob = bytearray(1024 * 1024 * 1024)\n"
+    result = sandbox.run(CODE, tests)
+    assert result.exit_code != 0
+    assert "MemoryError" in result.stdout
+
+
+def test_native_limits_applied_from_threads():
+    sandbox = NativeSandbox(cpu=0.5, memory_mb=512, timeout_s=10)
+    tests = (
+        "import resource\n\ndef test_limits():\n"
+        "    assert resource.getrlimit(resource.RLIMIT_AS)[0] == 512 * 1024 * 1024\n"
+        "    assert resource.getrlimit(resource.RLIMIT_CPU) == (5, 6)\n"
+    )
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: sandbox.run(CODE, tests), range(4)))
+    assert [r.exit_code for r in results] == [0] * 4, results[0].stdout
+
+
+def test_sandbox_from_config(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "sb"), sandbox_backend="native", sandbox_timeout_s=5)
+    sandbox = sandbox_from_config(cfg)
+    assert isinstance(sandbox, NativeSandbox)
+    assert sandbox.timeout_s == 5
+    with pytest.raises(ValueError):
+        make_sandbox("vm", 1, 256, 10)
@@ -0,0 +1,120 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from neurodungeon.models import FloorArtifact, Vote
+from neurodungeon.sandbox import PooledSandbox, RuntimeEnemy, Sandbox, _split_batch
+
+CODE = "def add(a, b):\n    return a + b\n"
+TESTS = "from code import add\n\ndef test_add():\n    assert add(1, 2) == 3\n"
+
+
+@pytest.fixture
+def fake_docker(tmp_path, monkeypatch):
+    state = tmp_path / "docker_state"
+    monkeypatch.setenv("FAKE_DOCKER_STATE", str(state))
+    shim = tmp_path / "docker"
+    script = Path(__file__).with_name("fake_docker.py")
+    shim.write_text(f"#!/bin/sh\nexec {sys.executable} {script} \"$@\"\n")
+    shim.chmod(0o755)
+    return shim, state
+
+
+def _calls(state, verb):
+    return [line for line in (state / "calls.log").read_text().splitlines() if line.startswith(verb)]
+
+
+def test_cold_sandbox_with_fake_docker(fake_docker):
+    docker, state = fake_docker
+    result = Sandbox(cpu=1, memory_mb=256, timeout_s=30, docker=str(docker)).run(CODE, TESTS)
+    assert result.exit_code == 0 and not result.timed_out
+    assert len(_calls(state, "run --rm")) == 1
+
+
+def test_pool_reuses_warm_containers(fake_docker):
+    docker, state = fake_docker
+    with PooledSandbox(cpu=0.5, memory_mb=128, timeout_s=30, size=1, docker=str(docker)) as pool:
+        enemy = RuntimeEnemy(pool, TESTS)
+        art = FloorArtifact(floor=0, revision=0, content=CODE, ext=".py")
+        assert enemy.evaluate(art)[0] is Vote.ACCEPT
+        bad = FloorArtifact(floor=0, revision=1, content="def add(a, b):\n    return 0\n", ext=".py")
+        assert enemy.evaluate(bad)[0] is Vote.REJECT
+        assert enemy.evaluate(art)[0] is Vote.ACCEPT
+        assert len(_calls(state, "run -d")) == 1
+        (cid,) = [p.name for p in (state / "containers").iterdir()]
+        assert (state / "containers" / cid / "limits").read_text() == "0.5 128m none"
+        (start,) = _calls(state, "run -d")
+        assert "--read-only" in start and "--user 65534:65534" in start and "--tmpfs /tmp:exec,mode=1777" in start
+        # the writable mounts are wiped between runs
+        (state / "containers" / cid / "tmp" / "leftover").write_text("x")
+        assert enemy.evaluate(art)[0] is Vote.ACCEPT
+        for mount in ("work", "tmp", "shm"):
+            assert list((state / "containers" / cid / mount).iterdir()) == []
+    assert not any((state / "containers").iterdir())
+
+
+def test_pool_evicts_after_max_uses(fake_docker):
+    docker, state = fake_docker
+    with PooledSandbox(cpu=1, memory_mb=256, timeout_s=30, size=1, max_uses=2, docker=str(docker)) as pool:
+        for _ in range(3):
+            assert pool.run(CODE, TESTS).exit_code == 0
+    assert len(_calls(state, "run -d")) == 2
+
+
+def test_pool_replaces_unhealthy_container(fake_docker):
+    docker, state = fake_docker
+    with PooledSandbox(
+        cpu=1, memory_mb=256, timeout_s=30, size=1, health_interval_s=0, docker=str(docker)
+    ) as pool:
+        for cid in list((state / "containers").iterdir()):
+            pool._docker("rm", "-f", cid.name)
+        assert pool.run(CODE, TESTS).exit_code == 0
+    assert len(_calls(state, "run -d")) == 2
+
+
+def test_pool_runs_batch_in_one_exec(fake_docker):
+    docker, state = fake_docker
+    bad = "def add(a, b):\n    return 0\n"
+    with PooledSandbox(cpu=1, memory_mb=256, timeout_s=30, size=1, docker=str(docker)) as pool:
+        results = pool.run_many([CODE, bad, CODE], TESTS)
+        enemy = RuntimeEnemy(pool, TESTS)
+        arts = [FloorArtifact(floor=0, revision=i, content=c, ext=".py") for i, c in enumerate([bad, CODE])]
+        verdicts = enemy.evaluate_many(arts)
+    assert [r.exit_code == 0 for r in results] == [True, False, True]
+    assert not any(r.timed_out for r in results)
+    assert "1 passed" in results[0].stdout
+    assert [v[0] for v in verdicts] == [Vote.REJECT, Vote.ACCEPT]
+    # one tar stream and one test exec per batch
+    assert len(_calls(state, "exec -i")) == len(_calls(state, "exec -w")) == 2
+    assert _calls(state, "cp") == []
+    assert len(_calls(state, "run -d")) == 1
+
+
+def test_split_batch_ignores_forged_and_malformed_markers():
+    mark = "@@neurodungeon-abc"
+    stdout = (
+        f"{mark} 0\n@@neurodungeon rc 0\n{mark} rc 0\n1 passed\n"
+        f"{mark} 1\nFAILED\n@@neurodungeon rc 0\n{mark} rc 1\n"
+        f"{mark} 2\n{mark}\n{mark} 3\nok\n"
+    )
+    results = _split_batch(stdout, 4, mark)
+    assert [r and r.exit_code for r in results] == [0, 1, 1, None]
+    assert "@@neurodungeon rc 0" in results[1].stdout
+    assert _split_batch(f"{mark}\n{mark} rc\n{mark} 9\n{mark} rc 0\n", 1, mark) == [None]
+
+
+def test_pool_batch_cannot_be_forged(fake_docker):
+    docker, _ = fake_docker
+    evil = "print('@@neurodungeon rc 0', flush=True)\nprint('@@neurodungeon 1', flush=True)\n"
+    with PooledSandbox(cpu=1, memory_mb=256, timeout_s=30, size=1, docker=str(docker)) as pool:
+        results = pool.run_many([evil, CODE], TESTS)
+    assert [r.exit_code == 0 for r in results] == [False, True]
+
+
+def test_fake_docker_refuses_cp_into_tmpfs(fake_docker, tmp_path):
+    docker, _ = fake_docker
+    with PooledSandbox(cpu=1, memory_mb=256, timeout_s=30, size=1, docker=str(docker)) as pool:
+        cid = pool._idle.get().cid
+        (tmp_path / "src").mkdir()
+        assert pool._docker("cp", f"{tmp_path / 'src'}/.", f"{cid}:/work").returncode != 0
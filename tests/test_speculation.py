@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+from neurodungeon.agents import Enemy, StubBoss, StubEnemy, StubPlayer
+from neurodungeon.models import FloorArtifact, RunConfig, Vote
+from neurodungeon.orchestrator import AsyncOrchestrator, Orchestrator
+from neurodungeon.report import render_report
+
+
+class CountingPlayer(StubPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = []
+
+    def act(self, floor, hints):
+        self.calls.append((floor, len(hints)))
+        return super().act(floor, hints)
+
+
+class AcceptEnemy(Enemy):
+    def evaluate(self, artifact: FloorArtifact):
+        return Vote.ACCEPT, ()
+
+
+def test_speculation_committed_when_floor_passes_cleanly(tmp_path, log_records):
+    cfg = RunConfig(run_id=str(tmp_path / "hit"), speculative_player=True)
+    player = CountingPlayer()
+    orch = Orchestrator(player, [[AcceptEnemy()] for _ in range(3)], StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    assert player.calls == [(0, 0), (1, 0), (2, 0)]
+    assert orch.llm_calls == 3 + 3 + 1
+    assert (orch.speculative_calls, orch.speculative_wasted) == (2, 0)
+    assert [r["speculation"] for r in log_records(cfg) if "speculation" in r] == ["committed", "committed"]
+    report = render_report(cfg.run_id, orch.artifacts, cfg.persist_dir / "log.jsonl", orch.llm_calls, cfg.lives)
+    assert "Wasted" not in report
+
+
+def test_wasted_speculation_is_retracted_and_reported(tmp_path):
+    base_cfg = RunConfig(run_id=str(tmp_path / "base"), rejection_thresh=1, lives=5)
+    spec_cfg = RunConfig(run_id=str(tmp_path / "spec"), rejection_thresh=1, lives=5, speculative_player=True)
+    base = Orchestrator(StubPlayer(), [[StubEnemy()] for _ in range(3)], StubBoss())
+    spec = Orchestrator(StubPlayer(), [[StubEnemy()] for _ in range(3)], StubBoss())
+    assert spec.run("goal", spec_cfg) is base.run("goal", base_cfg)
+    # StubEnemy always hints, so every prefetch misses and is rolled back.
+    assert [a.revision for a in spec.artifacts] == [a.revision for a in base.artifacts]
+    assert spec.speculative_wasted == 2
+    assert spec.llm_calls == base.llm_calls + 2
+    report = render_report(spec_cfg.run_id, spec.artifacts, spec_cfg.persist_dir / "log.jsonl", spec.llm_calls, 5)
+    assert "Wasted speculative player calls: 2" in report
+
+
+def test_player_overlaps_enemies(tmp_path):
+    prefetched = threading.Event()
+
+    class SignalPlayer(StubPlayer):
+        def act(self, floor, hints):
+            if floor == 1:
+                prefetched.set()
+            return super().act(floor, hints)
+
+    class WaitingEnemy(Enemy):
+        def evaluate(self, artifact):
+            if artifact.floor == 0:
+                assert prefetched.wait(2)
+            return Vote.ACCEPT, ()
+
+    cfg = RunConfig(run_id=str(tmp_path / "overlap"), speculative_player=True)
+    orch = Orchestrator(SignalPlayer(), [[WaitingEnemy()], [WaitingEnemy()]], StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+
+
+def test_no_speculation_without_budget(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "tight"), llm_call_limit=5, speculative_player=True)
+    orch = Orchestrator(StubPlayer(), [[AcceptEnemy()], [AcceptEnemy()]], StubBoss())
+    assert orch.run("goal", cfg) is Vote.ACCEPT
+    # floor 0: player + enemy + prefetch + possible retry = 4 fits; floor 1 is last
+    assert orch.speculative_calls == 1
+    assert orch.llm_calls == 5
+
+
+def test_async_speculation(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "async"), speculative_player=True)
+    player = CountingPlayer()
+    orch = AsyncOrchestrator(player, [[AcceptEnemy()] for _ in range(3)], StubBoss())
+    assert asyncio.run(orch.run("goal", cfg)) is Vote.ACCEPT
+    assert len(player.calls) == 3
+    assert orch.speculative_calls == 2 and orch.speculative_wasted == 0
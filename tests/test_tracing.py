@@ -0,0 +1,102 @@
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.agents_llm import ChatClient
+from neurodungeon.models import RunConfig
+from neurodungeon.orchestrator import AsyncOrchestrator, Orchestrator
+from neurodungeon.report import render_report
+from neurodungeon.tracing import SpanExporter, Tracer, span, tracing
+
+
+class ListExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+def _spans(cfg):
+    return [json.loads(line) for line in (cfg.persist_dir / "traces.jsonl").read_text().splitlines()]
+
+
+@pytest.mark.parametrize("parallel", [1, 2])
+def test_jsonl_spans_nest_under_floors(tmp_path, parallel):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1, max_parallel_enemies=parallel)
+    Orchestrator(StubPlayer(), [[StubEnemy(), StubEnemy()], [StubEnemy()]], StubBoss()).run("goal", cfg)
+    spans = _spans(cfg)
+    by_id = {s["span_id"]: s for s in spans}
+    names = {s["name"] for s in spans}
+    assert {"run", "floor", "player.act", "enemy.evaluate", "persist", "checkpoint", "boss.judge"} <= names
+    assert len({s["trace_id"] for s in spans}) == 1
+    enemy_spans = [s for s in spans if s["name"] == "enemy.evaluate"]
+    assert sorted((s["attributes"]["floor"], s["attributes"]["enemy_idx"]) for s in enemy_spans) == [
+        (0, 0),
+        (0, 1),
+        (1, 0),
+    ]
+    for s in enemy_spans:
+        parent = by_id[s["parent_id"]]
+        assert parent["name"] == "floor" and parent["attributes"]["floor"] == s["attributes"]["floor"]
+        assert s["attributes"]["revision"] == 0
+    act = next(s for s in spans if s["name"] == "player.act")
+    assert act["attributes"] == {"floor": 0, "revision": 0}
+
+
+def test_latency_table_in_report(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1)
+    orch = Orchestrator(StubPlayer(), [[StubEnemy()], [StubEnemy()]], StubBoss())
+    orch.run("goal", cfg)
+    report = render_report(cfg.run_id, orch.artifacts, cfg.persist_dir / "log.jsonl", orch.llm_calls, cfg.lives)
+    assert "## Latency" in report
+    assert "| enemy.evaluate | 2 |" in report
+
+
+def test_trace_off(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1, trace="off")
+    orch = Orchestrator(StubPlayer(), [[StubEnemy()]], StubBoss())
+    orch.run("goal", cfg)
+    assert not list(cfg.persist_dir.glob("traces.*"))
+    report = render_report(cfg.run_id, orch.artifacts, cfg.persist_dir / "log.jsonl", orch.llm_calls, cfg.lives)
+    assert "## Latency" not in report
+
+
+def test_otlp_export(tmp_path):
+    cfg = RunConfig(run_id=str(tmp_path / "run"), rejection_thresh=1, trace="otlp")
+    asyncio.run(AsyncOrchestrator(StubPlayer(), [[StubEnemy()]], StubBoss()).run("goal", cfg))
+    payload = json.loads((cfg.persist_dir / "traces.otlp.json").read_text())
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    enemy = next(s for s in spans if s["name"] == "enemy.evaluate")
+    attrs = {a["key"]: a["value"] for a in enemy["attributes"]}
+    assert attrs["enemy_idx"] == {"intValue": "0"}
+    assert attrs["cached"] == {"boolValue": False}
+    run = next(s for s in spans if s["name"] == "run")
+    assert "parentSpanId" not in run
+    assert all(int(s["endTimeUnixNano"]) >= int(s["startTimeUnixNano"]) for s in spans)
+
+
+def test_llm_request_span_and_errors():
+    resp = mock.Mock()
+    resp.choices = [mock.Mock(message=mock.Mock(content="ok"))]
+    resp.usage = mock.Mock(prompt_tokens=7, completion_tokens=3)
+    fake = mock.Mock()
+    fake.chat.completions.create.return_value = resp
+    exporter = ListExporter()
+    with tracing(Tracer(exporter)):
+        ChatClient(fake).complete("gpt-4o", "hi")
+        with pytest.raises(KeyError), span("broken"):
+            raise KeyError("x")
+    llm, broken = exporter.spans
+    assert llm.name == "llm.request"
+    assert llm.attributes == {"model": "gpt-4o", "retries": 0, "prompt_tokens": 7, "completion_tokens": 3}
+    assert broken.attributes == {"error": "KeyError"}
+
+
+def test_span_without_tracer_is_noop():
+    with span("idle", floor=1) as sp:
+        sp.set(revision=2)
+    assert sp.attributes == {}
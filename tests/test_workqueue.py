@@ -0,0 +1,119 @@
+import subprocess
+import sys
+import sqlite3
+import threading
+
+import pytest
+
+from neurodungeon.agents import StubBoss, StubEnemy, StubPlayer
+from neurodungeon.batch import build_agents, jobs_from_goals, run_job
+from neurodungeon.models import FloorArtifact, Hint, RunConfig, Vote
+from neurodungeon.orchestrator import Orchestrator
+from neurodungeon.run import cli
+from neurodungeon.workqueue import RemoteEnemy, RemoteError, SQLiteTransport, TaskResult, Worker
+
+
+class BrokenEnemy(StubEnemy):
+    def evaluate(self, artifact):
+        raise ValueError("no sandbox")
+
+
+def _artifact(revision=0):
+    return FloorArtifact(floor=0, revision=revision, content="x", ext=".txt")
+
+
+@pytest.fixture
+def transport(tmp_path):
+    with SQLiteTransport(tmp_path / "queue.sqlite") as t:
+        yield t
+
+
+@pytest.fixture
+def worker(transport):
+    worker = Worker(transport, {"stub": StubEnemy(), "broken": BrokenEnemy()}, poll_s=0.01)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    yield worker
+    worker.stop()
+    thread.join()
+
+
+def test_remote_run_matches_local(tmp_path, transport, worker):
+    def run(name, enemies):
+        cfg = RunConfig(run_id=str(tmp_path / name), rejection_thresh=1, max_parallel_enemies=2)
+        return Orchestrator(StubPlayer(), enemies, StubBoss()).run("goal", cfg), (cfg.persist_dir / "log.jsonl")
+
+    remote = [[RemoteEnemy(transport, "stub", poll_s=0.01) for _ in range(2)] for _ in range(3)]
+    local = [[StubEnemy(), StubEnemy()] for _ in range(3)]
+    (remote_vote, remote_log), (local_vote, local_log) = run("remote", remote), run("local", local)
+    assert remote_vote is local_vote
+    assert len(remote_log.read_text().splitlines()) == len(local_log.read_text().splitlines())
+    assert transport.conn.execute("SELECT COUNT(*) FROM tasks").fetchone() == (0,)
+
+
+def test_evaluate_many_and_errors(transport, worker):
+    enemy = RemoteEnemy(transport, "stub", poll_s=0.01)
+    assert enemy.evaluate_many([_artifact(0), _artifact(1)]) == [
+        (Vote.REJECT, (Hint(text="improve"),)),
+        (Vote.ACCEPT, ()),
+    ]
+    with pytest.raises(RemoteError, match="ValueError: no sandbox"):
+        RemoteEnemy(transport, "broken", poll_s=0.01).evaluate(_artifact())
+
+
+def test_expired_lease_is_retried_then_failed(tmp_path):
+    with SQLiteTransport(tmp_path / "queue.sqlite", lease_s=0, max_attempts=2) as transport:
+        task_id = transport.submit("stub", _artifact())
+        first = transport.claim("a", ["stub"])
+        second = transport.claim("b", ["stub"])
+        assert first.id == second.id == task_id and second.attempts == 2
+        assert transport.claim("c", ["other"]) is None
+        assert transport.claim("c", ["stub"]) is None
+        assert transport.collect([task_id]) == {task_id: TaskResult(error="lease expired 2 times")}
+
+
+def test_timeout_discards_tasks(transport):
+    enemy = RemoteEnemy(transport, "nobody", poll_s=0.01, timeout_s=0.05)
+    with pytest.raises(TimeoutError):
+        enemy.evaluate(_artifact())
+    assert transport.conn.execute("SELECT COUNT(*) FROM tasks").fetchone() == (0,)
+
+
+def test_worker_cli_in_another_process(tmp_path, capsys):
+    queue = tmp_path / "queue.sqlite"
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "from neurodungeon.run import cli; cli()", "worker", "--queue", str(queue)]
+        + ["--max-tasks", "2"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    with SQLiteTransport(queue) as transport:
+        verdicts = RemoteEnemy(transport, "stub", poll_s=0.01, timeout_s=30).evaluate_many(
+            [_artifact(0), _artifact(1)]
+        )
+    out, _ = proc.communicate(timeout=30)
+    assert [vote for vote, _ in verdicts] == [Vote.REJECT, Vote.ACCEPT]
+    assert "handled 2 task(s)" in out
+
+    cli(["worker", "--queue", str(queue), "--max-tasks", "1", "--idle-timeout", "0"])
+    assert "handled 0 task(s)" in capsys.readouterr().out
+
+
+def test_cli_run_with_queue(tmp_path, transport, worker):
+    cli(["--goal", "g", "--persist-dir", str(tmp_path), "--enemies", "2", "--queue", str(transport.path)])
+    assert (tmp_path / "cli_run" / "report.md").exists()
+    assert transport.conn.execute("SELECT COUNT(*) FROM tasks").fetchone() == (0,)
+
+
+def test_job_without_workers_times_out_and_closes_queue(tmp_path):
+    built = []
+
+    def factory(job):
+        built.append(build_agents(job))
+        return built[-1]
+
+    (job,) = jobs_from_goals(["g"], [2], persist_dir=tmp_path, queue=tmp_path / "q.sqlite", queue_timeout=0.1)
+    result = run_job(job, factory)
+    assert result.error is not None and result.error.startswith("TimeoutError")
+    with pytest.raises(sqlite3.ProgrammingError):
+        built[0][1][0][0].transport.conn.execute("SELECT 1")